@@ -1,12 +1,25 @@
+import logging
 import numpy as np
 import os
 import json
 from datetime import datetime
 from app.core.supabase_client import get_supabase
 from app.core.extra_features import get_extra_feature_service
+from app.core.place_catalog import get_catalog_version
+from app.core.place_index import DAYS, PlaceCatalog, UserPlaceOverlay
+from app.core.catalog_bundle import current_bundle_id, export_bundle, load_bundle
+from app.core.cache import LRUTTLCache
+from app.core.feature_templates import TEMPLATE_FEATURES, expand_features, get_template_id
+from app.core.metrics import stage_timer
+from app.core.tracing import traced
+from app.config import settings
+import threading
+import time
 from dotenv import load_dotenv
 import math
 
+logger = logging.getLogger(__name__)
+
 load_dotenv(".env")
 
 persona = [1,0,0,0,0,0,  0.9,0.7,0.5,0.8,0.8,0.3,  0.8,0.1,0.7,0.9,  0.95,0.3,0.8,0.4]
@@ -44,10 +57,235 @@ def extract_features(place: json, persona):
         price = 0
         return np.array(features_array, dtype=float), rating, price
     except KeyError as e:
-        print(f"key error | {e} in place: {place.get('name', 'Unknown')}")
+        logger.debug("key error | %s in place: %s", e, place.get('name', 'Unknown'))
         return np.zeros(20), 0, 0  # 수정: 3개 값 반환 (4개 아님)
 
-def recommend_topk(persona, last_recommend=None, candidate_names=None, date=None, category=None, extra_feature=None, k=3, alpha=0.8, beta=0.7, gamma=0.2, delta=0.4, user_lat=None, user_lng=None, user_id=None, include_user_places=True):
+def _frozen_template_vectors():
+    """기본 features 템플릿 → (20차원 벡터(읽기 전용), rating, price)"""
+    vectors = {}
+    for template_id, features in TEMPLATE_FEATURES.items():
+        vector, rating, price = extract_features(features, None)
+        vector.setflags(write=False)
+        vectors[template_id] = (vector, rating, price)
+    return vectors
+
+TEMPLATE_VECTORS = _frozen_template_vectors()
+
+def resolve_features(features, persona=None):
+    """
+    user_places.features → (20차원 벡터, rating, price)
+
+    템플릿 참조({"template_id": ...})는 미리 계산된 벡터를 그대로 반환 (JSON 파싱 없음)
+    """
+    template_id = get_template_id(features)
+    if template_id is not None:
+        return TEMPLATE_VECTORS.get(template_id, TEMPLATE_VECTORS["neutral"])
+    return extract_features(features, persona)
+
+# places 스냅샷 (프로세스 내 공유)
+_catalog: PlaceCatalog = None
+_catalog_loaded_at = 0.0
+_catalog_lock = threading.Lock()
+_catalog_bundle_seen = None  # 마지막으로 확인한 번들 (같은 번들을 다시 로드하지 않음)
+
+def _fetch_all_places() -> list:
+    """
+    places 테이블 전체 row (place_id 순 페이지 조회)
+
+    PostgREST는 한 응답을 max-rows(기본 1000)로 자르므로
+    CATALOG_PAGE_SIZE씩 range로 읽고 페이지가 덜 차면 종료
+    첫 페이지의 전체 개수(count="exact")까지는 계속 읽음
+    (CATALOG_PAGE_SIZE가 max-rows보다 커서 페이지가 잘려도 번들 / TTL 재로드가 전체를 담도록)
+    """
+    supabase = get_supabase()
+    page_size = settings.CATALOG_PAGE_SIZE
+    rows = []
+    total = None
+    while True:
+        response = supabase.table("places") \
+            .select("*", count="exact" if total is None else None) \
+            .order("place_id") \
+            .range(len(rows), len(rows) + page_size - 1) \
+            .execute()
+        if total is None:
+            total = response.count
+        page = response.data or []
+        rows.extend(page)
+        if not page or (len(page) < page_size and (total is None or len(rows) >= total)):
+            return rows
+
+def load_place_catalog_from_db(version: str = None) -> PlaceCatalog:
+    """places 테이블 전체를 읽어 카탈로그 생성 (번들 무시)"""
+    rows = _fetch_all_places()
+    return PlaceCatalog(
+        rows,
+        extract=lambda features: extract_features(features, None),
+        version=version if version is not None else get_catalog_version(),
+        ann_min_size=settings.ANN_MIN_CATALOG_SIZE,
+        expand=expand_features,
+    )
+
+def export_place_catalog(root: str = None):
+    """
+    places 테이블을 카탈로그 번들로 내보내기 (CLI / 승격 후 파이프라인에서 호출)
+
+    places 전체를 페이지 단위로 읽어 내보냄 (PostgREST max-rows에서 잘리지 않음)
+
+    Returns:
+        새 번들 디렉토리 경로 (번들 경로 설정이 없으면 None)
+    """
+    root = root or settings.CATALOG_BUNDLE_PATH
+    if not root:
+        return None
+    return export_bundle(load_place_catalog_from_db(), root, keep=settings.CATALOG_BUNDLE_KEEP)
+
+def _load_new_bundle(version: str):
+    """CATALOG_BUNDLE_PATH의 번들이 마지막으로 확인한 것과 다르면 로드 (아니면 None)"""
+    global _catalog_bundle_seen
+    if not settings.CATALOG_BUNDLE_PATH:
+        return None
+    bundle_id = current_bundle_id(settings.CATALOG_BUNDLE_PATH)
+    if bundle_id is None or bundle_id == _catalog_bundle_seen:
+        return None
+    _catalog_bundle_seen = bundle_id
+    try:
+        return load_bundle(settings.CATALOG_BUNDLE_PATH, version=version, ann_min_size=settings.ANN_MIN_CATALOG_SIZE)
+    except Exception as e:
+        logger.warning("카탈로그 번들 로드 실패, DB에서 로드: %s", e)
+        return None
+
+def get_place_catalog() -> PlaceCatalog:
+    """
+    places 테이블 스냅샷 반환
+
+    카탈로그 버전이 바뀌었거나 CATALOG_TTL_SECONDS가 지나면 다시 로드
+    (다른 워커에서 바뀐 내용은 TTL 안에 반영)
+
+    CATALOG_BUNDLE_PATH가 있으면 새 번들(부팅 직후 포함)은 DB 대신 mmap으로 로드
+    (승격 / 관리자 수정·삭제 시 새 번들을 내보냄), 번들이 그대로인데 TTL이 지나면 DB에서 다시 로드
+    """
+    global _catalog, _catalog_loaded_at
+    version = get_catalog_version()
+    expired = time.monotonic() - _catalog_loaded_at > settings.CATALOG_TTL_SECONDS
+    if _catalog is not None and _catalog.version == version and not expired:
+        return _catalog
+
+    with _catalog_lock:
+        if _catalog is not None and _catalog.version == version \
+                and time.monotonic() - _catalog_loaded_at <= settings.CATALOG_TTL_SECONDS:
+            return _catalog
+
+        catalog = _load_new_bundle(version)
+        if catalog is None:
+            catalog = load_place_catalog_from_db(version)
+        _catalog = catalog
+        _catalog_loaded_at = time.monotonic()
+        logger.debug(
+            "📚 장소 카탈로그 로드: %s개 (번들: %s, ANN: %s)",
+            len(_catalog), _catalog.bundle_id or 'X', 'on' if _catalog.ann else 'off'
+        )
+        return _catalog
+
+# 사용자별 개인 장소 블록 (user_id → UserPlaceOverlay)
+# 개인 장소 추가/삭제(bump_user_places_version), features 계산 완료(bump_catalog_version) 시
+# 버전이 바뀌어 다음 조회 때 다시 만들어짐, 다른 워커의 변경은 TTL 안에 반영
+_user_overlays = LRUTTLCache(
+    max_entries=settings.USER_OVERLAY_MAX_ENTRIES,
+    ttl_seconds=settings.CATALOG_TTL_SECONDS
+)
+
+def get_user_overlay(user_id: str, catalog: PlaceCatalog) -> UserPlaceOverlay:
+    """
+    사용자의 개인 장소 블록 (features_status가 default / completed인 것만)
+
+    버전이 같으면 캐시된 블록을 그대로 사용 → 추천 요청마다 user_places를 조회하지 않음
+    """
+    version = get_catalog_version(user_id)
+    overlay = _user_overlays.get(user_id)
+    if overlay is not None and overlay.version == version:
+        return overlay
+
+    response = get_supabase().table("user_places") \
+        .select("*") \
+        .eq("user_id", user_id) \
+        .in_("features_status", ["default", "completed"]) \
+        .execute()
+    overlay = UserPlaceOverlay(
+        response.data or [],
+        extract=lambda features: resolve_features(features),
+        official_names=catalog.index_by_name,
+        version=version,
+    )
+    _user_overlays.set(user_id, overlay)
+    logger.debug("📍 개인 장소 블록 로드: %s (%s개)", user_id, len(overlay))
+    return overlay
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Haversine 거리 (km), numpy broadcasting 지원
+
+    스칼라, 벡터(1 x N), 행렬(M x 1 vs 1 x M) 모두 가능
+    """
+    R = 6371  # 지구 반경 (km)
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2)**2
+    return R * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+def mmr_rerank(scores, features, coords, k, diversity_lambda, geo_scale_km=0.3):
+    """
+    Maximal Marginal Relevance 재정렬
+
+    관련도(score)는 높으면서 이미 뽑힌 장소와는 덜 비슷한 장소를 순서대로 선택
+    (같은 건물의 고깃집 5개 같은 중복 추천 방지)
+
+    Args:
+        scores: 후보 점수 (M,) - 점수 내림차순 정렬된 상위 M개
+        features: 후보 20차원 feature (M, 20)
+        coords: 후보 좌표 [[lat, lng], ...] (M, 2)
+        k: 선택할 개수
+        diversity_lambda: 1이면 점수순 그대로, 작을수록 다양성 우선
+        geo_scale_km: 이 거리 안쪽이면 위치상 거의 같은 장소로 간주
+
+    Returns:
+        선택된 후보 인덱스 리스트 (길이 min(k, M))
+    """
+    m = len(scores)
+    k = min(k, m)
+    if k == 0:
+        return []
+
+    # 관련도 0~1 정규화 (score에 -distance 항이 있어서 음수 가능)
+    spread = scores.max() - scores.min()
+    relevance = (scores - scores.min()) / spread if spread > 0 else np.ones(m)
+
+    # M x M 유사도 = feature 코사인 유사도와 위치 근접도의 평균
+    norms = np.linalg.norm(features, axis=1)
+    norms[norms == 0] = 1
+    unit = features / norms[:, None]
+    feature_sim = unit @ unit.T
+    lat, lng = coords[:, 0], coords[:, 1]
+    geo_sim = np.exp(-haversine_km(lat[:, None], lng[:, None], lat[None, :], lng[None, :]) / geo_scale_km)
+    similarity = 0.5 * feature_sim + 0.5 * geo_sim
+
+    selected = [0]  # 첫 번째는 점수 1위
+    max_sim = similarity[:, 0].copy()  # 각 후보와 선택된 장소들 사이의 최대 유사도
+    available = np.ones(m, dtype=bool)
+    available[0] = False
+
+    for _ in range(k - 1):
+        mmr = diversity_lambda * relevance - (1 - diversity_lambda) * max_sim
+        mmr[~available] = -np.inf
+        idx = int(np.argmax(mmr))
+        selected.append(idx)
+        available[idx] = False
+        max_sim = np.maximum(max_sim, similarity[:, idx])
+
+    return selected
+
+@traced("recommend.recommend_topk")
+def recommend_topk(persona, last_recommend=None, candidate_names=None, date=None, category=None, extra_feature=None, k=3, alpha=0.8, beta=0.7, gamma=0.2, delta=0.4, user_lat=None, user_lng=None, user_id=None, include_user_places=True, diversity_lambda=None):
     """
     장소 추천 알고리즘
 
@@ -63,14 +301,15 @@ def recommend_topk(persona, last_recommend=None, candidate_names=None, date=None
         user_lng: 사용자 경도 (None이면 DEFAULT_POSITION 사용)
         user_id: 개인 장소 조회를 위한 사용자 ID
         include_user_places: 개인 장소 포함 여부 (기본값: True)
+        diversity_lambda: MMR 다양성 계수 (None이면 settings.RECOMMEND_MMR_LAMBDA, 1이면 점수순)
     """
     # 사용자 위치 설정 (GPS 좌표가 없으면 기본 위치 사용)
     if user_lat is not None and user_lng is not None:
         user_position = [user_lat, user_lng]
-        print(f"📍 사용자 GPS 위치 사용: {user_lat}, {user_lng}")
+        logger.debug("📍 사용자 GPS 위치 사용: %s, %s", user_lat, user_lng)
     else:
         user_position = DEFAULT_POSITION
-        print(f"📍 기본 위치 사용 (송도): {DEFAULT_POSITION}")
+        logger.debug("📍 기본 위치 사용 (송도): %s", DEFAULT_POSITION)
     # extra_feature 적용 (weight 타입)
     filter_config = None
     if extra_feature:
@@ -81,84 +320,50 @@ def recommend_topk(persona, last_recommend=None, candidate_names=None, date=None
         # filter 타입인 경우 필터 설정 가져오기
         filter_config = service.get_filter_config(extra_feature)
 
-    supabase = get_supabase()
+    with stage_timer("recommend", "db_fetch"):
+        # 1. 공식 장소 (places 스냅샷)
+        catalog = get_place_catalog()
+
+        # 2. 개인 장소 블록 (공식 장소에 없는 것만, 캐시) - user_id가 있고 include_user_places가 True일 때만
+        overlay = None
+        if include_user_places and user_id:
+            overlay = get_user_overlay(user_id, catalog)
 
-    # 1. 공식 장소 (places)
-    response = supabase.table("places").select("*").execute()
-    places = response.data or []
-
-    # 2. 개인 장소 (user_places) - user_id가 있고 include_user_places가 True일 때만
-    user_places = []
-    if include_user_places and user_id:
-        user_places_response = supabase.table("user_places") \
-            .select("*") \
-            .eq("user_id", user_id) \
-            .in_("features_status", ["default", "completed"]) \
-            .execute()
-        user_places = user_places_response.data or []
-        print(f"📍 개인 장소 {len(user_places)}개 포함")
-
-    # 3. 통합 (개인 장소에 source 표시, 중복 제거)
-    all_places = []
-    seen_names = set()
-
-    # 공식 장소 먼저 (우선순위 높음)
-    for p in places:
-        p["_source"] = "official"
-        all_places.append(p)
-        seen_names.add(p["name"])
-
-    # 개인 장소 (공식 장소에 없는 것만)
-    for p in user_places:
-        if p["name"] not in seen_names:
-            p["_source"] = "user_place"
-            all_places.append(p)
-            seen_names.add(p["name"])
-
-    scores_total = []
-    def cos_similarity(A, B):
-        return np.dot(A, B)/(np.linalg.norm(A)*np.linalg.norm(B))
-    def haversine_distance(coord1, coord2):
-            # coord = [latitude, longitude]
-            R = 6371  # 지구 반경 (km)
-            lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
-            lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
-
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
-
-            a = math.sin(dlat / 2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2)**2
-            c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-            return R * c
     weekday_map = ["월", "화", "수", "목", "금", "토", "일"]
-    for place in all_places:
+    weekday = None
+    if date:
+        weekday = weekday_map[int(datetime.strptime(date, "%Y-%m-%d").strftime("%w"))]
+
+    # 카테고리 shard가 있으면 공식 장소는 shard에서만 고르므로 카테고리 필터 생략
+    use_shard = catalog.has_shard(category)
+
+    def passes_filters(place, category_checked=False):
+        """제외/영업일/카테고리/후보/extra_feature 필터 (개인 장소 row용, 공식 장소는 filter_official)"""
         name = place["name"]
-        scores = place["features"]
-        latitude, longitude = place["latitude"], place["longitude"]
+        scores = expand_features(place["features"])
         if last_recommend and name in last_recommend:
-            print(f"skip {name} (negative react)")
-            continue
+            logger.debug("skip %s (negative react)", name)
+            return False
         
         # 필터링
-        if date:
-            weekday = weekday_map[int(datetime.strptime(date, "%Y-%m-%d").strftime("%w"))]
+        if weekday:
             place_opening_hours = place.get("opening_hours")
             if place_opening_hours is not None:
                 opening_hours = place_opening_hours.get(weekday)
 
                 if opening_hours is not None:
                     # open, close = opening_hours['open'], opening_hours['close']
-                    continue
+                    return False
             
-        if category:
+        if category and not category_checked:
             place_category = scores["placeFeatures"]["mainCategory"]
             if place_category[category] < 0.5: 
                 # print(f"skip {name}, {category}: {place_category[category]}")
-                continue
+                return False
 
         if candidate_names and name not in candidate_names:
             # print(f"skip {name} (not in candidate names)")
-            continue
+            return False
 
         # extra_feature 필터링 (filter 타입)
         if filter_config:
@@ -171,25 +376,208 @@ def recommend_topk(persona, last_recommend=None, candidate_names=None, date=None
                     value = value[key]
                 if value < threshold:
                     # print(f"skip {name} ({filter_config['field']}={value:.2f} < {threshold})")
-                    continue
+                    return False
             except (KeyError, TypeError):
                 # 필드가 없으면 스킵
-                continue
-
-        features, rating, price  = extract_features(scores, persona)
-        distance = haversine_distance(user_position, [latitude, longitude])
-        similarity_cos = cos_similarity(features, persona)
-        similarity_euclid =1 / np.linalg.norm(features - persona)
-        similarity_dot = np.dot(features, persona)
-        # print(similarity_euclid, similarity_cos, similarity_dot)
-        similarity = similarity_cos
-        score = alpha*similarity - beta*distance + gamma*rating + delta*price
-        source = place.get("_source", "official")
-        scores_total.append((name, score, source))
+                return False
+        return True
 
-        
-    sorted_results = sorted(scores_total, key=lambda x: x[1], reverse=True)
-    return sorted_results[:k]
+    def filter_official(indices, category_checked=False):
+        """
+        passes_filters와 같은 조건을 카탈로그 배열(hours / filter_values)로 한 번에 계산
+        (번들에서 읽은 카탈로그도 row를 파싱하지 않음)
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        keep = np.ones(len(indices), dtype=bool)
+        if last_recommend or candidate_names:
+            names = catalog.names
+            keep &= np.fromiter(
+                (
+                    not (last_recommend and names[i] in last_recommend)
+                    and not (candidate_names and names[i] not in candidate_names)
+                    for i in indices.tolist()
+                ),
+                dtype=bool, count=len(indices)
+            )
+        if weekday:
+            keep &= ~catalog.listed_on(DAYS.index(weekday), indices)
+        if category and not category_checked:
+            keep &= catalog.at_least(f"mainCategory.{category}", 0.5, indices)
+        if filter_config:
+            keep &= catalog.at_least(filter_config["field"], filter_config["threshold"], indices)
+        return indices[keep].tolist()
+
+    # 3) 후보 선정 + 필터링
+    #    카테고리 shard 안에서만 (없으면 전체)
+    #    카탈로그가 크면 ANN(페르소나 코사인 상위 M) ∪ 사용자 주변 장소만
+    #    ANN 후보가 필터로 k개 미만만 남으면 M을 늘려서 재시도, 끝까지 부족하면 전체 검색
+    with stage_timer("recommend", "filtering"):
+        top_m, nprobe = settings.ANN_CANDIDATES, settings.ANN_NPROBE
+        shard_category = category if use_shard else None
+        while True:
+            candidates = catalog.candidate_indices(persona, user_position, top_m, nprobe, shard_category)
+            kept = filter_official(candidates, use_shard)
+            if catalog.ann is None or len(kept) >= k or len(candidates) >= len(catalog):
+                break
+            top_m, nprobe = top_m * 4, nprobe * 4
+            if top_m >= len(catalog):
+                base = catalog.shards[category] if use_shard else range(len(catalog))
+                kept = filter_official(base, use_shard)
+                break
+
+    names = [catalog.names[i] for i in kept]
+    sources = ["official"] * len(kept)
+    feature_rows = [catalog.features[kept]]
+    ratings = [catalog.ratings[kept]]
+    prices = [catalog.prices[kept]]
+    coords = [catalog.coords[kept]]
+
+    user_kept = [] if overlay is None else [j for j, p in enumerate(overlay.rows) if passes_filters(p)]
+    if user_kept:
+        names += [overlay.names[j] for j in user_kept]
+        sources += ["user_place"] * len(user_kept)
+        feature_rows.append(overlay.features[user_kept])
+        ratings.append(overlay.ratings[user_kept])
+        prices.append(overlay.prices[user_kept])
+        coords.append(overlay.coords[user_kept])
+
+    if not names:
+        return []
+
+    # 4) 점수 계산 (후보 전체를 한 번에 벡터 연산)
+    with stage_timer("recommend", "scoring"):
+        persona_vec = np.asarray(persona, dtype=float)
+        feature_matrix = np.vstack(feature_rows)
+        ratings = np.concatenate(ratings)
+        prices = np.concatenate(prices)
+        coords = np.vstack(coords)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            similarity = (feature_matrix @ persona_vec) / (
+                np.linalg.norm(feature_matrix, axis=1) * np.linalg.norm(persona_vec)
+            )
+        distance = haversine_km(user_position[0], user_position[1], coords[:, 0], coords[:, 1])
+        score = alpha * similarity - beta * distance + gamma * ratings + delta * prices
+
+        # 5) 점수 내림차순 (동점은 원래 순서 유지)
+        order = np.argsort(-score, kind="stable")
+
+    # 6) 상위 M개에 MMR 적용 → 비슷한 장소가 연달아 나오지 않도록
+    if diversity_lambda is None:
+        diversity_lambda = settings.RECOMMEND_MMR_LAMBDA
+    if diversity_lambda < 1 and k > 1:
+        with stage_timer("recommend", "rerank"):
+            top = order[:settings.RECOMMEND_MMR_CANDIDATES]
+            picked = mmr_rerank(score[top], feature_matrix[top], coords[top], k, diversity_lambda)
+            order = np.concatenate([top[picked], order[len(top):]])
+
+    return [(names[i], float(score[i]), sources[i]) for i in order[:k]]
+
+@traced("recommend.recommend_topk_batch")
+def recommend_topk_batch(personas, locations=None, categories=None, exclude=None, date=None, k=3, alpha=0.8, beta=0.7, gamma=0.2, delta=0.4, diversity_lambda=None, chunk_size=None, catalog=None):
+    """
+    여러 페르소나 일괄 추천 (주간 추천 코스 푸시, A/B 평가 등 내부 배치 작업용)
+
+    카탈로그 스냅샷 위에서 P x N 점수 행렬을 페르소나 청크 단위로 계산 (메모리 상한: 청크 x N)
+    점수식 / 영업일·카테고리·제외 필터 / MMR은 recommend_topk와 같지만
+    공식 장소만 대상이고, ANN 근사 없이 (카테고리 shard) 전체를 정확히 계산
+
+    Args:
+        personas: (P, 20) 페르소나 행렬
+        locations: 페르소나별 (lat, lng) 또는 None (None이면 DEFAULT_POSITION)
+        categories: 페르소나별 카테고리 필터 또는 None
+        exclude: 페르소나별 제외할 장소 이름 리스트 또는 None
+        date: 영업일 필터 (YYYY-MM-DD, 전체 공통)
+        k, alpha~delta, diversity_lambda: recommend_topk와 동일
+        chunk_size: 한 번에 계산할 페르소나 수 (None이면 RECOMMEND_BATCH_MAX_ELEMENTS / 후보 수)
+        catalog: 계산할 카탈로그 스냅샷 (None이면 get_place_catalog(),
+                 결과 이름으로 row를 찾을 때 같은 스냅샷을 쓰도록 호출하는 쪽에서 넘김)
+
+    Returns:
+        페르소나별 [(name, score, "official"), ...] 리스트 (입력 순서)
+    """
+    persona_matrix = np.atleast_2d(np.asarray(personas, dtype=float))
+    p = len(persona_matrix)
+    locations = locations or [None] * p
+    categories = categories or [None] * p
+    exclude = exclude or [None] * p
+    if diversity_lambda is None:
+        diversity_lambda = settings.RECOMMEND_MMR_LAMBDA
+    use_mmr = diversity_lambda < 1 and k > 1
+
+    if catalog is None:
+        with stage_timer("recommend", "db_fetch"):
+            catalog = get_place_catalog()
+
+    results = [[] for _ in range(p)]
+    if p == 0 or len(catalog) == 0:
+        return results
+
+    with stage_timer("recommend", "filtering"):
+        # 영업일 필터 (recommend_topk의 passes_filters와 동일 조건, 카탈로그 hours 배열 사용)
+        open_mask = np.ones(len(catalog), dtype=bool)
+        if date:
+            weekday = ["월", "화", "수", "목", "금", "토", "일"][int(datetime.strptime(date, "%Y-%m-%d").strftime("%w"))]
+            open_mask = ~catalog.listed_on(DAYS.index(weekday), np.arange(len(catalog)))
+
+        # 카테고리가 같은 페르소나끼리 같은 후보 집합으로 계산
+        groups = {}
+        for i, category in enumerate(categories):
+            groups.setdefault(category, []).append(i)
+
+    feature_norms = catalog.norms
+    persona_norms = np.linalg.norm(persona_matrix, axis=1)
+
+    for category, members in groups.items():
+        if category is None:
+            base = np.arange(len(catalog))
+        elif catalog.has_shard(category):
+            base = catalog.shards[category]
+        else:
+            continue
+        base = base[open_mask[base]]
+        if len(base) == 0:
+            continue
+
+        features = catalog.features[base]
+        coords = catalog.coords[base]
+        static_score = gamma * catalog.ratings[base] + delta * catalog.prices[base]
+        positions_by_name = {}
+        for j, i in enumerate(base):
+            positions_by_name.setdefault(catalog.names[i], []).append(j)
+        top_n = min(len(base), max(k, settings.RECOMMEND_MMR_CANDIDATES if use_mmr else k))
+        rows_per_chunk = chunk_size or max(1, settings.RECOMMEND_BATCH_MAX_ELEMENTS // len(base))
+
+        for start in range(0, len(members), rows_per_chunk):
+            chunk = members[start:start + rows_per_chunk]
+            with stage_timer("recommend", "scoring"):
+                positions = np.array(
+                    [locations[i] if locations[i] is not None else DEFAULT_POSITION for i in chunk], dtype=float
+                )
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    similarity = (persona_matrix[chunk] @ features.T) / (
+                        persona_norms[chunk, None] * feature_norms[None, base]
+                    )
+                distance = haversine_km(positions[:, 0, None], positions[:, 1, None], coords[None, :, 0], coords[None, :, 1])
+                score = alpha * similarity - beta * distance + static_score[None, :]
+                score[np.isnan(score)] = -np.inf
+                for row, i in enumerate(chunk):
+                    for name in exclude[i] or ():
+                        score[row, positions_by_name.get(name, [])] = -np.inf
+                top = np.argpartition(-score, top_n - 1, axis=1)[:, :top_n]
+
+            for row, i in enumerate(chunk):
+                candidates = top[row]
+                candidate_scores = score[row, candidates]
+                # 점수 내림차순, 동점은 카탈로그 순서 (recommend_topk의 stable 정렬과 동일)
+                order = np.lexsort((candidates, -candidate_scores))
+                candidates = candidates[order][np.isfinite(candidate_scores[order])]
+                if use_mmr and len(candidates):
+                    with stage_timer("recommend", "rerank"):
+                        picked = mmr_rerank(score[row, candidates], features[candidates], coords[candidates], k, diversity_lambda)
+                        candidates = candidates[picked]
+                results[i] = [(catalog.names[base[j]], float(score[row, j]), "official") for j in candidates[:k]]
+
+    return results
 
 if __name__ == '__main__':
     for i, persona in enumerate(personas):
@@ -7,10 +7,20 @@ Swagger 문서에서 숨겨져 있으며, 인증 없이 호출 가능합니다.
 사용 예시:
   curl -X POST "http://localhost:8000/api/v1/admin/run-pipeline?limit=10"
   curl -X GET "http://localhost:8000/api/v1/admin/pipeline-status"
+  curl -X POST "http://localhost:8000/api/v1/admin/profiling?count=3&path_prefix=/api/v1/persona/chat"
+  curl -X GET "http://localhost:8000/api/v1/admin/profiles"
+  curl -X POST "http://localhost:8000/api/v1/admin/recommend-batch" -H "Content-Type: application/json" \
+       -d '{"items": [{"couple_id": "..."}, {"persona": [...], "category": "cafe"}], "k": 5}'
 """
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse
 
+from app.config import settings
+from app.core import profiler
+from app.schemas.recommend import BatchRecommendRequest, BatchRecommendResponse
 from app.services.feature_pipeline import FeaturePipelineService
+from app.services.pipeline_worker import get_pipeline_worker
+from app.services.suggest_service import SuggestService
 
 router = APIRouter()
 
@@ -45,11 +55,80 @@ async def get_pipeline_status():
 
     - 상태별 승격 후보 개수
     - 승격 대기 중인 장소 개수
+    - 백그라운드 워커 상태 (PIPELINE_WORKER_ENABLED)
     """
     service = FeaturePipelineService()
 
     try:
         status = service.get_pipeline_status()
+        status["worker"] = get_pipeline_worker().status()
         return status
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/recommend-batch", response_model=BatchRecommendResponse, include_in_schema=False)
+def recommend_batch(request: BatchRecommendRequest):
+    """
+    여러 페르소나 / 커플 일괄 추천 (주간 추천 푸시, A/B 평가 등 내부 배치 작업용)
+
+    - 항목별 페르소나(또는 couple_id), 위치, 카테고리, 제외 장소 지정
+    - 공식 장소 대상, 카탈로그 스냅샷 위에서 행렬 연산으로 한 번에 계산
+    """
+    if len(request.items) > settings.RECOMMEND_BATCH_MAX_PERSONAS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many items (max {settings.RECOMMEND_BATCH_MAX_PERSONAS})"
+        )
+
+    service = SuggestService()
+    results = service.get_recommendations_batch(
+        items=[item.model_dump() for item in request.items],
+        date=request.date,
+        k=request.k,
+        alpha=request.alpha,
+        beta=request.beta,
+        gamma=request.gamma,
+        delta=request.delta
+    )
+    return BatchRecommendResponse(results=results)
+
+
+@router.post("/profiling", include_in_schema=False)
+async def arm_profiling(
+    count: int = Query(default=1, ge=0, le=100, description="프로파일링할 요청 수 (0이면 해제)"),
+    path_prefix: str = Query(default="", description="이 경로로 시작하는 요청만")
+):
+    """
+    다음 count개 요청 프로파일링 (내부 전용)
+
+    - settings.PROFILING_ENABLED가 꺼져 있으면 409
+    - 결과는 /admin/profiles에서 조회
+    """
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=409, detail="Profiling is disabled (PROFILING_ENABLED=false)")
+
+    profiler.toggle.arm(count, path_prefix)
+    return profiler.toggle.status()
+
+
+@router.get("/profiles", include_in_schema=False)
+async def list_profiles():
+    """
+    저장된 프로파일 목록 (최신순, 내부 전용)
+    """
+    return {
+        "profiling": profiler.toggle.status(),
+        "profiles": profiler.list_profiles()
+    }
+
+
+@router.get("/profiles/{name}", include_in_schema=False)
+async def download_profile(name: str):
+    """
+    프로파일 다운로드 (collapsed-stack 텍스트, flamegraph.pl / speedscope 입력용)
+    """
+    path = profiler.get_profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=name)
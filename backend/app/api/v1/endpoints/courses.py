@@ -1,11 +1,12 @@
 """
 Course management endpoints (Phase 10.4)
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
+from datetime import date
 
-from app.core.dependencies import get_current_user
-from app.schemas.course import CourseCreate, CourseUpdate, CourseResponse
+from app.core.dependencies import get_current_user, get_current_user_full
+from app.schemas.course import CourseCreate, CourseUpdate, CourseResponse, CourseRangeResponse
 from app.services.course_service import CourseService
 
 
@@ -28,6 +29,7 @@ async def create_course(
         Created course
 
     Raises:
+        HTTPException 400: If the user is not in a couple
         HTTPException 500: If database operation fails
     """
     try:
@@ -39,6 +41,11 @@ async def create_course(
 
         return CourseResponse.from_orm(course)
 
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -46,6 +53,66 @@ async def create_course(
         )
 
 
+@router.get("/range", response_model=CourseRangeResponse, status_code=status.HTTP_200_OK)
+async def get_couple_courses_in_range(
+    start: Optional[date] = Query(default=None, description="시작 날짜 (YYYY-MM-DD, 포함, 생략하면 처음부터)"),
+    end: Optional[date] = Query(default=None, description="종료 날짜 (YYYY-MM-DD, 포함, 생략하면 끝까지)"),
+    cursor: Optional[str] = Query(default=None, description="이전 응답의 next_cursor"),
+    limit: int = Query(default=100, ge=1, le=500),
+    current_user = Depends(get_current_user_full),
+):
+    """
+    Get the current couple's courses within a date range
+
+    Used by the calendar to load a whole month in one call, and without
+    start/end by the map to page through all of the couple's courses.
+
+    Args:
+        start: Inclusive start date (None for no lower bound)
+        end: Inclusive end date (None for no upper bound)
+        cursor: Pagination cursor from the previous page
+        limit: Page size
+        current_user: Authenticated user (full row, for couple_id)
+
+    Returns:
+        Courses ordered by date and the cursor for the next page
+
+    Raises:
+        HTTPException 400: If the user has no couple or the range/cursor is invalid
+    """
+    couple_id = current_user.get("couple_id")
+    if not couple_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Couple not matched"
+        )
+    if start and end and end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must not be before start"
+        )
+
+    course_service = CourseService()
+    try:
+        result = course_service.get_courses_by_couple_range(
+            couple_id=couple_id,
+            start_date=start.isoformat() if start else None,
+            end_date=end.isoformat() if end else None,
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return CourseRangeResponse(
+        courses=[CourseResponse.from_orm(course) for course in result["courses"]],
+        next_cursor=result["next_cursor"]
+    )
+
+
 @router.get("/{course_id}", response_model=CourseResponse, status_code=status.HTTP_200_OK)
 async def get_course(
     course_id: str,
@@ -1,12 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict
 from app.schemas.persona import ChatRequest, ChatResponse
 from app.services.persona_service import PersonaService
+from app.core.session_store import get_session_store
 
 router = APIRouter()
 
-# 세션 저장소
-sessions: Dict[str, dict] = {}
+# 세션 저장소 (SESSION_BACKEND 설정에 따라 memory / sqlite)
+sessions = get_session_store()
 
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
@@ -20,17 +20,17 @@ async def chat(request: ChatRequest):
 @router.delete("/sessions/{session_id}")
 async def clear_session(session_id: str):
     """세션 초기화"""
-    if session_id in sessions:
-        sessions.pop(session_id)
+    sessions.delete(session_id)
     return {"message": "세션 초기화 완료"}
 
 @router.get("/sessions/{session_id}")
 async def get_session(session_id: str):
     """세션 정보 조회"""
-    if session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
     return {
         "session_id": session_id,
-        "history_count": len(sessions[session_id].get("history", [])),
-        "pending_data": sessions[session_id].get("pending_data", {})
-    }
\ No newline at end of file
+        "history_count": len(session.get("history", [])),
+        "pending_data": session.get("pending_data", {})
+    }
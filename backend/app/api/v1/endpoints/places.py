@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from typing import List
 from app.core.supabase_client import get_supabase
+from app.core.place_catalog import bump_catalog_version
+from app.services.feature_pipeline import FeaturePipelineService
 from app.schemas.place import PlaceResponse, PlaceUpdate
 
 router = APIRouter()
@@ -56,7 +58,7 @@ def list_places(skip: int = 0, limit: int = 100, client = Depends(get_client)):
     return response.data
 
 @router.patch("/by_place_id/{place_id}", response_model=PlaceResponse)
-def update_place(place_id: str, updates: PlaceUpdate, client = Depends(get_client)):
+def update_place(place_id: str, updates: PlaceUpdate, background_tasks: BackgroundTasks, client = Depends(get_client)):
 
     # 먼저 존재하는지 확인
     existing = (
@@ -79,11 +81,14 @@ def update_place(place_id: str, updates: PlaceUpdate, client = Depends(get_clien
         .eq("place_id", place_id)
         .execute()
     )
+    bump_catalog_version()
+    # 다른 워커는 카탈로그 번들로 변경을 받음 (CATALOG_BUNDLE_PATH가 있을 때)
+    background_tasks.add_task(FeaturePipelineService().export_catalog_bundle)
 
     return response.data[0]
 
 @router.delete("/by_place_id/{place_id}")
-def delete_place(place_id: str, client = Depends(get_client)):
+def delete_place(place_id: str, background_tasks: BackgroundTasks, client = Depends(get_client)):
 
     existing = (
         client.table("places")
@@ -96,5 +101,7 @@ def delete_place(place_id: str, client = Depends(get_client)):
         raise HTTPException(status_code=404, detail="장소를 찾을 수 없습니다")
 
     client.table("places").delete().eq("place_id", place_id).execute()
+    bump_catalog_version()
+    background_tasks.add_task(FeaturePipelineService().export_catalog_bundle)
 
     return {"message": "삭제되었습니다"}
\ No newline at end of file
@@ -5,12 +5,18 @@ from fastapi import APIRouter, Depends, HTTPException, Response, status
 from typing import Optional, List, Union
 
 from app.core.dependencies import get_current_user
+from app.core.supabase_client import get_supabase
 from app.schemas.user_place import (
     UserPlaceCreate,
     UserPlaceResponse,
-    UserPlaceListResponse
+    UserPlaceListResponse,
+    PlaceLookupRequest,
+    PlaceLookupResponse,
+    UserPlaceBulkCreate,
+    UserPlaceBulkResponse
 )
 from app.services.user_place_service import UserPlaceService
+from app.services.place_lookup_service import PlaceLookupService
 
 router = APIRouter()
 
@@ -43,6 +49,58 @@ async def add_user_place(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/bulk", response_model=UserPlaceBulkResponse)
+async def add_user_places_bulk(
+    data: UserPlaceBulkCreate,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    개인 장소 일괄 추가 (네이버 검색 기록 / 공유 리스트 가져오기)
+
+    - 요청 내 중복(이름 + 좌표)은 한 번만 저장
+    - 정식 DB에 있는 장소는 저장하지 않고 official에 이름 반환
+    - 이미 추가한 장소는 existing에 기존 데이터 반환
+    """
+    service = UserPlaceService()
+
+    try:
+        return service.add_user_places_bulk(
+            user_id=current_user["user_id"],
+            places=[place.model_dump() for place in data.places]
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/lookup", response_model=PlaceLookupResponse)
+async def lookup_place(
+    data: PlaceLookupRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    지도 핀 상태 한 번에 조회
+
+    - is_official: 정식 DB에 있는 장소인지 (이름 + 좌표 약 11m 이내)
+    - user_place: 이미 저장한 개인 장소 (없으면 null)
+    - is_wishlisted / wishlist: 커플 찜 여부 (커플 매칭 전이면 false)
+    """
+    user_id = current_user["user_id"]
+    user = get_supabase().table("users") \
+        .select("couple_id") \
+        .eq("user_id", user_id) \
+        .maybe_single() \
+        .execute()
+    couple_id = user.data.get("couple_id") if user and user.data else None
+
+    return PlaceLookupService().lookup(
+        user_id=user_id,
+        name=data.name,
+        latitude=data.latitude,
+        longitude=data.longitude,
+        couple_id=couple_id
+    )
+
+
 @router.get("", response_model=UserPlaceListResponse)
 async def get_my_places(
     has_features: Optional[bool] = None,
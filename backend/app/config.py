@@ -10,6 +10,8 @@ class Settings(BaseSettings):
     OPENAI_MODEL: str = "gpt-4o-mini"
     OPENAI_TEMPERATURE: float = 0.2
     OPENAI_MAX_TOKENS: int = 500
+    OPENAI_HISTORY_TOKEN_BUDGET: int = 1200  # analyze_intent에 포함할 대화 히스토리 토큰 예산
+    OPENAI_HISTORY_MESSAGE_MAX_TOKENS: int = 300  # 히스토리 메시지 1개당 최대 토큰
 
     # CORS
     BACKEND_CORS_ORIGINS: list = ["*"]
@@ -33,7 +35,71 @@ class Settings(BaseSettings):
     # Supabase
     SUPABASE_URL: str = ""
     SUPABASE_KEY: str = ""
-    
+
+    # Data backend (로컬 프로파일링 / 부하 테스트용)
+    DATA_BACKEND: str = "supabase"  # supabase | memory | sqlite
+    LOCAL_DB_PATH: str = "local_data.db"  # DATA_BACKEND=sqlite 파일 경로
+    LOCAL_DB_SEED_PATH: str = "../test.db"  # places / users 시드 (비어 있으면 시드 안 함)
+    LOCAL_DB_FEATURES_PATH: str = "../extracted_features.json"  # features 없는 장소 보충용
+
+    # Logging / metrics
+    LOG_LEVEL: str = "WARNING"  # 핫패스 로그는 DEBUG (운영에서는 출력 안 함)
+    METRICS_ENABLED: bool = True  # 단계별 latency histogram 기록 (/metrics)
+
+    # Tracing (요청 단위 span)
+    TRACING_ENABLED: bool = False
+    TRACE_SAMPLE_RATE: float = 0.0  # 일반 요청 중 trace를 저장할 비율 (0~1)
+    TRACE_SLOW_THRESHOLD_MS: float = 2000  # 이 이상 걸린 요청은 샘플링과 무관하게 전체 trace 저장
+    TRACE_EXPORT_PATH: str = "traces.jsonl"  # span당 JSON 한 줄 (비우면 파일 저장 안 함)
+    TRACE_OTLP_ENDPOINT: str = ""  # OTLP/HTTP collector (예: http://localhost:4318)
+    TRACE_SERVICE_NAME: str = "itda-backend"
+
+    # Profiling (요청 단위 샘플링 프로파일러)
+    PROFILING_ENABLED: bool = False  # 헤더 / 관리자 토글 프로파일링 허용 여부
+    PROFILE_HEADER_TOKEN: str = ""  # X-Profile 헤더 값이 이것과 같아야 프로파일링 (비우면 헤더로는 불가)
+    PROFILE_DIR: str = "profiles"  # collapsed-stack 파일 저장 디렉토리
+    PROFILE_MAX_FILES: int = 50  # 이보다 많으면 오래된 것부터 삭제
+    PROFILE_SAMPLE_INTERVAL_MS: float = 5.0
+
+    # Feature pipeline background worker
+    PIPELINE_WORKER_ENABLED: bool = False  # 켜면 서버 프로세스 안에서 승격 후보를 계속 처리 (/admin/run-pipeline 불필요)
+    PIPELINE_WORKER_CONCURRENCY: int = 2  # 동시에 처리할 후보 수 (Google / OpenAI 호출 동시성)
+    PIPELINE_POLL_INTERVAL_SECONDS: float = 30.0  # 알림을 놓친 후보 회수용 폴링 주기
+    PIPELINE_POLL_JITTER_SECONDS: float = 5.0  # 폴링 주기에 더할 무작위 지연 (프로세스 간 분산)
+    PIPELINE_LEASE_SECONDS: int = 120  # 처리 중 lease 유지 시간 (만료되면 다른 워커가 다시 잡음)
+    PIPELINE_QUEUE_MAX: int = 100  # 대기 큐 크기 (넘치는 알림은 버리고 폴링으로 회수)
+    PIPELINE_MAX_ATTEMPTS: int = 5  # 이 횟수만큼 실패(크래시 포함)하면 dead_letter (자동 재시도 중단)
+    PIPELINE_RETRY_BASE_SECONDS: int = 30  # 재시도 대기 시간 (실패할 때마다 2배)
+    PIPELINE_RETRY_MAX_SECONDS: int = 60 * 60  # 재시도 대기 시간 상한
+
+    # Persona chat sessions
+    SESSION_BACKEND: str = "memory"  # memory | sqlite (여러 워커가 세션 공유)
+    SESSION_SQLITE_PATH: str = "sessions.db"
+    SESSION_MAX_ENTRIES: int = 1000
+    SESSION_TTL_SECONDS: int = 60 * 60 * 6  # 6 hours
+    SESSION_MAX_HISTORY: int = 10
+    SESSION_MAX_RECOMMENDED_PLACES: int = 20
+
+    # Course generation cache
+    COURSE_CACHE_MAX_ENTRIES: int = 500
+    COURSE_CACHE_TTL_SECONDS: int = 60 * 30  # 30 minutes
+    COURSE_CACHE_GEOHASH_PRECISION: int = 6  # 약 1.2km x 0.6km 셀
+    COURSE_CANDIDATE_POOL_SIZE: int = 10  # 슬롯 재생성용으로 보관할 다음 순위 후보 수
+
+    # Recommendation
+    RECOMMEND_MMR_LAMBDA: float = 0.7  # 1.0이면 점수순 그대로, 낮을수록 다양성 우선
+    RECOMMEND_MMR_CANDIDATES: int = 50  # MMR 재정렬 대상 상위 후보 수
+    CATALOG_TTL_SECONDS: int = 300  # places 스냅샷 최대 유지 시간 (다른 워커의 변경 반영 주기)
+    CATALOG_BUNDLE_PATH: str = ""  # 카탈로그 번들 디렉토리 (워커 부팅 시 mmap 로드, 비우면 항상 DB에서 로드)
+    CATALOG_BUNDLE_KEEP: int = 2  # 남길 번들 수 (이전 번들을 mmap 중인 워커용)
+    CATALOG_PAGE_SIZE: int = 1000  # places 전체 로드 시 페이지 크기 (PostgREST max-rows 이하로)
+    USER_OVERLAY_MAX_ENTRIES: int = 2000  # 개인 장소 블록을 캐시할 최대 사용자 수
+    ANN_MIN_CATALOG_SIZE: int = 20000  # 장소 수가 이 이상이면 IVF 근사 검색 사용
+    ANN_CANDIDATES: int = 2000  # 근사 검색으로 뽑을 후보 수 (M)
+    ANN_NPROBE: int = 32  # 근사 검색 시 탐색할 클러스터 수 (sqrt(N)개 중)
+    RECOMMEND_BATCH_MAX_ELEMENTS: int = 2_000_000  # 일괄 추천 시 한 번에 계산할 점수 행렬 크기 (페르소나 x 장소)
+    RECOMMEND_BATCH_MAX_PERSONAS: int = 10000  # 일괄 추천 API 요청당 최대 페르소나 수
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding='utf-8'
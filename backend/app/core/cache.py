@@ -0,0 +1,68 @@
+"""
+프로세스 내 LRU + TTL 캐시
+
+세션 저장소, 코스 생성 결과 캐시 등에서 공통으로 사용
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUTTLCache:
+    """최대 개수(LRU)와 만료 시간(TTL)을 함께 적용하는 캐시"""
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            max_entries: 최대 보관 개수 (초과 시 가장 오래 사용되지 않은 항목부터 제거)
+            ttl_seconds: 항목 만료 시간 (초), None이면 만료 없음
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """값 조회 (만료된 항목은 제거 후 default 반환)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """값 저장 (TTL 갱신 + LRU 순서 갱신)"""
+        expires_at = None
+        if self.ttl_seconds is not None:
+            expires_at = time.monotonic() + self.ttl_seconds
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """값 제거 후 반환"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[0] if entry is not None else default
+
+    def clear(self):
+        """전체 비우기"""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._data)
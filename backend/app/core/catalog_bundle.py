@@ -0,0 +1,237 @@
+"""
+장소 카탈로그 번들 (워커 cold start용 컬럼 파일)
+
+places 전체를 JSON으로 받아 features를 다시 파싱하는 대신,
+PlaceCatalog 배열을 .npy 파일로 내보내고 워커는 부팅 시 mmap으로 읽음
+(파일은 OS 페이지 캐시를 통해 워커 프로세스끼리 메모리 공유)
+
+디렉토리 구조:
+  <root>/CURRENT                  현재 번들 디렉토리 이름 (교체는 이 파일만 원자적으로 바꿈)
+  <root>/<번들 이름>/
+    meta.json                     format, count, version, categories, days, filter_fields, exported_at
+    features.npy                  (N, 20) float64 feature 행렬
+    norms.npy                     (N,) feature L2 norm
+    ratings.npy / prices.npy      (N,)
+    coords.npy                    (N, 2) [위도, 경도]
+    category_mask.npy             (N, C) bool, mainCategory >= 0.5 (meta.categories 순서)
+    hours.npy                     (N, 7, 2) int16 첫 영업 구간 [open, close] 분 단위 (meta.days 순서, 값은 hours_matrix)
+    filter_values.npy             (N, F) float64 placeFeatures 숫자 필드 (meta.filter_fields 순서, 없으면 NaN)
+    names.npy / place_ids.npy     고정 길이 유니코드 문자열 테이블
+    ivf_*.npy                     IVF 인덱스 (카탈로그에 있을 때만, 워커가 k-means를 다시 학습하지 않음)
+    rows.jsonl + row_offsets.npy  원본 row (상세 정보용, 접근할 때만 파싱)
+
+추천 필터(영업일 / 카테고리 / extra_feature)는 위 배열만 읽음 → row는 최종 top-k만 파싱
+
+사용법:
+  python -m scripts.export_catalog               # CLI
+  settings.CATALOG_BUNDLE_PATH 설정 시 승격 / 관리자 장소 수정·삭제 후 자동 내보내기, 워커는 부팅 시와 새 번들이 생겼을 때 로드
+"""
+import json
+import logging
+import mmap
+import os
+import shutil
+import time
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from app.core.place_index import DAYS, IVFIndex, PlaceCatalog
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+CURRENT_FILE = "CURRENT"
+
+
+class LazyRows(Sequence):
+    """
+    rows.jsonl을 mmap해서 인덱스 접근 시에만 row 하나를 파싱
+
+    파싱한 row는 캐시하지 않음 (접근은 추천 결과 top-k 정도, 프로세스별 사본이 쌓이지 않도록)
+    """
+
+    def __init__(self, path: Path, offsets: np.ndarray):
+        self._offsets = offsets
+        self._mmap = None
+        if path.stat().st_size > 0:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = int(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        start, end = int(self._offsets[index]), int(self._offsets[index + 1])
+        return json.loads(self._mmap[start:end])
+
+
+def _string_table(values) -> np.ndarray:
+    """고정 길이 유니코드 배열 (pickle 없이 mmap 가능)"""
+    values = ["" if v is None else str(v) for v in values]
+    return np.array(values, dtype=f"<U{max((len(v) for v in values), default=1) or 1}")
+
+
+def current_bundle_id(root: str) -> Optional[str]:
+    """현재 번들 디렉토리 이름 (번들이 없으면 None)"""
+    try:
+        return (Path(root) / CURRENT_FILE).read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def export_bundle(catalog: PlaceCatalog, root: str, keep: int = 2) -> Path:
+    """
+    카탈로그를 새 번들 디렉토리로 내보내고 CURRENT 교체
+
+    이미 번들을 mmap한 워커는 이전 디렉토리를 계속 읽음 → 최근 keep개는 남겨둠
+
+    Args:
+        catalog: 내보낼 카탈로그
+        root: 번들 루트 디렉토리
+        keep: 남길 번들 수 (현재 포함)
+
+    Returns:
+        새 번들 디렉토리 경로
+    """
+    root_path = Path(root)
+    root_path.mkdir(parents=True, exist_ok=True)
+    name = f"{datetime.now().strftime('%Y%m%d%H%M%S%f')}-{os.getpid()}"
+    tmp_dir = root_path / f".{name}.tmp"
+    tmp_dir.mkdir()
+
+    rows = catalog.rows
+    n = len(rows)
+    categories = sorted(catalog.shards)
+    category_mask = np.zeros((n, len(categories)), dtype=bool)
+    for c, category in enumerate(categories):
+        category_mask[catalog.shards[category], c] = True
+
+    filter_fields, filter_values = catalog.filter_table()
+    arrays = {
+        "features": np.asarray(catalog.features, dtype=np.float64),
+        "norms": np.asarray(catalog.norms, dtype=np.float64),
+        "ratings": np.asarray(catalog.ratings, dtype=np.float64),
+        "prices": np.asarray(catalog.prices, dtype=np.float64),
+        "coords": np.asarray(catalog.coords, dtype=np.float64).reshape(n, 2),
+        "category_mask": category_mask,
+        "hours": np.asarray(catalog.hours_table(), dtype=np.int16),
+        "filter_values": np.asarray(filter_values, dtype=np.float64).reshape(n, len(filter_fields)),
+        "names": _string_table(catalog.names),
+        "place_ids": _string_table(row.get("place_id") for row in rows),
+    }
+    if catalog.ann is not None:
+        arrays.update({
+            "ivf_unit": catalog.ann.unit,
+            "ivf_centroids": catalog.ann.centroids,
+            "ivf_order": catalog.ann.order,
+            "ivf_bounds": catalog.ann.bounds,
+        })
+    for key, array in arrays.items():
+        np.save(tmp_dir / f"{key}.npy", array, allow_pickle=False)
+
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    with open(tmp_dir / "rows.jsonl", "wb") as f:
+        for i, row in enumerate(rows):
+            data = json.dumps(row, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+            f.write(data)
+            offsets[i + 1] = offsets[i] + len(data)
+    np.save(tmp_dir / "row_offsets.npy", offsets, allow_pickle=False)
+
+    meta = {
+        "format": FORMAT_VERSION,
+        "count": n,
+        "version": catalog.version,
+        "categories": categories,
+        "days": DAYS,
+        "filter_fields": sorted(filter_fields, key=filter_fields.get),
+        "exported_at": datetime.now().isoformat(),
+    }
+    (tmp_dir / "meta.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+    bundle_dir = root_path / name
+    os.rename(tmp_dir, bundle_dir)
+    current_tmp = root_path / f".{CURRENT_FILE}.{os.getpid()}.tmp"
+    current_tmp.write_text(name, encoding="utf-8")
+    os.replace(current_tmp, root_path / CURRENT_FILE)
+
+    # 오래된 번들 정리 (이름이 시간순)
+    bundles = sorted(p for p in root_path.iterdir() if p.is_dir() and not p.name.startswith("."))
+    for old in bundles[:-keep] if keep > 0 else []:
+        if old.name != name:
+            shutil.rmtree(old, ignore_errors=True)
+
+    logger.info("📦 카탈로그 번들 내보내기: %s (%s개)", bundle_dir, n)
+    return bundle_dir
+
+
+def load_bundle(
+    root: str,
+    version: str = "0",
+    ann_min_size: Optional[int] = None,
+    ann_nlist: Optional[int] = None
+) -> Optional[PlaceCatalog]:
+    """
+    현재 번들을 mmap으로 읽어 PlaceCatalog 생성 (features JSON 파싱 없음)
+
+    Args:
+        root: 번들 루트 디렉토리
+        version: 카탈로그에 붙일 버전 (프로세스 내 카탈로그 버전)
+
+    Returns:
+        PlaceCatalog (bundle_id 속성에 번들 이름) 또는 None (번들 없음)
+    """
+    start = time.perf_counter()
+    name = current_bundle_id(root)
+    if name is None:
+        return None
+    bundle_dir = Path(root) / name
+
+    meta = json.loads((bundle_dir / "meta.json").read_text(encoding="utf-8"))
+    if meta.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported catalog bundle format: {meta.get('format')}")
+
+    def load(key: str) -> np.ndarray:
+        return np.load(bundle_dir / f"{key}.npy", mmap_mode="r", allow_pickle=False)
+
+    ann = None
+    if (bundle_dir / "ivf_centroids.npy").exists():
+        ann = IVFIndex.from_arrays(load("ivf_unit"), load("ivf_centroids"), load("ivf_order"), load("ivf_bounds"))
+
+    category_mask = load("category_mask")
+    shards = {
+        category: np.flatnonzero(category_mask[:, c])
+        for c, category in enumerate(meta["categories"])
+    }
+
+    catalog = PlaceCatalog.from_arrays(
+        rows=LazyRows(bundle_dir / "rows.jsonl", load("row_offsets")),
+        names=load("names").tolist(),
+        features=load("features"),
+        ratings=load("ratings"),
+        prices=load("prices"),
+        coords=load("coords"),
+        shards=shards,
+        norms=load("norms"),
+        hours=load("hours"),
+        filter_fields={field: c for c, field in enumerate(meta["filter_fields"])},
+        filter_values=load("filter_values"),
+        version=version,
+        ann_min_size=ann_min_size,
+        ann_nlist=ann_nlist,
+        ann=ann,
+    )
+    catalog.bundle_id = name
+    logger.debug("📦 카탈로그 번들 로드: %s (%s개, %.1fms)", name, meta['count'], (time.perf_counter() - start) * 1000)
+    return catalog
@@ -2,15 +2,19 @@
 Extra Feature 서비스
 DB 기반으로 슬롯 재추천 시 분위기/가격/별점 등 추가 조건 관리
 """
+import logging
 from typing import List, Tuple, Optional, Dict
 from app.core.supabase_client import get_supabase
 
+logger = logging.getLogger(__name__)
+
 
 class ExtraFeatureService:
     """Extra Feature DB 기반 서비스"""
 
     _instance = None
     _cache: Optional[Dict] = None
+    _version: int = 0  # 설정을 다시 로드할 때마다 증가 (프롬프트 캐시 무효화용)
 
     def __new__(cls):
         """싱글톤 패턴"""
@@ -50,10 +54,20 @@ class ExtraFeatureService:
                 }
                 for row in response.data
             }
-            print(f"[EXTRA_FEATURES] Loaded {len(self._cache)} features from DB")
+            self._version += 1
+            logger.debug("[EXTRA_FEATURES] Loaded %s features from DB", len(self._cache))
 
         return self._cache
 
+    def get_version(self) -> int:
+        """
+        현재 로드된 설정 버전 반환 (로드 안 됐으면 먼저 로드)
+
+        프롬프트처럼 설정으로부터 만들어지는 값의 캐시 키로 사용
+        """
+        self.get_all_features()
+        return self._version
+
     def clear_cache(self):
         """캐시 무효화"""
         self._cache = None
@@ -145,16 +159,16 @@ class ExtraFeatureService:
             
             if weight_name == "alpha":
                 alpha = weight_value
-                print(f"[EXTRA_FEATURE] Applied {extra_feature}: alpha = {weight_value}")
+                logger.debug("[EXTRA_FEATURE] Applied %s: alpha = %s", extra_feature, weight_value)
             elif weight_name == "beta":
                 beta = weight_value
-                print(f"[EXTRA_FEATURE] Applied {extra_feature}: beta = {weight_value}")
+                logger.debug("[EXTRA_FEATURE] Applied %s: beta = %s", extra_feature, weight_value)
             elif weight_name == "gamma":
                 gamma = weight_value
-                print(f"[EXTRA_FEATURE] Applied {extra_feature}: gamma = {weight_value}")
+                logger.debug("[EXTRA_FEATURE] Applied %s: gamma = %s", extra_feature, weight_value)
             elif weight_name == "delta":
                 delta = weight_value
-                print(f"[EXTRA_FEATURE] Applied {extra_feature}: delta = {weight_value}")
+                logger.debug("[EXTRA_FEATURE] Applied %s: delta = %s", extra_feature, weight_value)
 
         return list(persona), alpha, beta, gamma, delta
 
@@ -0,0 +1,229 @@
+"""
+개인 장소 기본 features 템플릿
+
+features 계산 전(features_status="default")인 개인 장소는 전체 JSON 대신
+{"template_id": "<id>"} 참조만 저장하고, 추천 시 algorithm.TEMPLATE_VECTORS에서
+미리 계산된 20차원 벡터로 바로 변환 (insert마다 deepcopy / 추천마다 JSON 파싱 없음)
+
+템플릿 dict는 모듈 간 공유 객체이므로 수정하지 말 것
+"""
+from typing import Any, Optional
+
+# 카테고리별 기본 features (20차원 벡터 구조)
+# extracted_features.json 형식과 동일
+DEFAULT_FEATURES = {
+    "food": {
+        "placeFeatures": {
+            "mainCategory": {
+                "food": 1.0, "cafe": 0.2, "culture_art": 0.0,
+                "activity_sports": 0.0, "nature_healing": 0.0,
+                "craft_experience": 0.0, "shopping": 0.0
+            },
+            "atmosphere": {
+                "quiet": 0.4, "romantic": 0.4, "trendy": 0.5,
+                "private": 0.3, "artistic": 0.2, "energetic": 0.5
+            },
+            "experienceType": {
+                "passive_enjoyment": 0.7, "active_participation": 0.2,
+                "social_bonding": 0.7, "relaxation_focused": 0.5
+            },
+            "spaceCharacteristics": {
+                "indoor_ratio": 0.9, "crowdedness_expected": 0.5,
+                "photo_worthiness": 0.4, "scenic_view": 0.2
+            },
+            "contextual": {
+                "average_rating": 0,
+                "max_travel_distance": 0
+            }
+        }
+    },
+    "cafe": {
+        "placeFeatures": {
+            "mainCategory": {
+                "food": 0.3, "cafe": 1.0, "culture_art": 0.1,
+                "activity_sports": 0.0, "nature_healing": 0.1,
+                "craft_experience": 0.0, "shopping": 0.0
+            },
+            "atmosphere": {
+                "quiet": 0.6, "romantic": 0.5, "trendy": 0.6,
+                "private": 0.4, "artistic": 0.4, "energetic": 0.3
+            },
+            "experienceType": {
+                "passive_enjoyment": 0.8, "active_participation": 0.1,
+                "social_bonding": 0.6, "relaxation_focused": 0.7
+            },
+            "spaceCharacteristics": {
+                "indoor_ratio": 0.85, "crowdedness_expected": 0.4,
+                "photo_worthiness": 0.6, "scenic_view": 0.3
+            },
+            "contextual": {
+                "average_rating": 0,
+                "max_travel_distance": 0
+            }
+        }
+    },
+    "activity": {
+        "placeFeatures": {
+            "mainCategory": {
+                "food": 0.0, "cafe": 0.0, "culture_art": 0.2,
+                "activity_sports": 1.0, "nature_healing": 0.3,
+                "craft_experience": 0.2, "shopping": 0.0
+            },
+            "atmosphere": {
+                "quiet": 0.2, "romantic": 0.3, "trendy": 0.5,
+                "private": 0.2, "artistic": 0.2, "energetic": 0.9
+            },
+            "experienceType": {
+                "passive_enjoyment": 0.2, "active_participation": 0.9,
+                "social_bonding": 0.7, "relaxation_focused": 0.2
+            },
+            "spaceCharacteristics": {
+                "indoor_ratio": 0.5, "crowdedness_expected": 0.6,
+                "photo_worthiness": 0.5, "scenic_view": 0.4
+            },
+            "contextual": {
+                "average_rating": 0,
+                "max_travel_distance": 0
+            }
+        }
+    },
+    "culture": {
+        "placeFeatures": {
+            "mainCategory": {
+                "food": 0.0, "cafe": 0.1, "culture_art": 1.0,
+                "activity_sports": 0.1, "nature_healing": 0.2,
+                "craft_experience": 0.3, "shopping": 0.1
+            },
+            "atmosphere": {
+                "quiet": 0.7, "romantic": 0.5, "trendy": 0.5,
+                "private": 0.4, "artistic": 0.9, "energetic": 0.3
+            },
+            "experienceType": {
+                "passive_enjoyment": 0.8, "active_participation": 0.3,
+                "social_bonding": 0.5, "relaxation_focused": 0.6
+            },
+            "spaceCharacteristics": {
+                "indoor_ratio": 0.8, "crowdedness_expected": 0.5,
+                "photo_worthiness": 0.7, "scenic_view": 0.4
+            },
+            "contextual": {
+                "average_rating": 0,
+                "max_travel_distance": 0
+            }
+        }
+    },
+    "nature": {
+        "placeFeatures": {
+            "mainCategory": {
+                "food": 0.0, "cafe": 0.0, "culture_art": 0.1,
+                "activity_sports": 0.3, "nature_healing": 1.0,
+                "craft_experience": 0.0, "shopping": 0.0
+            },
+            "atmosphere": {
+                "quiet": 0.8, "romantic": 0.7, "trendy": 0.3,
+                "private": 0.5, "artistic": 0.4, "energetic": 0.3
+            },
+            "experienceType": {
+                "passive_enjoyment": 0.6, "active_participation": 0.4,
+                "social_bonding": 0.5, "relaxation_focused": 0.9
+            },
+            "spaceCharacteristics": {
+                "indoor_ratio": 0.1, "crowdedness_expected": 0.3,
+                "photo_worthiness": 0.8, "scenic_view": 0.9
+            },
+            "contextual": {
+                "average_rating": 0,
+                "max_travel_distance": 0
+            }
+        }
+    }
+}
+
+# 중립 features (카테고리 매핑 실패 시)
+NEUTRAL_FEATURES = {
+    "placeFeatures": {
+        "mainCategory": {
+            "food": 0.5, "cafe": 0.5, "culture_art": 0.5,
+            "activity_sports": 0.5, "nature_healing": 0.5,
+            "craft_experience": 0.5, "shopping": 0.5
+        },
+        "atmosphere": {
+            "quiet": 0.5, "romantic": 0.5, "trendy": 0.5,
+            "private": 0.5, "artistic": 0.5, "energetic": 0.5
+        },
+        "experienceType": {
+            "passive_enjoyment": 0.5, "active_participation": 0.5,
+            "social_bonding": 0.5, "relaxation_focused": 0.5
+        },
+        "spaceCharacteristics": {
+            "indoor_ratio": 0.5, "crowdedness_expected": 0.5,
+            "photo_worthiness": 0.5, "scenic_view": 0.5
+        },
+        "contextual": {
+            "average_rating": 0,
+            "max_travel_distance": 0
+        }
+    }
+}
+
+# 템플릿 ID → features (placeFeatures 구조)
+TEMPLATE_FEATURES = {
+    **DEFAULT_FEATURES,
+    "neutral": NEUTRAL_FEATURES,
+}
+
+
+def template_id_for_category(category: Optional[str]) -> str:
+    """
+    카테고리 → 기본 features 템플릿 ID
+
+    지원 형식:
+    1. 네이버 Local Search API: "대분류>세부분류" (예: "음식점>육류,고기요리")
+    2. Flutter slotType: "food", "cafe", "activity", "culture", "nature"
+    """
+    if not category:
+        return "neutral"
+
+    # 대분류 추출 (첫 번째 ">" 앞부분)
+    main_category = category.split(">")[0].lower()
+
+    # 1단계: 영문 카테고리 (Flutter slotType) 직접 매핑
+    if main_category in DEFAULT_FEATURES:
+        return main_category
+
+    # 2단계: 한글 카테고리 (네이버 API 대분류) 매핑
+    if '음식점' in main_category:
+        return "food"
+    if '카페' in main_category or '디저트' in main_category:
+        return "cafe"
+    if '스포츠' in main_category or '레저' in main_category:
+        return "activity"
+    if '관람' in main_category or '체험' in main_category:
+        return "activity"
+    if '문화' in main_category or '예술' in main_category:
+        return "culture"
+    if '여행' in main_category or '명소' in main_category:
+        return "nature"
+
+    # 3단계: 매핑 실패 시 NEUTRAL
+    return "neutral"
+
+
+def template_reference(template_id: str) -> dict:
+    """user_places.features에 저장할 템플릿 참조"""
+    return {"template_id": template_id}
+
+
+def get_template_id(features: Any) -> Optional[str]:
+    """템플릿 참조면 템플릿 ID, 아니면 None"""
+    if isinstance(features, dict) and "template_id" in features and "placeFeatures" not in features:
+        return features["template_id"]
+    return None
+
+
+def expand_features(features: Any) -> Any:
+    """템플릿 참조면 템플릿 features (공유 객체), 아니면 그대로"""
+    template_id = get_template_id(features)
+    if template_id is None:
+        return features
+    return TEMPLATE_FEATURES.get(template_id, NEUTRAL_FEATURES)
@@ -0,0 +1,77 @@
+"""
+위치 관련 유틸 (geohash, 장소 해시)
+
+geohash precision별 셀 크기 (대략):
+- 5: 4.9km x 4.9km
+- 6: 1.2km x 0.6km
+- 7: 153m x 153m
+"""
+import hashlib
+from typing import Optional
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = 6) -> str:
+    """
+    위도/경도 → geohash 문자열
+
+    Args:
+        latitude: 위도
+        longitude: 경도
+        precision: geohash 길이 (클수록 셀이 작아짐)
+
+    Returns:
+        str: geohash (예: "wydjx4")
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True  # 짝수 번째 비트는 경도, 홀수 번째 비트는 위도
+
+    while len(geohash) < precision:
+        if even:
+            mid = (lng_range[0] + lng_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lng_range[0] = mid
+            else:
+                bits = bits << 1
+                lng_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits = bits << 1
+                lat_range[1] = mid
+
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(geohash)
+
+
+def location_cell(
+    latitude: Optional[float],
+    longitude: Optional[float],
+    precision: int = 6
+) -> Optional[str]:
+    """위치가 없으면 None, 있으면 geohash 셀 반환 (캐시 키용)"""
+    if latitude is None or longitude is None:
+        return None
+    return encode_geohash(latitude, longitude, precision)
+
+
+
+def place_hash(name: str, latitude: float, longitude: float) -> str:
+    """장소 고유 해시 (이름 + 소수점 5자리 좌표, 약 1m 정밀도)"""
+    normalized = f"{name}:{latitude:.5f}:{longitude:.5f}"
+    return hashlib.sha256(normalized.encode()).hexdigest()
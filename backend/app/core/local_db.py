@@ -0,0 +1,842 @@
+"""
+로컬 데이터 백엔드 (Supabase 클라이언트 호환)
+
+서비스 코드가 쓰는 쿼리 빌더 체인만 지원:
+table().select().eq().neq().in_().gt().gte().lt().lte().ilike().is_().or_()
+.order().limit().range().single().maybe_single().execute(),
+insert / update / upsert / delete,
+rpc("add_adoption_candidate") / rpc("add_adoption_candidates_bulk") / rpc("remove_from_adoption_candidate")
+/ rpc("claim_adoption_candidates")
+
+- MemoryClient: 테이블 = row dict 리스트 (벤치마크 / 단위 실행)
+- SQLiteClient: 테이블마다 JSON 문서 테이블, 필터는 json_extract SQL로 변환 (여러 워커 / 부하 테스트)
+
+live Supabase 없이 로컬에서 핫패스 프로파일링과 부하 테스트를 하기 위한 용도
+(settings.DATA_BACKEND = "memory" | "sqlite" 이면 get_supabase()가 이 클라이언트를 반환)
+"""
+import json
+import re
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import settings
+
+
+# insert 시 DB가 채워주는 기본 키 (Supabase 테이블 default 값 대응)
+GENERATED_KEYS = {
+    "places": "place_id",
+    "user_places": "user_place_id",
+    "courses": "course_id",
+    "couples": "couple_id",
+    "wishlists": "id",
+    "match_requests": "id",
+    "diary": "id",
+}
+
+# SQLite expression index를 만들 컬럼 (서비스에서 eq / 범위 조회하는 컬럼)
+INDEXED_COLUMNS = {
+    "places": ["name", "place_id"],
+    "user_places": ["user_id", "place_hash"],
+    "users": ["user_id", "couple_id"],
+    "couples": ["couple_id"],
+    "courses": ["course_id", "couple_id", "date"],
+    "diary": ["couple_id"],
+    "wishlists": ["couple_id", "geohash"],
+    "place_adoption_candidates": ["place_hash", "features_status"],
+    "match_requests": ["match_code"],
+}
+
+
+class APIResponse:
+    """supabase-py 응답과 같은 모양 (data, count)"""
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+# ========== 필터 표현 ==========
+# ("cmp", column, op, target) | ("and", [terms]) | ("or", [terms])
+
+def _parse_value(raw: str) -> Any:
+    """PostgREST 필터 문자열 값 → 파이썬 값"""
+    if raw == "null":
+        return None
+    if raw in ("true", "false"):
+        return raw == "true"
+    return raw
+
+
+def _split_top_level(expr: str) -> List[str]:
+    """콤마로 분리 (괄호 안 콤마는 무시)"""
+    parts, depth, current = [], 0, []
+    for ch in expr:
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    if current:
+        parts.append("".join(current))
+    return parts
+
+
+def parse_logic(expr: str) -> tuple:
+    """or_() 필터 문자열 → 필터 트리 ("a.eq.1,and(b.gt.2,c.eq.x)")"""
+    expr = expr.strip()
+    for keyword in ("and", "or"):
+        if expr.startswith(keyword + "(") and expr.endswith(")"):
+            terms = [parse_logic(t) for t in _split_top_level(expr[len(keyword) + 1:-1])]
+            return (keyword, terms)
+
+    column, op, raw = expr.split(".", 2)
+    if op == "in":
+        target = [_parse_value(v.strip()) for v in raw.strip("()").split(",")]
+    else:
+        target = _parse_value(raw)
+    return ("cmp", column, op, target)
+
+
+def _compare(value: Any, op: str, target: Any) -> bool:
+    """단일 컬럼 비교 (문자열/숫자 혼합은 숫자로 맞춰서 비교)"""
+    if op == "is":
+        return value is target
+    if value is None:
+        return False
+    if op == "in":
+        return value in target
+    if op == "ilike":
+        pattern = "^" + re.escape(str(target)).replace("%", ".*").replace("_", ".") + "$"
+        return re.match(pattern, str(value), re.IGNORECASE | re.DOTALL) is not None
+
+    if isinstance(value, (int, float)) and isinstance(target, str):
+        try:
+            target = float(target)
+        except ValueError:
+            value = str(value)
+    elif isinstance(target, (int, float)) and isinstance(value, str):
+        target = str(target)
+
+    if op == "eq":
+        return value == target
+    if op == "neq":
+        return value != target
+    if op == "gt":
+        return value > target
+    if op == "gte":
+        return value >= target
+    if op == "lt":
+        return value < target
+    if op == "lte":
+        return value <= target
+    raise ValueError(f"Unsupported operator: {op}")
+
+
+def evaluate(term: tuple, row: dict) -> bool:
+    """필터 트리를 row 하나에 적용"""
+    kind = term[0]
+    if kind == "and":
+        return all(evaluate(t, row) for t in term[1])
+    if kind == "or":
+        return any(evaluate(t, row) for t in term[1])
+    _, column, op, target = term
+    return _compare(row.get(column), op, target)
+
+
+SQL_OPERATORS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+def _column_sql(column: str) -> str:
+    return f"json_extract(data, '$.\"{column}\"')"
+
+
+def _sql_param(value: Any) -> Any:
+    """SQLite 바인딩 값 (dict / list는 JSON 문자열)"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def compile_sql(term: tuple, params: List[Any]) -> str:
+    """필터 트리 → SQLite WHERE 절 (params에 바인딩 값 추가)"""
+    kind = term[0]
+    if kind in ("and", "or"):
+        if not term[1]:
+            return "1" if kind == "and" else "0"
+        joiner = " AND " if kind == "and" else " OR "
+        return "(" + joiner.join(compile_sql(t, params) for t in term[1]) + ")"
+
+    _, column, op, target = term
+    col = _column_sql(column)
+
+    if op == "is":
+        params.append(_sql_param(target))
+        return f"{col} IS ?"
+    if op == "in":
+        if not target:
+            return "0"
+        params.extend(_sql_param(v) for v in target)
+        return f"{col} IN ({', '.join('?' for _ in target)})"
+    if op == "ilike":
+        params.append(target)
+        return f"{col} LIKE ?"
+
+    sql_op = SQL_OPERATORS.get(op)
+    if sql_op is None:
+        raise ValueError(f"Unsupported operator: {op}")
+
+    # PostgREST 문자열 필터 값("user_count.gte.5")은 숫자 컬럼이면 숫자로 비교
+    if isinstance(target, str):
+        try:
+            number = float(target)
+        except ValueError:
+            number = None
+        if number is not None:
+            params.extend([number, target])
+            return (
+                f"(CASE WHEN typeof({col}) IN ('integer', 'real') "
+                f"THEN {col} {sql_op} ? ELSE {col} {sql_op} ? END)"
+            )
+
+    params.append(_sql_param(target))
+    return f"{col} {sql_op} ?"
+
+
+# ========== 쿼리 빌더 ==========
+
+class LocalQuery:
+    """테이블 하나에 대한 쿼리 (체이닝 후 execute → client가 실행)"""
+
+    def __init__(self, client: "LocalClient", table: str):
+        self.client = client
+        self.table = table
+        self.op = "select"
+        self.columns: Optional[List[str]] = None
+        self.filters: List[tuple] = []
+        self.ordering: List[tuple] = []
+        self.limit_count: Optional[int] = None
+        self.offset = 0
+        self.single_row = False
+        self.maybe_single_row = False
+        self.payload: Any = None
+        self.on_conflict: Optional[str] = None
+        self.count: Optional[str] = None
+
+    # ----- 작업 종류 -----
+
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "LocalQuery":
+        self.op = "select"
+        self.count = count
+        columns = columns.strip()
+        if columns != "*":
+            self.columns = [c.strip() for c in columns.split(",") if c.strip()]
+        return self
+
+    def insert(self, payload: Any) -> "LocalQuery":
+        self.op, self.payload = "insert", payload
+        return self
+
+    def upsert(self, payload: Any, on_conflict: Optional[str] = None) -> "LocalQuery":
+        self.op, self.payload, self.on_conflict = "upsert", payload, on_conflict
+        return self
+
+    def update(self, payload: dict) -> "LocalQuery":
+        self.op, self.payload = "update", payload
+        return self
+
+    def delete(self) -> "LocalQuery":
+        self.op = "delete"
+        return self
+
+    # ----- 필터 -----
+
+    def _where(self, column: str, op: str, target: Any) -> "LocalQuery":
+        self.filters.append(("cmp", column, op, target))
+        return self
+
+    def eq(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(column, "lte", value)
+
+    def in_(self, column: str, values: List[Any]) -> "LocalQuery":
+        return self._where(column, "in", list(values))
+
+    def is_(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(column, "is", None if value in (None, "null") else value)
+
+    def ilike(self, column: str, pattern: str) -> "LocalQuery":
+        return self._where(column, "ilike", pattern)
+
+    def filter(self, column: str, operator: str, value: Any) -> "LocalQuery":
+        if operator == "in" and isinstance(value, str):
+            value = [_parse_value(v.strip()) for v in value.strip("()").split(",")]
+        return self._where(column, operator, value)
+
+    def or_(self, filters: str) -> "LocalQuery":
+        self.filters.append(parse_logic(f"or({filters})"))
+        return self
+
+    # ----- 정렬 / 페이지 -----
+
+    def order(self, column: str, desc: bool = False) -> "LocalQuery":
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, size: int) -> "LocalQuery":
+        self.limit_count = size
+        return self
+
+    def range(self, start: int, end: int) -> "LocalQuery":
+        self.offset, self.limit_count = start, end - start + 1
+        return self
+
+    def single(self) -> "LocalQuery":
+        self.single_row = True
+        return self
+
+    def maybe_single(self) -> "LocalQuery":
+        self.maybe_single_row = True
+        return self
+
+    # ----- 실행 -----
+
+    def where(self) -> tuple:
+        return ("and", self.filters)
+
+    def project(self, row: dict) -> dict:
+        if self.columns is None:
+            return dict(row)
+        return {c: row.get(c) for c in self.columns}
+
+    def execute(self) -> Optional[APIResponse]:
+        if self.op == "insert":
+            return APIResponse(self.client.insert_rows(self.table, self.payload))
+        if self.op == "upsert":
+            return APIResponse(self.client.upsert_rows(self.table, self.payload, self.on_conflict))
+        if self.op == "update":
+            return APIResponse(self.client.update_rows(self.table, self.where(), self.payload))
+        if self.op == "delete":
+            return APIResponse(self.client.delete_rows(self.table, self.where()))
+
+        rows, total = self.client.select_rows(self)
+        data = [self.project(r) for r in rows]
+
+        if self.single_row or self.maybe_single_row:
+            if len(data) > 1:
+                raise ValueError(f"{self.table}: multiple rows returned for single()")
+            if not data:
+                if self.single_row:
+                    raise ValueError(f"{self.table}: no rows returned for single()")
+                return None
+            return APIResponse(data[0])
+
+        return APIResponse(data, count=total if self.count else None)
+
+
+class RPCCall:
+    def __init__(self, fn: Callable[[dict], Any], params: dict):
+        self.fn = fn
+        self.params = params
+
+    def execute(self) -> APIResponse:
+        return APIResponse(self.fn(self.params))
+
+
+# ========== 클라이언트 ==========
+
+class LocalClient(ABC):
+    """로컬 클라이언트 공통 부분 (table / rpc / insert 기본값)"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.functions: Dict[str, Callable[[dict], Any]] = {
+            "add_adoption_candidate": self._add_adoption_candidate,
+            "add_adoption_candidates_bulk": self._add_adoption_candidates_bulk,
+            "remove_from_adoption_candidate": self._remove_from_adoption_candidate,
+            "claim_adoption_candidates": self._claim_adoption_candidates,
+            "claim_adoption_promotions": self._claim_adoption_promotions,
+        }
+
+    def table(self, name: str) -> LocalQuery:
+        return LocalQuery(self, name)
+
+    def rpc(self, name: str, params: Optional[dict] = None) -> RPCCall:
+        if name not in self.functions:
+            raise ValueError(f"Unknown RPC: {name}")
+        return RPCCall(self.functions[name], params or {})
+
+    def _with_defaults(self, table: str, row: dict) -> dict:
+        """DB default 컬럼 채우기 (기본 키 uuid, created_at)"""
+        row = dict(row)
+        key = GENERATED_KEYS.get(table)
+        if key and row.get(key) is None:
+            row[key] = str(uuid.uuid4())
+        row.setdefault("created_at", datetime.now().isoformat())
+        return row
+
+    # ----- 저장소별 구현 -----
+
+    @abstractmethod
+    def select_rows(self, query: LocalQuery):
+        """(정렬/페이지 적용된 row 리스트, 필터 매칭 전체 개수)"""
+
+    @abstractmethod
+    def insert_rows(self, table: str, payload: Any) -> List[dict]:
+        """row 추가 후 저장된 row 반환 (기본 키 / created_at 채움)"""
+
+    @abstractmethod
+    def update_rows(self, table: str, where: tuple, values: dict) -> List[dict]:
+        """조건에 맞는 row 수정 후 수정된 row 반환"""
+
+    @abstractmethod
+    def delete_rows(self, table: str, where: tuple) -> List[dict]:
+        """조건에 맞는 row 삭제 후 삭제된 row 반환"""
+
+    def upsert_rows(self, table: str, payload: Any, on_conflict: Optional[str]) -> List[dict]:
+        rows = payload if isinstance(payload, list) else [payload]
+        keys = [k.strip() for k in (on_conflict or GENERATED_KEYS.get(table, "id")).split(",")]
+        result = []
+        with self._lock:
+            for row in rows:
+                where = ("and", [("cmp", k, "eq", row.get(k)) for k in keys])
+                updated = self.update_rows(table, where, row)
+                result.extend(updated if updated else self.insert_rows(table, row))
+        return result
+
+    # ----- RPC (Supabase SQL 함수와 같은 동작, lock으로 원자성 보장) -----
+
+    def _add_adoption_candidate(self, params: dict):
+        """승격 후보에 유저 추가 (없으면 생성, 이미 있는 유저면 변화 없음)"""
+        place_hash, user_id = params["p_place_hash"], params["p_user_id"]
+        where = ("and", [("cmp", "place_hash", "eq", place_hash)])
+        with self._lock:
+            existing = self.table("place_adoption_candidates").select("*").eq("place_hash", place_hash).execute().data
+            if existing:
+                user_ids = existing[0].get("user_ids") or []
+                if user_id not in user_ids:
+                    user_ids = user_ids + [user_id]
+                    self.update_rows("place_adoption_candidates", where, {
+                        "user_ids": user_ids,
+                        "user_count": len(user_ids),
+                        "updated_at": datetime.now().isoformat(),
+                    })
+                return None
+
+            self.insert_rows("place_adoption_candidates", {
+                "place_hash": place_hash,
+                "canonical_name": params.get("p_name"),
+                "canonical_address": params.get("p_address"),
+                "canonical_category": params.get("p_category"),
+                "latitude": params.get("p_latitude"),
+                "longitude": params.get("p_longitude"),
+                "user_ids": [user_id],
+                "user_count": 1,
+                "features": None,
+                "features_status": "pending",
+                "is_promoted": False,
+            })
+        return None
+
+    def _add_adoption_candidates_bulk(self, params: dict):
+        """여러 장소의 승격 후보에 한 유저 추가 (p_places: [{place_hash, name, address, category, latitude, longitude}])"""
+        with self._lock:
+            for place in params.get("p_places") or []:
+                self._add_adoption_candidate({
+                    "p_place_hash": place["place_hash"],
+                    "p_user_id": params["p_user_id"],
+                    "p_name": place.get("name"),
+                    "p_address": place.get("address"),
+                    "p_category": place.get("category"),
+                    "p_latitude": place.get("latitude"),
+                    "p_longitude": place.get("longitude"),
+                })
+        return None
+
+    def _remove_from_adoption_candidate(self, params: dict):
+        """승격 후보에서 유저 제거 (남은 유저가 없고 미승격이면 후보 삭제)"""
+        place_hash, user_id = params["p_place_hash"], params["p_user_id"]
+        where = ("and", [("cmp", "place_hash", "eq", place_hash)])
+        with self._lock:
+            existing = self.table("place_adoption_candidates").select("*").eq("place_hash", place_hash).execute().data
+            if not existing:
+                return None
+            user_ids = [u for u in (existing[0].get("user_ids") or []) if u != user_id]
+            if not user_ids and not existing[0].get("is_promoted"):
+                self.delete_rows("place_adoption_candidates", where)
+            else:
+                self.update_rows("place_adoption_candidates", where, {
+                    "user_ids": user_ids,
+                    "user_count": len(user_ids),
+                    "updated_at": datetime.now().isoformat(),
+                })
+        return None
+
+
+    def _claim_adoption_candidates(self, params: dict):
+        """처리할 승격 후보 lease 획득 (재시도 시각이 지난 pending + lease 만료 processing, attempts 1 증가)"""
+        now = datetime.now(timezone.utc)
+        lease_expires_at = (now + timedelta(seconds=params["p_lease_seconds"])).isoformat()
+        place_hash = params.get("p_place_hash")
+
+        def expired(value) -> bool:
+            return value is not None and datetime.fromisoformat(value) < now
+
+        claimed = []
+        with self._lock:
+            rows = self.table("place_adoption_candidates").select("*").eq("is_promoted", False).execute().data
+            for row in rows:
+                if place_hash is not None and row["place_hash"] != place_hash:
+                    continue
+                where = ("and", [("cmp", "place_hash", "eq", row["place_hash"])])
+                status = row.get("features_status")
+                attempts = row.get("attempts") or 0
+
+                if status == "processing" and expired(row.get("lease_expires_at")) and attempts >= params["p_max_attempts"]:
+                    self.update_rows("place_adoption_candidates", where, {
+                        "features_status": "dead_letter", "lease_owner": None, "lease_expires_at": None,
+                    })
+                    continue
+
+                next_attempt_at = row.get("next_attempt_at")
+                due = status == "pending" and (next_attempt_at is None or datetime.fromisoformat(next_attempt_at) <= now)
+                if not (due or (status == "processing" and expired(row.get("lease_expires_at")))):
+                    continue
+                if len(claimed) >= params["p_limit"]:
+                    continue
+
+                claimed.extend(self.update_rows("place_adoption_candidates", where, {
+                    "features_status": "processing",
+                    "lease_owner": params["p_owner"],
+                    "lease_expires_at": lease_expires_at,
+                    "attempts": attempts + 1,
+                }))
+        return claimed
+
+    def _claim_adoption_promotions(self, params: dict):
+        """승격 대기 후보 lease 획득 (completed + user_count >= p_min_users + 미승격, lease가 없거나 만료)"""
+        now = datetime.now(timezone.utc)
+        lease_expires_at = (now + timedelta(seconds=params["p_lease_seconds"])).isoformat()
+        place_hash, limit = params.get("p_place_hash"), params.get("p_limit")
+
+        claimed = []
+        with self._lock:
+            rows = self.table("place_adoption_candidates").select("*") \
+                .eq("features_status", "completed") \
+                .eq("is_promoted", False) \
+                .gte("user_count", params["p_min_users"]) \
+                .execute().data
+            for row in rows:
+                if place_hash is not None and row["place_hash"] != place_hash:
+                    continue
+                if limit is not None and len(claimed) >= limit:
+                    break
+                lease = row.get("lease_expires_at")
+                if row.get("lease_owner") is not None and lease is not None and datetime.fromisoformat(lease) >= now:
+                    continue
+                where = ("and", [("cmp", "place_hash", "eq", row["place_hash"])])
+                claimed.extend(self.update_rows("place_adoption_candidates", where, {
+                    "lease_owner": params["p_owner"],
+                    "lease_expires_at": lease_expires_at,
+                }))
+        return claimed
+
+
+def _sort_key(column: str):
+    # Postgres 기본 정렬과 같이 ASC면 NULL이 마지막, DESC면 처음
+    return lambda r: (r.get(column) is None, r.get(column) if r.get(column) is not None else 0)
+
+
+class MemoryClient(LocalClient):
+    """프로세스 내 저장소 (테이블 = row dict 리스트)"""
+
+    def __init__(self, tables: Optional[Dict[str, List[dict]]] = None):
+        super().__init__()
+        self.tables: Dict[str, List[dict]] = tables if tables is not None else {}
+
+    def select_rows(self, query: LocalQuery):
+        where = query.where()
+        with self._lock:
+            matched = [row for row in self.tables.get(query.table, []) if evaluate(where, row)]
+        for column, desc in reversed(query.ordering):
+            matched.sort(key=_sort_key(column), reverse=desc)
+        total = len(matched)
+        matched = matched[query.offset:]
+        if query.limit_count is not None:
+            matched = matched[:query.limit_count]
+        return matched, total
+
+    def insert_rows(self, table: str, payload: Any) -> List[dict]:
+        rows = [self._with_defaults(table, r) for r in (payload if isinstance(payload, list) else [payload])]
+        with self._lock:
+            self.tables.setdefault(table, []).extend(rows)
+        return [dict(r) for r in rows]
+
+    def update_rows(self, table: str, where: tuple, values: dict) -> List[dict]:
+        with self._lock:
+            matched = [row for row in self.tables.get(table, []) if evaluate(where, row)]
+            for row in matched:
+                row.update(values)
+            return [dict(r) for r in matched]
+
+    def delete_rows(self, table: str, where: tuple) -> List[dict]:
+        with self._lock:
+            rows = self.tables.get(table, [])
+            matched = [row for row in rows if evaluate(where, row)]
+            self.tables[table] = [row for row in rows if not evaluate(where, row)]
+        return [dict(r) for r in matched]
+
+
+class SQLiteClient(LocalClient):
+    """
+    SQLite 저장소
+
+    테이블마다 (rowid, data JSON) 문서 테이블을 만들고,
+    필터 / 정렬은 json_extract 식으로 SQL에서 처리 (자주 조회하는 컬럼은 expression index)
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._known_tables = set()
+
+    def _ensure_table(self, table: str):
+        if table in self._known_tables:
+            return
+        self._conn.execute(
+            f'CREATE TABLE IF NOT EXISTS "{table}" (rowid INTEGER PRIMARY KEY, data TEXT NOT NULL)'
+        )
+        for column in INDEXED_COLUMNS.get(table, []):
+            self._conn.execute(
+                f'CREATE INDEX IF NOT EXISTS "ix_{table}_{column}" ON "{table}" ({_column_sql(column)})'
+            )
+        self._conn.commit()
+        self._known_tables.add(table)
+
+    def _matching(self, table: str, where: tuple, suffix: str = "", extra: Optional[list] = None):
+        params: List[Any] = []
+        sql = f'SELECT rowid, data FROM "{table}" WHERE {compile_sql(where, params)} {suffix}'
+        return self._conn.execute(sql, params + (extra or [])).fetchall()
+
+    def select_rows(self, query: LocalQuery):
+        order_sql = ", ".join(
+            f"({_column_sql(c)} IS NULL){' DESC' if desc else ''}, {_column_sql(c)}{' DESC' if desc else ''}"
+            for c, desc in query.ordering
+        )
+        suffix = f"ORDER BY {order_sql} " if order_sql else ""
+        suffix += "LIMIT ? OFFSET ?"
+        extra = [query.limit_count if query.limit_count is not None else -1, query.offset]
+
+        with self._lock:
+            self._ensure_table(query.table)
+            rows = [json.loads(data) for _, data in self._matching(query.table, query.where(), suffix, extra)]
+            total = len(rows)
+            if query.count:
+                params: List[Any] = []
+                where_sql = compile_sql(query.where(), params)
+                total = self._conn.execute(
+                    f'SELECT COUNT(*) FROM "{query.table}" WHERE {where_sql}', params
+                ).fetchone()[0]
+        return rows, total
+
+    def insert_rows(self, table: str, payload: Any) -> List[dict]:
+        rows = [self._with_defaults(table, r) for r in (payload if isinstance(payload, list) else [payload])]
+        with self._lock:
+            self._ensure_table(table)
+            self._conn.executemany(
+                f'INSERT INTO "{table}" (data) VALUES (?)',
+                [(json.dumps(r, ensure_ascii=False, default=str),) for r in rows]
+            )
+            self._conn.commit()
+        return rows
+
+    def update_rows(self, table: str, where: tuple, values: dict) -> List[dict]:
+        with self._lock:
+            self._ensure_table(table)
+            updated = []
+            for rowid, data in self._matching(table, where):
+                row = json.loads(data)
+                row.update(values)
+                updated.append((rowid, row))
+            self._conn.executemany(
+                f'UPDATE "{table}" SET data = ? WHERE rowid = ?',
+                [(json.dumps(row, ensure_ascii=False, default=str), rowid) for rowid, row in updated]
+            )
+            self._conn.commit()
+        return [row for _, row in updated]
+
+    def delete_rows(self, table: str, where: tuple) -> List[dict]:
+        with self._lock:
+            self._ensure_table(table)
+            matched = self._matching(table, where)
+            self._conn.executemany(f'DELETE FROM "{table}" WHERE rowid = ?', [(rowid,) for rowid, _ in matched])
+            self._conn.commit()
+        return [json.loads(data) for _, data in matched]
+
+    def is_empty(self, table: str) -> bool:
+        with self._lock:
+            self._ensure_table(table)
+            return self._conn.execute(f'SELECT 1 FROM "{table}" LIMIT 1').fetchone() is None
+
+
+# ========== 시드 데이터 ==========
+
+PERSONA_COLUMNS = [
+    "food_cafe", "culture_art", "activity_sports", "nature_healing", "craft_experience", "shopping",
+    "quiet", "romantic", "trendy", "private_vibe", "artistic", "energetic",
+    "passive_enjoyment", "active_participation", "social_bonding", "relaxation_focused",
+    "indoor_ratio", "crowdedness_expected", "photo_worthiness", "scenic_view",
+]
+
+_HOURS_PATTERN = re.compile(r"(오전|오후)\s*(\d{1,2}):(\d{2})")
+
+
+def _loads(value: Any) -> Any:
+    """test.db JSON 컬럼 (이중 인코딩된 문자열 포함) → 파이썬 값"""
+    while isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            break
+    return value
+
+
+def _to_24h(meridiem: str, hour: str, minute: str) -> str:
+    h = int(hour) % 12 + (12 if meridiem == "오후" else 0)
+    return f"{h:02d}:{minute}"
+
+
+def parse_weekday_descriptions(descriptions: Any) -> Optional[dict]:
+    """
+    Google weekdayDescriptions ("월요일: 오전 11:00 ~ 오후 9:50") → places.opening_hours 형식
+
+    Returns:
+        {"월": [{"open": "11:00", "close": "21:50"}], ...} (휴무일은 키 없음)
+    """
+    if not isinstance(descriptions, list):
+        return descriptions if isinstance(descriptions, dict) else None
+
+    hours = {}
+    for line in descriptions:
+        day, _, spec = str(line).partition(":")
+        day = day.strip()[:1]
+        if "24시간" in spec:
+            hours[day] = [{"open": "00:00", "close": "24:00"}]
+            continue
+        times = [_to_24h(*m) for m in _HOURS_PATTERN.findall(spec)]
+        if len(times) >= 2:
+            hours[day] = [{"open": times[i], "close": times[i + 1]} for i in range(0, len(times) - 1, 2)]
+    return hours or None
+
+
+def load_seed_tables(db_path: str, features_path: Optional[str] = None) -> Dict[str, List[dict]]:
+    """
+    test.db (+ extracted_features.json) → Supabase 테이블 모양의 row
+
+    - places: scores 컬럼 → features, opening_hours는 요일 dict로 변환
+      (features가 없는 장소는 extracted_features.json의 같은 이름 항목으로 채움)
+    - users: 20개 persona 컬럼 → features dict
+    """
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+
+    extracted = {}
+    if features_path and Path(features_path).exists():
+        with open(features_path, encoding="utf-8") as f:
+            for entry in json.load(f):
+                extracted.setdefault(entry.get("name"), entry.get("result"))
+
+    places = []
+    for row in conn.execute("SELECT * FROM places"):
+        features = _loads(row["scores"]) or extracted.get(row["name"])
+        places.append({
+            "id": row["id"],
+            "place_id": row["place_id"],
+            "name": row["name"],
+            "category": row["category"],
+            "address": row["address"],
+            "latitude": row["latitude"],
+            "longitude": row["longitude"],
+            "rating": row["rating"],
+            "price_range": row["price_range"],
+            "opening_hours": parse_weekday_descriptions(_loads(row["opening_hours"])),
+            "reviews": _loads(row["reviews"]),
+            "features": features,
+        })
+
+    users = []
+    for row in conn.execute("SELECT * FROM users"):
+        users.append({
+            "user_id": row["user_id"],
+            "email": row["email"],
+            "name": row["name"],
+            "picture": row["picture"],
+            "features": {key: row[key] for key in PERSONA_COLUMNS},
+            "survey_done": bool(row["persona_completed"]),
+            "couple_id": None,
+            "created_at": row["created_at"],
+        })
+
+    conn.close()
+    return {"places": places, "users": users}
+
+
+# ========== 싱글톤 ==========
+
+_client: Optional[LocalClient] = None
+_client_lock = threading.Lock()
+
+
+def _seed(client: LocalClient):
+    """시드 파일이 있으면 places / users 채우기"""
+    if not settings.LOCAL_DB_SEED_PATH or not Path(settings.LOCAL_DB_SEED_PATH).exists():
+        return
+    tables = load_seed_tables(settings.LOCAL_DB_SEED_PATH, settings.LOCAL_DB_FEATURES_PATH)
+    for name, rows in tables.items():
+        client.insert_rows(name, rows)
+
+
+def get_local_client() -> LocalClient:
+    """설정(DATA_BACKEND)에 맞는 로컬 클라이언트 싱글톤 (처음 생성 시 시드 데이터 적재)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if settings.DATA_BACKEND == "sqlite":
+                    client = SQLiteClient(settings.LOCAL_DB_PATH)
+                    if client.is_empty("places"):
+                        _seed(client)
+                else:
+                    client = MemoryClient()
+                    _seed(client)
+                _client = client
+    return _client
+
+
+def set_local_client(client: Optional[LocalClient]):
+    """로컬 클라이언트 교체 (벤치마크에서 합성 데이터 주입용, None이면 다음 호출 시 재생성)"""
+    global _client
+    _client = client
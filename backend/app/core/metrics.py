@@ -0,0 +1,112 @@
+"""
+핫패스 단계별 latency 메트릭 (Prometheus text format)
+
+- Histogram: 누적 bucket 카운트 + 합계 (프로세스 내, thread-safe)
+- stage_timer(): with 블록 실행 시간을 itda_stage_duration_seconds{component, stage}에 기록
+- render_metrics(): /metrics 엔드포인트 응답 (Prometheus 텍스트 포맷)
+
+DB 조회 / 점수 계산 / 필터링 / LLM 호출 / Google 호출 / 직렬화 단계를
+컴포넌트(recommend, course, persona, pipeline ...)별로 나눠서 기록
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.config import settings
+from app.core.tracing import span
+
+
+# 기본 bucket (초): 1ms ~ 30s
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """라벨별 누적 bucket histogram"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        # labels → [bucket별 카운트..., +Inf 카운트, 합계]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        """값 하나 기록 (labels는 label_names 순서)"""
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = [0] * (len(self.buckets) + 1) + [0.0]
+                self._series[labels] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def render(self) -> str:
+        """Prometheus 텍스트 포맷"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+
+        for labels, series in sorted(snapshot.items()):
+            base = ",".join(f'{k}="{v}"' for k, v in zip(self.label_names, labels))
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {series[len(self.buckets)]}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {series[len(self.buckets)]}")
+        return "\n".join(lines)
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+# 모듈 레벨 싱글톤 메트릭
+STAGE_DURATION = Histogram(
+    "itda_stage_duration_seconds",
+    "Duration of hot-path stages (db_fetch, scoring, filtering, llm, google, serialization)",
+    ("component", "stage"),
+)
+REQUEST_DURATION = Histogram(
+    "itda_http_request_duration_seconds",
+    "HTTP request duration by route",
+    ("method", "route", "status"),
+)
+
+
+@contextmanager
+def stage_timer(component: str, stage: str):
+    """
+    with 블록 실행 시간을 단계 histogram에 기록 (trace 중이면 "<component>.<stage>" span도 생성)
+
+    Args:
+        component: 컴포넌트 이름 (recommend, course, persona, pipeline ...)
+        stage: 단계 이름 (db_fetch, scoring, filtering, llm, google, serialization ...)
+    """
+    with span(f"{component}.{stage}"):
+        if not settings.METRICS_ENABLED:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            STAGE_DURATION.observe(time.perf_counter() - start, component, stage)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float):
+    """HTTP 요청 latency 기록 (route는 경로 템플릿, 예: /api/v1/courses/{course_id})"""
+    if settings.METRICS_ENABLED:
+        REQUEST_DURATION.observe(seconds, method, route, str(status))
+
+
+def render_metrics(histograms: Optional[Iterable[Histogram]] = None) -> str:
+    """등록된 histogram 전체를 Prometheus 텍스트 포맷으로"""
+    histograms = histograms or (STAGE_DURATION, REQUEST_DURATION)
+    return "\n".join(h.render() for h in histograms) + "\n"
@@ -0,0 +1,47 @@
+"""
+장소 카탈로그 버전 관리
+
+places / user_places가 바뀌면 버전을 올려서
+추천 결과를 캐시하는 쪽(코스 생성 캐시 등)이 키를 바꾸도록 함
+
+버전은 프로세스 내 카운터라 다른 워커에서 바뀐 내용은 캐시 TTL 만큼 늦게 반영됨
+"""
+import threading
+from typing import Dict, Optional
+
+_lock = threading.Lock()
+_catalog_version = 0  # 공식 장소(places) 버전
+_user_place_versions: Dict[str, int] = {}  # user_id -> 개인 장소(user_places) 버전
+
+
+def get_catalog_version(user_id: Optional[str] = None) -> str:
+    """
+    현재 카탈로그 버전 (캐시 키용)
+
+    Args:
+        user_id: 있으면 해당 사용자의 개인 장소 버전도 포함
+
+    Returns:
+        str: "<places 버전>" 또는 "<places 버전>.<user_places 버전>"
+    """
+    if user_id is None:
+        return str(_catalog_version)
+    return f"{_catalog_version}.{_user_place_versions.get(user_id, 0)}"
+
+
+def bump_catalog_version():
+    """
+    공식 장소 추가/수정/삭제 시 호출
+
+    여러 사용자의 개인 장소가 한 번에 바뀌는 경우(features 계산 완료, 승격)도
+    이걸로 전체 무효화
+    """
+    global _catalog_version
+    with _lock:
+        _catalog_version += 1
+
+
+def bump_user_places_version(user_id: str):
+    """특정 사용자의 개인 장소 추가/삭제 시 호출"""
+    with _lock:
+        _user_place_versions[user_id] = _user_place_versions.get(user_id, 0) + 1
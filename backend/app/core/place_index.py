@@ -0,0 +1,526 @@
+"""
+장소 카탈로그 스냅샷 + 후보 검색 인덱스 (pure NumPy)
+
+- PlaceCatalog: places 테이블을 한 번 읽어서 feature 행렬 / 좌표 / 평점을 배열로 보관
+- IVFIndex: 20차원 feature 벡터 코사인 기준 근사 최근접 검색 (k-means 클러스터 + inverted list)
+- GridIndex: 위도/경도 격자 → 사용자 주변 장소 빠르게 찾기
+- 카테고리 shard: mainCategory 값이 0.5 이상인 장소 인덱스 (한 장소가 여러 shard에 속할 수 있음)
+
+카탈로그가 커지면 (전국 단위 크롤링) 전체 장소에 대해 점수를 계산하지 않고
+IVF로 페르소나와 비슷한 상위 M개 + 사용자 주변 장소만 골라서 점수 계산
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DAYS = ["월", "화", "수", "목", "금", "토", "일"]
+HOURS_NOT_LISTED = -1  # 그 요일 영업시간 항목 없음
+HOURS_UNKNOWN = -2     # 항목은 있지만 시각을 읽을 수 없음
+
+
+def _minutes(text: Optional[str]) -> int:
+    try:
+        hour, minute = text.split(":")
+        return int(hour) * 60 + int(minute)
+    except (AttributeError, ValueError):
+        return HOURS_UNKNOWN
+
+
+def hours_matrix(rows: Sequence[dict]) -> np.ndarray:
+    """
+    opening_hours ({"월": [{"open": "09:30", "close": "21:30"}], ...}) → (N, 7, 2) int16 분 단위
+
+    요일별 첫 영업 구간 [open, close], 항목이 없으면 HOURS_NOT_LISTED, 읽을 수 없으면 HOURS_UNKNOWN
+    """
+    hours = np.full((len(rows), len(DAYS), 2), HOURS_NOT_LISTED, dtype=np.int16)
+    for i, row in enumerate(rows):
+        opening_hours = row.get("opening_hours")
+        if not isinstance(opening_hours, dict):
+            continue
+        for d, day in enumerate(DAYS):
+            intervals = opening_hours.get(day)
+            if intervals is None:
+                continue
+            hours[i, d] = HOURS_UNKNOWN
+            if isinstance(intervals, list) and intervals and isinstance(intervals[0], dict):
+                hours[i, d] = (_minutes(intervals[0].get("open")), _minutes(intervals[0].get("close")))
+    return hours
+
+
+_NUMBER_TYPES = (int, float, bool)
+
+
+def _listed(row: dict, day: str) -> bool:
+    """그 요일 영업시간 항목이 있는지 (hours_matrix에서 HOURS_NOT_LISTED가 아닌 것과 같음)"""
+    opening_hours = row.get("opening_hours")
+    return isinstance(opening_hours, dict) and opening_hours.get(day) is not None
+
+
+def _field_value(features, path: List[str]) -> float:
+    """features["placeFeatures"]에서 path 값 (숫자가 아니거나 없으면 NaN)"""
+    value = features.get("placeFeatures") if isinstance(features, dict) else None
+    for key in path:
+        if not isinstance(value, dict):
+            return np.nan
+        value = value.get(key)
+    return float(value) if type(value) in _NUMBER_TYPES else np.nan
+
+
+def filter_value_table(features: Iterable) -> Tuple[Dict[str, int], np.ndarray]:
+    """
+    placeFeatures 아래 숫자 값 전체를 필드별 열로 (번들 내보내기용, 값은 _field_value와 같음)
+
+    Args:
+        features: row별 features (템플릿 참조는 펼친 것)
+
+    Returns:
+        ({"atmosphere.romantic": 열 번호, ...}, (N, F) float64 행렬, 값이 없으면 NaN)
+    """
+    fields: Dict[str, int] = {}
+    row_idx, col_idx, values = [], [], []
+    n = 0
+    for i, value in enumerate(features):
+        n = i + 1
+        place_features = value.get("placeFeatures") if isinstance(value, dict) else None
+        stack = [("", place_features)] if isinstance(place_features, dict) else []
+        while stack:
+            prefix, node = stack.pop()
+            for key, child in node.items():
+                field = f"{prefix}.{key}" if prefix else str(key)
+                if type(child) in _NUMBER_TYPES:
+                    row_idx.append(i)
+                    col_idx.append(fields.setdefault(field, len(fields)))
+                    values.append(child)
+                elif isinstance(child, dict):
+                    stack.append((field, child))
+
+    matrix = np.full((n, len(fields)), np.nan)
+    if values:
+        matrix[row_idx, col_idx] = np.asarray(values, dtype=float)
+    return fields, matrix
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (0 벡터는 그대로 0)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+class IVFIndex:
+    """
+    IVF (inverted file) 방식 코사인 근사 검색
+
+    학습: 단위 벡터에 대해 spherical k-means → 각 장소를 가장 가까운 centroid 리스트에 배정
+    검색: 쿼리와 가까운 centroid nprobe개의 리스트만 정확 계산
+    → 검색 비용이 O(nlist + n * nprobe / nlist)
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        nlist: Optional[int] = None,
+        iterations: int = 10,
+        train_size: int = 20000,
+        seed: int = 42
+    ):
+        """
+        Args:
+            vectors: (N, D) feature 행렬
+            nlist: 클러스터 수 (None이면 sqrt(N))
+            iterations: k-means 반복 횟수
+            train_size: k-means 학습에 쓸 최대 샘플 수
+            seed: 난수 시드 (같은 카탈로그면 같은 인덱스)
+        """
+        n = len(vectors)
+        self.unit = _normalize_rows(np.asarray(vectors, dtype=np.float32))
+        self.nlist = max(1, min(nlist or int(np.sqrt(n)), n))
+
+        rng = np.random.default_rng(seed)
+        sample = self.unit
+        if n > train_size:
+            sample = self.unit[rng.choice(n, train_size, replace=False)]
+
+        centroids = sample[rng.choice(len(sample), self.nlist, replace=False)]
+        for _ in range(iterations):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(self.nlist):
+                members = sample[assign == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = _normalize_rows(centroids)
+        self.centroids = centroids
+
+        # 전체 벡터 배정 (메모리 제한을 위해 청크 단위)
+        assign = np.empty(n, dtype=np.int32)
+        for start in range(0, n, 65536):
+            block = self.unit[start:start + 65536]
+            assign[start:start + 65536] = np.argmax(block @ centroids.T, axis=1)
+
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(self.nlist + 1))
+        self._set_lists(order, bounds)
+
+    @classmethod
+    def from_arrays(cls, unit: np.ndarray, centroids: np.ndarray, order: np.ndarray, bounds: np.ndarray) -> "IVFIndex":
+        """이미 학습된 인덱스 배열로 생성 (catalog_bundle, k-means 재학습 없음)"""
+        index = cls.__new__(cls)
+        index.unit = unit
+        index.centroids = centroids
+        index.nlist = len(centroids)
+        index._set_lists(order, bounds)
+        return index
+
+    def _set_lists(self, order: np.ndarray, bounds: np.ndarray):
+        # order: 클러스터 순으로 정렬한 장소 인덱스, bounds: 클러스터 c의 구간 order[bounds[c]:bounds[c + 1]]
+        self.order = order
+        self.bounds = bounds
+        self.lists = [order[bounds[c]:bounds[c + 1]] for c in range(self.nlist)]
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_m: int,
+        nprobe: int = 8,
+        subset: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        코사인 유사도 상위 top_m 근사 검색
+
+        Args:
+            query: (D,) 쿼리 벡터 (페르소나)
+            top_m: 반환할 개수
+            nprobe: 탐색할 클러스터 수
+            subset: 있으면 이 인덱스들(정렬된 배열)에 속한 장소만 반환
+
+        Returns:
+            장소 인덱스 배열 (유사도 내림차순)
+        """
+        q = np.asarray(query, dtype=np.float32)
+        q_norm = np.linalg.norm(q)
+        if q_norm == 0:
+            return np.empty(0, dtype=np.int64)
+        q = q / q_norm
+
+        probe = np.argsort(-(self.centroids @ q))[:min(nprobe, self.nlist)]
+        candidates = np.concatenate([self.lists[c] for c in probe])
+        if subset is not None:
+            candidates = candidates[np.isin(candidates, subset, assume_unique=True)]
+        if len(candidates) == 0:
+            return candidates
+
+        sims = self.unit[candidates] @ q
+        if len(candidates) > top_m:
+            top = np.argpartition(-sims, top_m - 1)[:top_m]
+        else:
+            top = np.arange(len(candidates))
+        return candidates[top[np.argsort(-sims[top], kind="stable")]]
+
+
+class GridIndex:
+    """위도/경도 격자 인덱스 (cell_deg 간격, 0.05도 ≈ 5.5km)"""
+
+    # 경도 칸 번호를 양수로 만들어 위도 칸 번호와 합칠 때 쓰는 값 (경도 칸 수보다 충분히 큼)
+    _KEY_OFFSET = 1 << 20
+    _KEY_BASE = 1 << 21
+
+    def __init__(self, coords: np.ndarray, cell_deg: float = 0.05):
+        self.cell_deg = cell_deg
+        self.cells: Dict[Tuple[int, int], np.ndarray] = {}
+
+        if len(coords) == 0:
+            return
+        keys = np.floor(coords / cell_deg).astype(np.int64)
+        # (위도 칸, 경도 칸) → 정수 하나로 합쳐서 셀별로 묶기 (셀 안에서는 인덱스 오름차순)
+        combined = keys[:, 0] * self._KEY_BASE + (keys[:, 1] + self._KEY_OFFSET)
+        order = np.argsort(combined, kind="stable")
+        unique_keys, starts = np.unique(combined[order], return_index=True)
+        bounds = np.append(starts, len(order))
+        self.cells = {
+            (key // self._KEY_BASE, key % self._KEY_BASE - self._KEY_OFFSET): order[bounds[c]:bounds[c + 1]]
+            for c, key in enumerate(unique_keys.tolist())
+        }
+
+    def near(self, lat: float, lng: float, rings: int = 1) -> np.ndarray:
+        """(lat, lng)가 속한 셀과 주변 rings칸 셀의 장소 인덱스"""
+        lat_key = int(np.floor(lat / self.cell_deg))
+        lng_key = int(np.floor(lng / self.cell_deg))
+        found = [
+            self.cells[(lat_key + dy, lng_key + dx)]
+            for dy in range(-rings, rings + 1)
+            for dx in range(-rings, rings + 1)
+            if (lat_key + dy, lng_key + dx) in self.cells
+        ]
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(found)
+
+
+class PlaceCatalog:
+    """
+    places 테이블 스냅샷 (추천 점수 계산용 배열)
+
+    Attributes:
+        rows: 원본 row 리스트 (상세 정보용, 수정 금지, 번들에서 읽었으면 인덱스 접근 시 파싱하는 시퀀스)
+        names: 장소 이름 리스트
+        features: (N, 20) feature 행렬
+        norms: (N,) feature L2 norm
+        ratings / prices: (N,) 배열
+        coords: (N, 2) [위도, 경도]
+        hours: (N, 7, 2) 요일별 첫 영업 구간 (hours_matrix, 번들에서 읽었을 때만, 아니면 None)
+        filter_fields / filter_values: placeFeatures 숫자 필드 → 열 번호, (N, F) 값
+            (filter_value_table, 번들에서 읽었을 때만, 아니면 {} / None)
+
+    영업일 / 카테고리 / extra_feature 필터는 listed_on / at_least로 배열에서 계산
+    (DB에서 읽은 카탈로그는 요일 / 필드별 열을 처음 필요할 때 row에서 만들어 캐시)
+        shards: 카테고리 → 해당 카테고리 장소 인덱스 배열 (오름차순)
+        version: 스냅샷을 만든 시점의 카탈로그 버전
+    """
+
+    # 카테고리 shard 기준 (algorithm.recommend_topk의 카테고리 필터와 동일)
+    CATEGORY_THRESHOLD = 0.5
+
+    # catalog_bundle에서 읽었으면 번들 디렉토리 이름 (DB에서 읽었으면 None)
+    bundle_id: Optional[str] = None
+
+    def __init__(
+        self,
+        rows: List[dict],
+        extract: Callable[[dict], Tuple[np.ndarray, float, float]],
+        version: str = "0",
+        ann_min_size: Optional[int] = None,
+        ann_nlist: Optional[int] = None,
+        expand: Optional[Callable] = None
+    ):
+        """
+        Args:
+            rows: places row 리스트
+            extract: row["features"] → (20차원 벡터, rating, price)
+            version: 카탈로그 버전
+            expand: 필터 값을 읽기 전에 row["features"]에 적용 (템플릿 참조 펼치기)
+            ann_min_size: 이 개수 이상이면 IVF 인덱스 생성 (None이면 생성 안 함)
+            ann_nlist: IVF 클러스터 수 (None이면 sqrt(N))
+        """
+        self.rows = rows
+        self.version = version
+        self.names = [row["name"] for row in rows]
+        self.index_by_name = {}
+        for i, name in enumerate(self.names):
+            self.index_by_name.setdefault(name, i)
+
+        n = len(rows)
+        self.features = np.zeros((n, 20), dtype=float)
+        self.ratings = np.zeros(n, dtype=float)
+        self.prices = np.zeros(n, dtype=float)
+        for i, row in enumerate(rows):
+            vector, self.ratings[i], self.prices[i] = extract(row["features"])
+            if len(vector) == 20:
+                self.features[i] = vector
+        self.norms = np.linalg.norm(self.features, axis=1)
+        self.coords = np.array(
+            [[row["latitude"], row["longitude"]] for row in rows], dtype=float
+        ).reshape(n, 2)
+        self.expand = expand or (lambda features: features)
+        self.hours = None
+        self.filter_fields, self.filter_values = {}, None
+        self._columns = {}
+
+        self.shards = self._build_shards(rows)
+        self._build_indexes(ann_min_size, ann_nlist)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        rows: Sequence[dict],
+        names: List[str],
+        features: np.ndarray,
+        ratings: np.ndarray,
+        prices: np.ndarray,
+        coords: np.ndarray,
+        shards: Dict[str, np.ndarray],
+        norms: np.ndarray,
+        hours: np.ndarray,
+        filter_fields: Dict[str, int],
+        filter_values: np.ndarray,
+        version: str = "0",
+        ann_min_size: Optional[int] = None,
+        ann_nlist: Optional[int] = None,
+        ann: Optional[IVFIndex] = None
+    ) -> "PlaceCatalog":
+        """
+        이미 계산된 배열로 카탈로그 생성 (catalog_bundle에서 mmap한 배열, features JSON 파싱 없음)
+
+        Args:
+            rows: row 시퀀스 (인덱스 접근 시 읽어도 됨)
+            names: 장소 이름 (rows와 같은 순서)
+            features / ratings / prices / coords / shards / norms / hours / filter_*: PlaceCatalog 속성과 같은 모양
+            ann: 미리 학습된 IVF 인덱스 (ann_min_size 조건을 만족할 때만 사용, 없으면 새로 학습)
+        """
+        catalog = cls.__new__(cls)
+        catalog.rows = rows
+        catalog.version = version
+        catalog.names = names
+        # 이름이 같으면 첫 번째 (뒤에서부터 넣어서 앞쪽 인덱스가 남음)
+        catalog.index_by_name = dict(zip(reversed(names), range(len(names) - 1, -1, -1)))
+        catalog.features = features
+        catalog.norms = norms
+        catalog.ratings = ratings
+        catalog.prices = prices
+        catalog.coords = coords
+        catalog.hours = hours
+        catalog.filter_fields = filter_fields
+        catalog.filter_values = filter_values
+        catalog.expand = lambda features: features
+        catalog._columns = {}
+        catalog.shards = shards
+        catalog._build_indexes(ann_min_size, ann_nlist, ann)
+        return catalog
+
+    def _build_indexes(self, ann_min_size: Optional[int], ann_nlist: Optional[int], ann: Optional[IVFIndex] = None):
+        self.grid = GridIndex(self.coords)
+        self.ann: Optional[IVFIndex] = None
+        if ann_min_size is not None and len(self.rows) >= ann_min_size:
+            self.ann = ann if ann is not None else IVFIndex(self.features, nlist=ann_nlist)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def _build_shards(cls, rows: List[dict]) -> Dict[str, np.ndarray]:
+        """mainCategory 기준 카테고리별 장소 인덱스 (mainCategory가 없는 장소는 제외)"""
+        members: Dict[str, List[int]] = {}
+        for i, row in enumerate(rows):
+            try:
+                main_category = row["features"]["placeFeatures"]["mainCategory"]
+            except (KeyError, TypeError):
+                continue
+            for category, value in main_category.items():
+                members.setdefault(category, [])
+                if value is not None and value >= cls.CATEGORY_THRESHOLD:
+                    members[category].append(i)
+        return {category: np.asarray(idx, dtype=np.int64) for category, idx in members.items()}
+
+    def listed_on(self, day: int, indices: np.ndarray) -> np.ndarray:
+        """indices 장소 중 DAYS[day] 요일 영업시간 항목이 있는 것 (bool 마스크)"""
+        if self.hours is not None:
+            return self.hours[indices, day, 0] != HOURS_NOT_LISTED
+        listed = self._columns.get(("day", day))
+        if listed is None:
+            listed = np.fromiter((_listed(row, DAYS[day]) for row in self.rows), dtype=bool, count=len(self.rows))
+            self._columns[("day", day)] = listed
+        return listed[indices]
+
+    def at_least(self, field: str, threshold: float, indices: np.ndarray) -> np.ndarray:
+        """
+        indices 장소 중 placeFeatures의 field 값이 threshold 이상인 것 (bool 마스크)
+
+        Args:
+            field: "atmosphere.romantic" 같은 placeFeatures 기준 경로 (값이 없거나 숫자가 아니면 False)
+        """
+        if self.filter_values is not None:
+            column = self.filter_fields.get(field)
+            if column is None:
+                return np.zeros(len(indices), dtype=bool)
+            return self.filter_values[indices, column] >= threshold
+        values = self._columns.get(("field", field))
+        if values is None:
+            path = field.split(".")
+            values = np.fromiter(
+                (_field_value(self.expand(row["features"]), path) for row in self.rows),
+                dtype=float, count=len(self.rows)
+            )
+            self._columns[("field", field)] = values
+        return values[indices] >= threshold
+
+    def hours_table(self) -> np.ndarray:
+        """(N, 7, 2) 영업시간 배열 (번들 내보내기용)"""
+        return self.hours if self.hours is not None else hours_matrix(self.rows)
+
+    def filter_table(self) -> Tuple[Dict[str, int], np.ndarray]:
+        """placeFeatures 숫자 필드 테이블 (번들 내보내기용)"""
+        if self.filter_values is not None:
+            return self.filter_fields, self.filter_values
+        return filter_value_table(self.expand(row["features"]) for row in self.rows)
+
+    def has_shard(self, category: Optional[str]) -> bool:
+        """해당 카테고리 shard가 있는지 (카탈로그에 없는 카테고리면 False)"""
+        return category is not None and category in self.shards
+
+    def candidate_indices(
+        self,
+        persona: Iterable[float],
+        position: Tuple[float, float],
+        top_m: int,
+        nprobe: int,
+        category: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        점수 계산 대상 후보 인덱스 (오름차순)
+
+        category shard가 있으면 shard 안에서만, IVF 인덱스가 없으면 (shard) 전체,
+        IVF 인덱스가 있으면 페르소나 코사인 상위 top_m (근사) ∪ 사용자 주변 격자 셀의 장소
+        (점수에 거리 항이 크게 작용하므로 가까운 장소는 유사도와 무관하게 포함)
+        """
+        shard = self.shards[category] if self.has_shard(category) else None
+
+        if self.ann is None:
+            return shard if shard is not None else np.arange(len(self.rows))
+
+        similar = self.ann.search(np.asarray(persona, dtype=float), top_m, nprobe, subset=shard)
+        nearby = self.grid.near(position[0], position[1])
+        if shard is not None:
+            nearby = np.intersect1d(nearby, shard, assume_unique=True)
+        return np.union1d(similar, nearby)
+
+
+class UserPlaceOverlay:
+    """
+    사용자 한 명의 개인 장소 블록 (공식 장소 카탈로그 위에 얹어서 같이 점수 계산)
+
+    공식 장소와 이름이 같은 장소와 이름 중복(첫 번째만 유지)은 제외
+
+    Attributes:
+        rows / names / features / ratings / prices / coords: PlaceCatalog와 같은 구조
+        index_by_name: 장소 이름 → rows 인덱스
+        version: 만든 시점의 카탈로그 버전 ("<places 버전>.<user_places 버전>")
+    """
+
+    def __init__(
+        self,
+        rows: List[dict],
+        extract: Callable[[dict], Tuple[np.ndarray, float, float]],
+        official_names: Dict[str, int],
+        version: str = "0"
+    ):
+        """
+        Args:
+            rows: user_places row 리스트 (features_status가 default / completed)
+            extract: row["features"] → (20차원 벡터, rating, price)
+            official_names: 공식 장소 이름 (PlaceCatalog.index_by_name)
+            version: 카탈로그 버전
+        """
+        self.version = version
+        self.rows: List[dict] = []
+        self.index_by_name: Dict[str, int] = {}
+        for row in rows:
+            name = row["name"]
+            if name in official_names or name in self.index_by_name:
+                continue
+            self.index_by_name[name] = len(self.rows)
+            self.rows.append(row)
+
+        n = len(self.rows)
+        self.names = [row["name"] for row in self.rows]
+        self.features = np.zeros((n, 20), dtype=float)
+        self.ratings = np.zeros(n, dtype=float)
+        self.prices = np.zeros(n, dtype=float)
+        for i, row in enumerate(self.rows):
+            vector, self.ratings[i], self.prices[i] = extract(row["features"])
+            if len(vector) == 20:
+                self.features[i] = vector
+        self.coords = np.array(
+            [[row["latitude"], row["longitude"]] for row in self.rows], dtype=float
+        ).reshape(n, 2)
+
+    def __len__(self) -> int:
+        return len(self.rows)
@@ -0,0 +1,228 @@
+"""
+요청으로 시작하는 프로세스 전체 샘플링 프로파일러 (운영 요청을 재배포 없이 프로파일링)
+
+- 켜는 방법 (settings.PROFILING_ENABLED=True 일 때만)
+  - 요청 헤더 "X-Profile: <PROFILE_HEADER_TOKEN>"
+  - 관리자 토글: 다음 N개 요청 중 경로가 prefix로 시작하는 것 (POST /admin/profiling)
+- 요청 처리 동안 백그라운드 스레드가 PROFILE_SAMPLE_INTERVAL_MS 간격으로 모든 스레드의 스택을 샘플링
+  (async 핸들러는 이벤트 루프 스레드, sync 핸들러는 threadpool 스레드에서 실행되므로 전체 스레드 대상)
+  대기 중인 스레드(select / Condition.wait / queue.get)는 제외
+- 범위는 프로세스 전체: 같은 시간에 처리된 다른 요청의 스택도 섞임
+  → 파일 첫 줄에 "scope=process"와 프로파일 중 최대 동시 요청 수를 기록 (1이면 이 요청만)
+- 결과: PROFILE_DIR에 collapsed-stack 형식 (.folded, "스레드;프레임;...;프레임 샘플수")
+  → flamegraph.pl / speedscope에 바로 입력 가능, 최대 PROFILE_MAX_FILES개만 유지
+- 샘플러 종료(join)와 파일 저장은 ProfileSession.finish (동기) → 미들웨어에서 asyncio.to_thread로 호출
+
+한 번에 하나의 요청만 프로파일링 (동시에 들어온 요청은 그냥 통과, 관리자 토글 횟수도 쓰지 않음)
+"""
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# 대기 중인 스레드의 최상단 프레임 (파일명, 함수명) → 샘플에서 제외
+_IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+}
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """sys._current_frames() 기반 스택 샘플러"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.max_inflight = 0  # 샘플링 중 관측한 최대 동시 요청 수
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.max_inflight = max(self.max_inflight, inflight.count)
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+            self.sample_count += 1
+
+    def collapsed(self) -> str:
+        """collapsed-stack 텍스트 (샘플 많은 순)"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ProfileToggle:
+    """관리자 토글: 경로 prefix가 맞는 다음 N개 요청을 프로파일링"""
+
+    def __init__(self):
+        self.remaining = 0
+        self.path_prefix = ""
+        self._lock = threading.Lock()
+
+    def arm(self, count: int, path_prefix: str = ""):
+        with self._lock:
+            self.remaining = count
+            self.path_prefix = path_prefix
+
+    def matches(self, path: str) -> bool:
+        """이번 요청이 토글 대상인지 (남은 횟수는 줄이지 않음)"""
+        with self._lock:
+            return self.remaining > 0 and path.startswith(self.path_prefix)
+
+    def take(self, path: str) -> bool:
+        """이번 요청을 프로파일링할지 (맞으면 남은 횟수 1 감소)"""
+        with self._lock:
+            if self.remaining <= 0 or not path.startswith(self.path_prefix):
+                return False
+            self.remaining -= 1
+            return True
+
+    def status(self) -> dict:
+        with self._lock:
+            return {"remaining": self.remaining, "path_prefix": self.path_prefix}
+
+
+class InflightCounter:
+    """처리 중인 요청 수 (미들웨어가 이벤트 루프에서 증감, 샘플러 스레드는 읽기만)"""
+
+    def __init__(self):
+        self.count = 0
+
+
+toggle = ProfileToggle()
+inflight = InflightCounter()
+_session_lock = threading.Lock()
+
+
+class ProfileSession:
+    """프로파일 하나 (start_profile이 샘플링을 시작한 상태로 만듦)"""
+
+    def __init__(self, method: str, path: str):
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+        self.filename = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}_{method}_{slug}.folded"
+        self.method = method
+        self.path = path
+        self.profiler = SamplingProfiler(settings.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+        self.started = time.perf_counter()
+        self.profiler.start()
+
+    def finish(self):
+        """샘플링 종료 + PROFILE_DIR에 .folded 파일 저장 (스레드 join / 파일 I/O → async 코드에서는 to_thread로 호출)"""
+        try:
+            self.profiler.stop()
+        finally:
+            _session_lock.release()
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        try:
+            _write_profile(self.filename, self.profiler, self.method, self.path, elapsed_ms)
+        except OSError as e:
+            logger.warning("profile write failed: %s", e)
+
+
+def start_profile(method: str, path: str, header_value: Optional[str]) -> Optional[ProfileSession]:
+    """
+    헤더 토큰 또는 관리자 토글로 선택된 요청이면 프로파일링 시작
+
+    다른 요청을 프로파일링 중이면 시작하지 않음 (이때 관리자 토글의 남은 횟수도 그대로)
+
+    Returns:
+        시작한 ProfileSession (대상이 아니거나 다른 프로파일이 진행 중이면 None)
+    """
+    if not settings.PROFILING_ENABLED:
+        return None
+    by_header = bool(
+        header_value and settings.PROFILE_HEADER_TOKEN and header_value == settings.PROFILE_HEADER_TOKEN
+    )
+    if not by_header and not toggle.matches(path):
+        return None
+    if not _session_lock.acquire(blocking=False):
+        return None
+    # 토글 횟수는 실제로 프로파일링할 때만 차감 (matches 이후 다른 요청이 마지막 횟수를 가져갔을 수 있음)
+    if not by_header and not toggle.take(path):
+        _session_lock.release()
+        return None
+    return ProfileSession(method, path)
+
+
+def _write_profile(filename: str, profiler: SamplingProfiler, method: str, path: str, elapsed_ms: float):
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    with open(os.path.join(settings.PROFILE_DIR, filename), "w", encoding="utf-8") as f:
+        # '#' 주석 줄은 flamegraph.pl / speedscope가 무시
+        f.write(
+            f"# {method} {path} {elapsed_ms:.1f}ms, {profiler.sample_count} samples, "
+            f"scope=process, max_concurrent_requests={profiler.max_inflight}\n"
+        )
+        f.write(profiler.collapsed())
+    _rotate()
+    logger.info("profile saved: %s (%.1fms)", filename, elapsed_ms)
+
+
+def _rotate():
+    """오래된 프로파일 삭제 (최근 PROFILE_MAX_FILES개 유지)"""
+    files = list_profiles()
+    for item in files[settings.PROFILE_MAX_FILES:]:
+        try:
+            os.remove(os.path.join(settings.PROFILE_DIR, item["name"]))
+        except OSError:
+            pass
+
+
+def list_profiles() -> List[dict]:
+    """저장된 프로파일 목록 (최신순)"""
+    if not os.path.isdir(settings.PROFILE_DIR):
+        return []
+    items = []
+    for name in os.listdir(settings.PROFILE_DIR):
+        if not name.endswith(".folded"):
+            continue
+        stat = os.stat(os.path.join(settings.PROFILE_DIR, name))
+        items.append({
+            "name": name,
+            "size": stat.st_size,
+            "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        })
+    items.sort(key=lambda item: item["name"], reverse=True)
+    return items
+
+
+def get_profile_path(name: str) -> Optional[str]:
+    """프로파일 파일 경로 (목록에 없는 이름 / 경로 조작이면 None)"""
+    if os.path.basename(name) != name or not name.endswith(".folded"):
+        return None
+    path = os.path.join(settings.PROFILE_DIR, name)
+    return path if os.path.isfile(path) else None
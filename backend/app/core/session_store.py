@@ -0,0 +1,248 @@
+"""
+페르소나 챗봇 세션 저장소
+
+- memory: 프로세스 내 LRU + TTL 저장소 (단일 워커)
+- sqlite: 파일 기반 공유 저장소 (같은 호스트의 여러 uvicorn 워커가 세션 공유)
+
+세션은 압축된 JSON으로 직렬화해서 저장하며,
+저장 시 history / recommended_places 길이를 제한해서 메모리 사용량을 일정하게 유지
+
+코스 슬롯 후보 풀(get_slot_pool_store)도 같은 백엔드의 별도 저장소에 저장
+→ sqlite면 "다른 곳으로" 재생성 요청이 다른 워커로 가도 풀을 그대로 사용
+"""
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+import time
+import zlib
+from typing import Optional
+
+from app.config import settings
+from app.core.cache import LRUTTLCache
+
+
+# recommended_places에서 세션에 유지할 필드 (장소 선택/재추천에 필요한 값만)
+RECOMMENDED_PLACE_KEYS = ("name", "score", "category", "address", "latitude", "longitude", "source")
+
+
+def compact_session(session: dict) -> dict:
+    """세션 크기 제한 (history, recommended_places 최신 항목만 유지)"""
+    history = session.get("history")
+    if history and len(history) > settings.SESSION_MAX_HISTORY:
+        session["history"] = history[-settings.SESSION_MAX_HISTORY:]
+
+    places = session.get("recommended_places")
+    if places:
+        places = places[-settings.SESSION_MAX_RECOMMENDED_PLACES:]
+        session["recommended_places"] = [
+            {key: place.get(key) for key in RECOMMENDED_PLACE_KEYS}
+            for place in places
+        ]
+
+    return session
+
+
+def serialize_session(session: dict) -> bytes:
+    """세션 dict → 압축 JSON bytes"""
+    raw = json.dumps(session, ensure_ascii=False, separators=(",", ":"), default=str)
+    return zlib.compress(raw.encode("utf-8"))
+
+
+def deserialize_session(data: bytes) -> dict:
+    """압축 JSON bytes → 세션 dict"""
+    return json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+class SessionStore(ABC):
+    """세션 저장소 인터페이스"""
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[dict]:
+        """세션 조회 (없거나 만료되면 None)"""
+
+    @abstractmethod
+    def save(self, session_id: str, session: dict):
+        """세션 저장 (크기 제한 후 직렬화)"""
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        """세션 삭제"""
+
+    @abstractmethod
+    def clear(self):
+        """전체 삭제 (벤치마크 / 테스트용)"""
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+
+class InMemorySessionStore(SessionStore):
+    """프로세스 내 LRU + TTL 세션 저장소"""
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: Optional[float] = None):
+        self._cache = LRUTTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def get(self, session_id: str) -> Optional[dict]:
+        data = self._cache.get(session_id)
+        if data is None:
+            return None
+        return deserialize_session(data)
+
+    def save(self, session_id: str, session: dict):
+        self._cache.set(session_id, serialize_session(compact_session(session)))
+
+    def delete(self, session_id: str):
+        self._cache.pop(session_id)
+
+    def clear(self):
+        self._cache.clear()
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite 기반 공유 세션 저장소 (여러 워커 프로세스에서 동일 파일 사용)"""
+
+    # save() 몇 번마다 만료/초과 세션 정리할지
+    PRUNE_EVERY = 100
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 1000,
+        ttl_seconds: Optional[float] = None,
+        table: str = "persona_sessions"
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.table = table
+        self._lock = threading.Lock()
+        self._save_count = 0
+
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                session_id TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                expires_at REAL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_updated_at ON {table} (updated_at)"
+        )
+        self._conn.commit()
+
+    def get(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT data, expires_at FROM {self.table} WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        data, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            self.delete(session_id)
+            return None
+
+        return deserialize_session(data)
+
+    def save(self, session_id: str, session: dict):
+        now = time.time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds is not None else None
+        data = serialize_session(compact_session(session))
+
+        with self._lock:
+            self._conn.execute(
+                f"""
+                INSERT INTO {self.table} (session_id, data, expires_at, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(session_id) DO UPDATE SET
+                    data = excluded.data,
+                    expires_at = excluded.expires_at,
+                    updated_at = excluded.updated_at
+                """,
+                (session_id, data, expires_at, now)
+            )
+            self._conn.commit()
+
+            self._save_count += 1
+            if self._save_count % self.PRUNE_EVERY == 0:
+                self._prune(now)
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE session_id = ?", (session_id,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def _prune(self, now: float):
+        """만료 세션 삭제 + 최대 개수 초과분은 오래된 순으로 삭제 (lock 보유 상태에서 호출)"""
+        self._conn.execute(
+            f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (now,)
+        )
+        self._conn.execute(
+            f"""
+            DELETE FROM {self.table} WHERE session_id IN (
+                SELECT session_id FROM {self.table}
+                ORDER BY updated_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,)
+        )
+        self._conn.commit()
+
+
+# 모듈 레벨 싱글톤 인스턴스
+_store: Optional[SessionStore] = None
+_slot_pool_store: Optional[SessionStore] = None
+
+
+def get_session_store() -> SessionStore:
+    """설정(SESSION_BACKEND)에 맞는 세션 저장소 싱글톤 반환"""
+    global _store
+    if _store is None:
+        if settings.SESSION_BACKEND == "sqlite":
+            _store = SQLiteSessionStore(
+                path=settings.SESSION_SQLITE_PATH,
+                max_entries=settings.SESSION_MAX_ENTRIES,
+                ttl_seconds=settings.SESSION_TTL_SECONDS
+            )
+        else:
+            _store = InMemorySessionStore(
+                max_entries=settings.SESSION_MAX_ENTRIES,
+                ttl_seconds=settings.SESSION_TTL_SECONDS
+            )
+    return _store
+
+
+def get_slot_pool_store() -> SessionStore:
+    """
+    코스 슬롯 후보 풀 저장소 싱글톤 (세션과 같은 SESSION_BACKEND, 별도 테이블 / 캐시)
+
+    크기 / TTL은 코스 캐시 설정(COURSE_CACHE_*)을 따름
+    """
+    global _slot_pool_store
+    if _slot_pool_store is None:
+        if settings.SESSION_BACKEND == "sqlite":
+            _slot_pool_store = SQLiteSessionStore(
+                path=settings.SESSION_SQLITE_PATH,
+                max_entries=settings.COURSE_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.COURSE_CACHE_TTL_SECONDS,
+                table="course_slot_pools"
+            )
+        else:
+            _slot_pool_store = InMemorySessionStore(
+                max_entries=settings.COURSE_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.COURSE_CACHE_TTL_SECONDS
+            )
+    return _slot_pool_store
@@ -1,8 +1,17 @@
 import os
 from supabase import create_client, Client
 from app.config import settings
+from app.core.tracing import TracedClient
 
 def get_supabase() -> Client:
-    url = settings.SUPABASE_URL
-    key = settings.SUPABASE_KEY
-    return create_client(url, key)
+    # 로컬 백엔드 (memory / sqlite): live 프로젝트 없이 같은 쿼리 빌더 인터페이스 제공
+    if settings.DATA_BACKEND != "supabase":
+        from app.core.local_db import get_local_client
+        client = get_local_client()
+    else:
+        client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+
+    # trace 중이면 table / rpc 쿼리마다 db.<table> span 기록
+    if settings.TRACING_ENABLED:
+        return TracedClient(client)
+    return client
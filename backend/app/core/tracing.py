@@ -0,0 +1,339 @@
+"""
+요청 단위 경량 트레이싱 (chat → LLM → recommend → DB span)
+
+- start_trace(): 요청 하나의 root span 시작 (HTTP 미들웨어에서 사용)
+- span() / traced(): 현재 span의 자식 span (contextvars로 전파 → async / threadpool에서도 유지)
+- 요청 종료 시 샘플링 판단
+  - root span이 TRACE_SLOW_THRESHOLD_MS 이상 → 전체 trace 저장 (slow)
+  - 그 외에는 TRACE_SAMPLE_RATE 비율로 저장 (sampled)
+- 저장: TRACE_EXPORT_PATH에 span당 JSON 한 줄, TRACE_OTLP_ENDPOINT가 있으면 OTLP/HTTP JSON으로 전송
+  (백그라운드 스레드에서 내보내므로 요청 latency에 영향 없음)
+
+trace가 시작되지 않은 상태(배치 스크립트, 벤치마크 등)에서는 span()이 아무것도 하지 않음
+"""
+import asyncio
+import functools
+import json
+import logging
+import queue
+import random
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """span 하나 (시간은 epoch nanoseconds)"""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "attributes", "start_ns", "end_ns", "error")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Trace:
+    """요청 하나의 span 모음"""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("itda_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("itda_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """현재 span (trace 밖이면 None)"""
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.trace_id if trace else None
+
+
+def parse_traceparent(header: Optional[str]) -> tuple:
+    """W3C traceparent ("00-<trace_id>-<parent_id>-01") → (trace_id, parent_id), 형식이 틀리면 (None, None)"""
+    if not header:
+        return None, None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None, None
+    return parts[1], parts[2]
+
+
+def _finish(span: Span, token_span, error: Optional[BaseException]):
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.error = f"{type(error).__name__}: {error}"
+    span.trace.add(span)
+    _current_span.reset(token_span)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    현재 span의 자식 span (trace 밖이면 no-op)
+
+    Args:
+        name: span 이름 (예: recommend.scoring, db.places, google.search_text)
+        attributes: span 속성
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    child = Span(trace, name, parent.span_id if parent else None, attributes)
+    token = _current_span.set(child)
+    error = None
+    try:
+        yield child
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _finish(child, token, error)
+
+
+def traced(name: str):
+    """함수 호출 전체를 span으로 감싸는 decorator (sync / async 모두 지원)"""
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def start_trace(name: str, traceparent: Optional[str] = None, **attributes):
+    """
+    root span 시작 (요청 하나), 종료 시 샘플링 판단 후 내보내기
+
+    Args:
+        name: root span 이름 (예: "POST /api/v1/persona/chat")
+        traceparent: 상위 서비스에서 전달된 W3C traceparent 헤더
+    """
+    if not settings.TRACING_ENABLED:
+        yield None
+        return
+
+    trace_id, remote_parent = parse_traceparent(traceparent)
+    trace = Trace(trace_id)
+    root = Span(trace, name, remote_parent, attributes)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(root)
+    error = None
+    try:
+        yield root
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _finish(root, span_token, error)
+        _current_trace.reset(trace_token)
+        _maybe_export(trace, root)
+
+
+def _maybe_export(trace: Trace, root: Span):
+    """slow 요청은 항상, 나머지는 샘플링 비율만큼 내보내기"""
+    if root.duration_ms >= settings.TRACE_SLOW_THRESHOLD_MS:
+        root.set_attribute("sampled", "slow")
+    elif settings.TRACE_SAMPLE_RATE > 0 and random.random() < settings.TRACE_SAMPLE_RATE:
+        root.set_attribute("sampled", "random")
+    else:
+        return
+    get_exporter().submit(trace)
+
+
+# ========== Exporter ==========
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(traces: List[Trace]) -> dict:
+    """trace 리스트 → OTLP/HTTP JSON (ExportTraceServiceRequest)"""
+    spans = []
+    for trace in traces:
+        for s in trace.spans:
+            item = {
+                "traceId": trace.trace_id,
+                "spanId": s.span_id,
+                "name": s.name,
+                "kind": 1,
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano": str(s.end_ns),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+                "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+            }
+            if s.parent_id:
+                item["parentSpanId"] = s.parent_id
+            spans.append(item)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": settings.TRACE_SERVICE_NAME}}
+            ]},
+            "scopeSpans": [{"scope": {"name": "itda.tracing"}, "spans": spans}],
+        }]
+    }
+
+
+class TraceExporter:
+    """백그라운드 스레드에서 JSONL 파일 / OTLP collector로 내보내기"""
+
+    def __init__(self, path: Optional[str], otlp_endpoint: Optional[str], max_queue: int = 1000):
+        self.path = path
+        self.otlp_endpoint = otlp_endpoint.rstrip("/") if otlp_endpoint else None
+        self._queue: "queue.Queue[Trace]" = queue.Queue(maxsize=max_queue)
+        self._worker = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._worker.start()
+
+    def submit(self, trace: Trace):
+        """내보낼 trace 추가 (큐가 가득 차면 버림 - 요청 처리를 막지 않음)"""
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            pass
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 50:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.export(batch)
+            except Exception as e:
+                # 내보내기 실패는 요청과 무관 → 경고만
+                logger.warning("trace export failed: %s", e)
+
+    def export(self, traces: List[Trace]):
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as f:
+                for trace in traces:
+                    for s in trace.spans:
+                        f.write(json.dumps(s.to_dict(), ensure_ascii=False, default=str) + "\n")
+        if self.otlp_endpoint:
+            httpx.post(f"{self.otlp_endpoint}/v1/traces", json=to_otlp(traces), timeout=5.0)
+
+
+_exporter: Optional[TraceExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter() -> TraceExporter:
+    """설정 기반 exporter 싱글톤"""
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = TraceExporter(settings.TRACE_EXPORT_PATH, settings.TRACE_OTLP_ENDPOINT)
+    return _exporter
+
+
+# ========== DB 클라이언트 span ==========
+
+class TracedQuery:
+    """쿼리 빌더 프록시: 체이닝은 그대로 넘기고 execute()만 db.<table> span으로 감쌈"""
+
+    __slots__ = ("_builder", "_name")
+
+    def __init__(self, builder, name: str):
+        self._builder = builder
+        self._name = name
+
+    def __getattr__(self, attr):
+        value = getattr(self._builder, attr)
+        if attr == "execute":
+            def execute(*args, **kwargs):
+                with span(self._name):
+                    return value(*args, **kwargs)
+            return execute
+        if callable(value):
+            def chain(*args, **kwargs):
+                result = value(*args, **kwargs)
+                return TracedQuery(result, self._name) if hasattr(result, "execute") else result
+            return chain
+        return value
+
+
+class TracedClient:
+    """Supabase / 로컬 클라이언트 프록시 (table / rpc 호출을 span으로 기록)"""
+
+    __slots__ = ("_client",)
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, name: str):
+        return TracedQuery(self._client.table(name), f"db.{name}")
+
+    def rpc(self, name: str, params: Optional[dict] = None):
+        return TracedQuery(self._client.rpc(name, params or {}), f"db.rpc.{name}")
+
+    def __getattr__(self, attr):
+        return getattr(self._client, attr)
@@ -1,10 +1,27 @@
+import logging
 import requests
 import time
 from app.config import settings
+from app.core.tracing import span
+
+logger = logging.getLogger(__name__)
 
 API_KEY = settings.GOOGLE_PLACES_API_KEY
+REQUEST_TIMEOUT = (5, 15)  # (연결, 응답) 초, 멈춘 연결이 크롤러 스레드를 계속 잡고 있지 않도록
+
+def search_place_google_v1(text_query: str, page_token: str=None, location_restriction: dict=None):
+    """
+    Places API (New) Text Search 한 페이지
+
+    Args:
+        text_query: 검색어
+        page_token: 이전 응답의 nextPageToken
+        location_restriction: 결과를 이 사각형 안으로 제한
+            {"low": {"latitude", "longitude"}, "high": {"latitude", "longitude"}}
 
-def search_place_google_v1(text_query: str, page_token: str=None):
+    Returns:
+        응답 JSON (places, nextPageToken) 또는 None (오류 응답 / 타임아웃 / 연결 실패)
+    """
     url = "https://places.googleapis.com/v1/places:searchText"
     headers = {
         "Content-Type": "application/json",
@@ -30,12 +47,21 @@ def search_place_google_v1(text_query: str, page_token: str=None):
     }
     if page_token:
         data["pageToken"] = page_token 
+    if location_restriction:
+        data["locationRestriction"] = {"rectangle": location_restriction}
         
-    response = requests.post(url, headers=headers, json=data)
+    with span("google.search_text", query=text_query) as s:
+        try:
+            response = requests.post(url, headers=headers, json=data, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            logger.error("Google search request failed: %s", e)
+            return None
+        if s is not None:
+            s.set_attribute("http.status_code", response.status_code)
     if response.status_code == 200:
         return response.json()
     else:
-        print("Error:", response.status_code, response.text)
+        logger.error("Google search error: %s %s", response.status_code, response.text)
         return None
 
 if __name__ == "__main__":
@@ -1,8 +1,23 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.api.v1.api import api_router
 from app.config import settings
 from app.core.exceptions import custom_exception_handler
+from app.core.metrics import observe_request, render_metrics
+from app.core.tracing import start_trace
+from app.core.profiler import inflight, start_profile
+from app.services.pipeline_worker import get_pipeline_worker
+
+# 핫패스 로그는 DEBUG → 운영(LOG_LEVEL=WARNING)에서는 포맷팅/출력 비용 없음
+logging.basicConfig(
+    level=getattr(logging, settings.LOG_LEVEL.upper(), logging.WARNING),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -19,6 +34,72 @@ app.add_middleware(
 
 app.add_exception_handler(HTTPException, custom_exception_handler)
 
+
+@app.on_event("startup")
+async def start_pipeline_worker():
+    """PIPELINE_WORKER_ENABLED면 feature 파이프라인 백그라운드 워커 시작"""
+    if settings.PIPELINE_WORKER_ENABLED:
+        await get_pipeline_worker().start()
+
+
+@app.on_event("shutdown")
+async def stop_pipeline_worker():
+    await get_pipeline_worker().stop()
+
+
+@app.middleware("http")
+async def record_request_duration(request: Request, call_next):
+    """요청별 latency를 route 템플릿 기준으로 기록 (경로 파라미터별로 시계열이 늘어나지 않게)"""
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = getattr(route, "path", None) or "unmatched"
+        observe_request(request.method, path, status_code, time.perf_counter() - start)
+
+
+@app.middleware("http")
+async def trace_request(request: Request, call_next):
+    """요청 하나를 root span으로 (하위 서비스 span은 contextvars로 이어짐), 응답에 X-Trace-Id 포함"""
+    with start_trace(f"{request.method} {request.url.path}", request.headers.get("traceparent")) as root:
+        if root is None:
+            return await call_next(request)
+
+        response = await call_next(request)
+        route = request.scope.get("route")
+        root.name = f"{request.method} {getattr(route, 'path', None) or 'unmatched'}"
+        root.set_attribute("http.status_code", response.status_code)
+        response.headers["X-Trace-Id"] = root.trace.trace_id
+        return response
+
+
+@app.middleware("http")
+async def profile_http_request(request: Request, call_next):
+    """
+    X-Profile 헤더 / 관리자 토글로 선택된 요청 동안 샘플링 프로파일링 (응답에 X-Profile-Id 포함)
+
+    프로파일은 프로세스 전체 스택이므로 동시 요청 수를 함께 기록 (모든 요청에서 inflight 증감)
+    """
+    inflight.count += 1
+    try:
+        session = start_profile(request.method, request.url.path, request.headers.get("x-profile"))
+        if session is None:
+            return await call_next(request)
+
+        try:
+            response = await call_next(request)
+        finally:
+            # 샘플러 join + 파일 저장 / 정리는 동기 → 이벤트 루프를 막지 않도록 스레드에서
+            await asyncio.to_thread(session.finish)
+        response.headers["X-Profile-Id"] = session.filename
+        return response
+    finally:
+        inflight.count -= 1
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/")
@@ -30,4 +111,9 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 형식 단계별 / 요청별 latency histogram"""
+    return render_metrics()
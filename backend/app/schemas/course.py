@@ -109,7 +109,7 @@ class CourseCreate(BaseModel):
     total_duration: int = 0
     start_time: str  # "HH:MM"
     end_time: str  # "HH:MM"
-    couple_id: Optional[str] = None  # 커플 ID (옵션)
+    couple_id: Optional[str] = None  # 커플 ID (비우면 사용자의 커플 ID, 커플이 없으면 생성 불가)
 
     class Config:
         json_schema_extra = {
@@ -166,3 +166,9 @@ class CourseResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class CourseRangeResponse(BaseModel):
+    """기간별 코스 조회 응답 (캘린더 월 보기용)"""
+    courses: List[CourseResponse]
+    next_cursor: Optional[str] = None  # 다음 페이지가 있으면 다음 요청에 그대로 전달
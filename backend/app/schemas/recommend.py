@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any
+
+class BatchRecommendItem(BaseModel):
+    persona: Optional[List[float]] = Field(default=None, min_length=20, max_length=20)  # 20차원 페르소나 (우선)
+    couple_id: Optional[str] = None  # persona가 없으면 커플 페르소나 조회
+    user_lat: Optional[float] = None
+    user_lng: Optional[float] = None
+    category: Optional[str] = None  # food, cafe, culture_art ...
+    last_recommend: Optional[List[str]] = None  # 제외할 장소 이름
+
+class BatchRecommendRequest(BaseModel):
+    items: List[BatchRecommendItem]
+    date: Optional[str] = None  # 영업일 필터 (YYYY-MM-DD)
+    k: int = Field(default=5, ge=1, le=50)
+    alpha: float = 0.8
+    beta: float = 0.7
+    gamma: float = 0.2
+    delta: float = 0.4
+
+class BatchRecommendResponse(BaseModel):
+    results: List[List[Dict[str, Any]]]  # items 순서대로 추천 장소 리스트
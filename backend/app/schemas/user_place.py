@@ -1,10 +1,12 @@
 """
 개인 장소 (User Places) 스키마
 """
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List, Literal
 from datetime import datetime
 
+from app.core.feature_templates import expand_features
+
 
 class UserPlaceCreate(BaseModel):
     """개인 장소 생성 요청"""
@@ -18,7 +20,12 @@ class UserPlaceCreate(BaseModel):
 
 
 class UserPlaceResponse(BaseModel):
-    """개인 장소 응답"""
+    """
+    개인 장소 응답
+
+    features는 항상 placeFeatures 구조
+    (DB에 템플릿 참조 {"template_id": ...}로 저장된 기본 features는 템플릿 내용으로 펼쳐서 반환)
+    """
     user_place_id: str
     place_hash: str
     name: str
@@ -31,6 +38,11 @@ class UserPlaceResponse(BaseModel):
     added_from: str
     created_at: datetime
 
+    @field_validator("features", mode="before")
+    @classmethod
+    def expand_template_features(cls, value):
+        return expand_features(value)
+
     class Config:
         from_attributes = True
 
@@ -39,3 +51,31 @@ class UserPlaceListResponse(BaseModel):
     """개인 장소 목록 응답"""
     places: List[UserPlaceResponse]
     total: int
+
+
+class PlaceLookupRequest(BaseModel):
+    """지도 핀 상태 조회 요청"""
+    name: str
+    latitude: float
+    longitude: float
+
+
+class PlaceLookupResponse(BaseModel):
+    """지도 핀 상태 (정식 장소 / 저장 / 찜 여부)"""
+    is_official: bool
+    official_place_id: Optional[str] = None
+    user_place: Optional[UserPlaceResponse] = None
+    is_wishlisted: bool
+    wishlist: Optional[dict] = None
+
+
+class UserPlaceBulkCreate(BaseModel):
+    """개인 장소 일괄 추가 요청 (최대 100개)"""
+    places: List[UserPlaceCreate] = Field(min_length=1, max_length=100)
+
+
+class UserPlaceBulkResponse(BaseModel):
+    """개인 장소 일괄 추가 응답"""
+    added: List[UserPlaceResponse]
+    existing: List[UserPlaceResponse]
+    official: List[str]  # 정식 DB에 있어서 저장하지 않은 장소 이름
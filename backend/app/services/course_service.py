@@ -1,8 +1,14 @@
 """
 데이트 코스 생성 서비스
 """
+import logging
 import sys
 import math
+import json
+import base64
+import hashlib
+import os
+import re
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
@@ -17,6 +23,34 @@ from app.schemas.course import (
 )
 from app.services.suggest_service import SuggestService
 from app.core.supabase_client import get_supabase
+from app.core.cache import LRUTTLCache
+from app.core.geo import location_cell
+from app.core.place_catalog import get_catalog_version
+from app.core.session_store import get_slot_pool_store
+from app.core.metrics import stage_timer
+from app.core.tracing import traced
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 코스 생성 결과 캐시 (같은 페르소나/템플릿/위치 셀/날짜면 재계산 없이 반환)
+# 키에 카탈로그 버전과 페르소나 해시가 들어가므로 둘 중 하나가 바뀌면 자동으로 miss
+_course_cache = LRUTTLCache(
+    max_entries=settings.COURSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.COURSE_CACHE_TTL_SECONDS
+)
+
+# 기간 조회 커서 값 형식 (or_() 필터 문자열에 들어가므로 엄격히 검사)
+_CURSOR_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_CURSOR_COURSE_ID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+# 슬롯별 후보 풀은 세션과 같은 저장소에 저장 (get_slot_pool_store, 코스 fingerprint → 슬롯별 다음 순위 후보 리스트)
+# "다른 곳으로" 재생성 시 전체 재계산 없이 다음 후보를 꺼내 씀, 요청이 다른 워커로 가도 사용 가능
+# 카탈로그 버전은 프로세스 내 카운터라 같은 프로세스가 저장한 풀만 버전을 비교 (다른 워커의 풀은 TTL로 만료)
+_POOL_WRITER = f"{os.getpid()}"
+
+# 후보 풀에 유지할 장소 필드 (CourseSlot 재구성에 필요한 값만)
+POOL_PLACE_KEYS = ("name", "score", "address", "latitude", "longitude", "rating", "price_range")
 
 class CourseService:
     """데이트 코스 생성 서비스"""
@@ -61,6 +95,7 @@ class CourseService:
         self.suggest_service = SuggestService()
         self.supabase = get_supabase()
         
+    @traced("course.generate_date_course")
     def generate_date_course(
         self,
         user_id: str,
@@ -84,23 +119,29 @@ class CourseService:
         Returns:
             DateCourse: 생성된 데이트 코스
         """
-        print(f"\n{'='*60}")
-        print(f"[COURSE GENERATION START]")
-        print(f"   User ID: {user_id}")
-        print(f"   Date: {date}")
-        print(f"   Template: {template}")
-        print(f"   Preferences: {preferences}")
-        print(f"   User Location: ({user_lat}, {user_lng})")
-        print(f"{'='*60}\n")
+        logger.debug(
+            "[COURSE GENERATION START] user=%s date=%s template=%s preferences=%s location=(%s, %s)",
+            user_id, date, template, preferences, user_lat, user_lng
+        )
+
+        # 0. 캐시 확인
+        persona, cacheable = self._get_persona_for_cache(user_id)
+        cache_key = self._course_cache_key(
+            user_id, persona, cacheable, template, preferences, user_lat, user_lng, date
+        )
+        cached = _course_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            logger.debug("[COURSE CACHE HIT] %s / %s", template, date)
+            return self._restore_cached_course(cached, user_lat, user_lng)
 
         # 1. 템플릿 선택
         if template == "auto":
-            template = self._select_template_by_persona(user_id)
-            print(f"[OK] Auto-selected template: {template}")
+            template = self._select_template_by_persona(user_id, persona)
+            logger.debug("[OK] Auto-selected template: %s", template)
 
         # 2. 템플릿 가져오기
         if template not in self.TEMPLATES:
-            print(f"[WARN] Template '{template}' not found, using 'full_day'")
+            logger.warning("Template '%s' not found, using 'full_day'", template)
             template = "full_day"
 
         slot_configs = self.TEMPLATES[template].copy()
@@ -115,12 +156,13 @@ class CourseService:
         previous_location: Optional[Tuple[float, float]] = None
         if user_lat is not None and user_lng is not None:
             previous_location = (user_lat, user_lng)
-            print(f"📍 첫 번째 장소는 사용자 현재 위치 기준으로 추천")
+            logger.debug("📍 첫 번째 장소는 사용자 현재 위치 기준으로 추천")
         total_distance = 0.0
         used_places: List[str] = []  # 이미 사용된 장소 이름 추적
+        pools: List[List[dict]] = []  # 슬롯별 다음 순위 후보
 
         for config in slot_configs:
-            slot = self._recommend_for_slot(
+            slot, pool = self._recommend_for_slot_with_pool(
                 user_id=user_id,
                 date=date,
                 slot_config=config,
@@ -132,6 +174,7 @@ class CourseService:
 
             if slot:
                 slots.append(slot)
+                pools.append(pool)
                 used_places.append(slot.place_name)  # 사용된 장소 추가
                 previous_location = (slot.latitude, slot.longitude)
                 if slot.distance_from_previous:
@@ -159,16 +202,19 @@ class CourseService:
             end_time=end_time
         )
 
-        print(f"\n{'='*60}")
-        print(f"[COURSE GENERATION COMPLETE]")
-        print(f"   Template: {template}")
-        print(f"   Slots: {len(slots)}")
-        print(f"   Total Distance: {course.total_distance}km")
-        print(f"   Total Duration: {course.total_duration}min ({start_time} - {end_time})")
-        print(f"{'='*60}\n")
+        logger.debug(
+            "[COURSE GENERATION COMPLETE] template=%s slots=%d distance=%skm duration=%smin (%s - %s)",
+            template, len(slots), course.total_distance, course.total_duration, start_time, end_time
+        )
+
+        self._save_slot_pools(course, pools, user_id)
+        if cache_key:
+            with stage_timer("course", "serialization"):
+                _course_cache.set(cache_key, course.model_copy(deep=True))
 
         return course
 
+    @traced("course.generate_date_course_by_keyword")
     def generate_date_course_by_keyword(
         self,
         user_id: str,
@@ -192,22 +238,28 @@ class CourseService:
             Returns:
                 DateCourse: 생성된 데이트 코스
         """
-        print(f"\n{'='*60}")
-        print(f"[COURSE GENERATION START]")
-        print(f"   User ID: {user_id}")
-        print(f"   Date: {date}")
-        print(f"   Keyword: {keyword}")
-        print(f"   Preferences: {preferences}")
-        print(f"   User Location: ({user_lat}, {user_lng})")
-        print(f"{'='*60}\n")
-        
+        logger.debug(
+            "[COURSE GENERATION START] user=%s date=%s keyword=%s preferences=%s location=(%s, %s)",
+            user_id, date, keyword, preferences, user_lat, user_lng
+        )
+
+        persona, cacheable = self._get_persona_for_cache(user_id)
+        cache_key = self._course_cache_key(
+            user_id, persona, cacheable, f"keyword:{keyword}", preferences, user_lat, user_lng, date
+        )
+        cached = _course_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            logger.debug("[COURSE CACHE HIT] keyword=%s / %s", keyword, date)
+            return self._restore_cached_course(cached, user_lat, user_lng)
+
         # 0. keyword 장소 정보 불러오기
-        response = (
-            self.supabase.table("places")
-            .select("*")
-            .ilike("name", f"%{keyword}%")
-            .execute()
-        ).data[0]
+        with stage_timer("course", "db_fetch"):
+            response = (
+                self.supabase.table("places")
+                .select("*")
+                .ilike("name", f"%{keyword}%")
+                .execute()
+            ).data[0]
         if not response:
             return None
         category = response['features']['placeFeatures']['mainCategory']
@@ -238,6 +290,7 @@ class CourseService:
 
         total_distance = 0.0
         used_places =  []
+        pools = []
         prev_location = ()
         for i, config in enumerate(slot_configs, 1):
             if i == slot_index:
@@ -261,8 +314,9 @@ class CourseService:
                     score=1,
                     distance_from_previous=None
                 )
+                pool = []  # 사용자가 지정한 장소는 후보 풀 없음
             else:
-                slot = self._recommend_for_slot(
+                slot, pool = self._recommend_for_slot_with_pool(
                     user_id=user_id,
                     date=date,
                     slot_config=config,
@@ -274,6 +328,7 @@ class CourseService:
 
             if slot:
                 slots.append(slot)
+                pools.append(pool)
                 used_places.append(slot.place_name)  # 사용된 장소 추가
                 previous_location = (slot.latitude, slot.longitude)
                 if slot.distance_from_previous:
@@ -299,28 +354,153 @@ class CourseService:
             end_time=end_time
         )
 
-        print(f"\n{'='*60}")
-        print(f"[COURSE GENERATION COMPLETE]")
-        print(f"   Template: {template}")
-        print(f"   Slots: {len(slots)}")
-        print(f"   Total Distance: {course.total_distance}km")
-        print(f"   Total Duration: {course.total_duration}min ({start_time} - {end_time})")
-        print(f"{'='*60}\n")
+        logger.debug(
+            "[COURSE GENERATION COMPLETE] template=%s slots=%d distance=%skm duration=%smin (%s - %s)",
+            template, len(slots), course.total_distance, course.total_duration, start_time, end_time
+        )
+
+        self._save_slot_pools(course, pools, user_id)
+        if cache_key:
+            with stage_timer("course", "serialization"):
+                _course_cache.set(cache_key, course.model_copy(deep=True))
+
         return course
-    def _select_template_by_persona(self, user_id: str) -> str:
+
+    # ========== Course Cache ==========
+
+    def _get_persona_for_cache(self, user_id: str) -> Tuple[Optional[List[float]], bool]:
+        """
+        캐시 키용 페르소나 조회
+
+        Returns:
+            (페르소나 or None, 캐시 사용 가능 여부) - 조회 자체가 실패하면 캐시 사용 안 함
+        """
+        try:
+            with stage_timer("course", "db_fetch"):
+                return self.suggest_service.get_user_persona(user_id), True
+        except Exception as e:
+            logger.warning("[COURSE CACHE] persona lookup failed, skipping cache: %s", e)
+            return None, False
+
+    def _course_cache_key(
+        self,
+        user_id: str,
+        persona: Optional[List[float]],
+        cacheable: bool,
+        plan: str,
+        preferences: Optional[CoursePreferences],
+        user_lat: Optional[float],
+        user_lng: Optional[float],
+        date: str
+    ) -> Optional[tuple]:
+        """
+        코스 캐시 키 생성
+
+        (user_id, 페르소나 해시, 템플릿/키워드, 설정 해시, 위치 geohash 셀, 날짜, 카탈로그 버전)
+        user_id는 개인 장소가 추천 후보에 포함되기 때문에 필요
+
+        Returns:
+            tuple 키, 캐시를 쓸 수 없으면 None
+        """
+        if not cacheable:
+            return None
+
+        # 설문 미완료(None)면 기본 페르소나로 추천되므로 그대로 캐시 가능
+        if persona is None:
+            persona = self.suggest_service.default_persona
+        persona_hash = hashlib.sha1(
+            json.dumps([round(float(v), 4) for v in persona]).encode()
+        ).hexdigest()[:16]
+        preferences_hash = hashlib.sha1(
+            preferences.model_dump_json().encode() if preferences else b""
+        ).hexdigest()[:16]
+        cell = location_cell(user_lat, user_lng, settings.COURSE_CACHE_GEOHASH_PRECISION)
+
+        return (
+            user_id,
+            persona_hash,
+            plan,
+            preferences_hash,
+            cell,
+            date,
+            get_catalog_version(user_id),
+        )
+
+    def _restore_cached_course(
+        self,
+        cached: DateCourse,
+        user_lat: Optional[float],
+        user_lng: Optional[float]
+    ) -> DateCourse:
+        """
+        캐시된 코스 복사본 반환
+
+        호출하는 쪽(regenerate_course_slot 등)이 코스를 수정해도 캐시에 영향이 없도록 deep copy,
+        첫 슬롯 거리는 같은 셀 안의 실제 현재 위치 기준으로 다시 계산
+        """
+        course = cached.model_copy(deep=True)
+
+        if course.slots and user_lat is not None and user_lng is not None:
+            first = course.slots[0]
+            course.slots[0] = first.model_copy(update={
+                "distance_from_previous": self._calculate_distance(
+                    user_lat, user_lng, first.latitude, first.longitude
+                )
+            })
+            course.total_distance = round(sum(
+                s.distance_from_previous for s in course.slots
+                if s.distance_from_previous is not None
+            ), 2)
+
+        return course
+
+    # ========== Slot Candidate Pools ==========
+
+    @staticmethod
+    def _course_fingerprint(course: DateCourse) -> str:
+        """코스 식별용 해시 (날짜 + 슬롯별 장소) - 세션에 저장된 코스와 풀을 연결하는 키"""
+        raw = json.dumps(
+            [course.date] + [[s.slot_type, s.place_name] for s in course.slots],
+            ensure_ascii=False
+        )
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _save_slot_pools(self, course: DateCourse, pools: List[List[dict]], user_id: str):
+        """코스의 슬롯별 후보 풀 저장 (저장한 프로세스 / 카탈로그 버전과 함께)"""
+        get_slot_pool_store().save(self._course_fingerprint(course), {
+            "writer": _POOL_WRITER,
+            "catalog_version": get_catalog_version(user_id),
+            "pools": pools,
+        })
+
+    def _load_slot_pools(self, course: DateCourse, user_id: str) -> Optional[List[List[dict]]]:
+        """코스의 슬롯별 후보 풀 조회 (없거나 이 프로세스에서 카탈로그가 바뀌었으면 None)"""
+        entry = get_slot_pool_store().get(self._course_fingerprint(course))
+        if entry is None:
+            return None
+        if entry.get("writer") == _POOL_WRITER and entry["catalog_version"] != get_catalog_version(user_id):
+            return None
+        if len(entry["pools"]) != len(course.slots):
+            return None
+        # 저장소에서 역직렬화한 새 객체라 그대로 수정해도 됨
+        return entry["pools"]
+
+    def _select_template_by_persona(self, user_id: str, persona: Optional[List[float]] = None) -> str:
         """
         페르소나 기반 템플릿 자동 선택
 
         Args:
             user_id: 사용자 ID
+            persona: 이미 조회한 페르소나 (None이면 DB에서 조회)
 
         Returns:
             str: 선택된 템플릿 이름
         """
-        persona = self.suggest_service.get_user_persona(user_id)
+        if persona is None:
+            persona = self.suggest_service.get_user_persona(user_id)
 
         if not persona:
-            print("[WARN] Persona not found, using default template")
+            logger.warning("Persona not found, using default template")
             return "full_day"
 
         # 페르소나 분석 (20차원 벡터)
@@ -340,11 +520,13 @@ class CourseService:
         active_participation = persona[13]
         relaxation_focused = persona[15]
 
-        print(f"\n[PERSONA ANALYSIS FOR TEMPLATE SELECTION]")
-        print(f"  food_cafe: {food_cafe:.2f}, culture_art: {culture_art:.2f}")
-        print(f"  activity_sports: {activity_sports:.2f}, nature_healing: {nature_healing:.2f}")
-        print(f"  romantic: {romantic:.2f}, energetic: {energetic:.2f}")
-        print(f"  active_participation: {active_participation:.2f}, relaxation_focused: {relaxation_focused:.2f}")
+        logger.debug(
+            "[PERSONA ANALYSIS FOR TEMPLATE SELECTION] food_cafe=%.2f culture_art=%.2f "
+            "activity_sports=%.2f nature_healing=%.2f romantic=%.2f energetic=%.2f "
+            "active_participation=%.2f relaxation_focused=%.2f",
+            food_cafe, culture_art, activity_sports, nature_healing,
+            romantic, energetic, active_participation, relaxation_focused
+        )
 
         # 템플릿 선택 로직
         # 1. 활동적인 성향 (activity_sports 높음 + active_participation 높음)
@@ -422,7 +604,7 @@ class CourseService:
             existing_types = {s["slot_type"] for s in slot_configs}
             for must_type in preferences.must_include:
                 if must_type not in existing_types:
-                    print(f"[WARN] Required slot type '{must_type}' not in template")
+                    logger.warning("Required slot type '%s' not in template", must_type)
 
         # 3. 시작 시간 조정
         if preferences.start_time:
@@ -456,8 +638,34 @@ class CourseService:
         user_lat: Optional[float] = None,
         user_lng: Optional[float] = None
     ) -> Optional[CourseSlot]:
+        """특정 슬롯에 대한 장소 추천 (후보 풀 없이 슬롯만 반환)"""
+        slot, _ = self._recommend_for_slot_with_pool(
+            user_id=user_id,
+            slot_config=slot_config,
+            date=date,
+            previous_location=previous_location,
+            exclude_places=exclude_places,
+            keyword=keyword,
+            extra_feature=extra_feature,
+            user_lat=user_lat,
+            user_lng=user_lng
+        )
+        return slot
+
+    def _recommend_for_slot_with_pool(
+        self,
+        user_id: str,
+        slot_config: Dict,
+        date: str = "",
+        previous_location: Optional[Tuple[float, float]] = None,
+        exclude_places: Optional[List[str]] = None,
+        keyword: str = None,
+        extra_feature: str = None,
+        user_lat: Optional[float] = None,
+        user_lng: Optional[float] = None
+    ) -> Tuple[Optional[CourseSlot], List[dict]]:
         """
-        특정 슬롯에 대한 장소 추천
+        특정 슬롯에 대한 장소 추천 + 다음 순위 후보 풀
 
         Args:
             user_id: 사용자 ID
@@ -470,78 +678,90 @@ class CourseService:
             user_lng: 사용자 GPS 경도
 
         Returns:
-            CourseSlot: 추천된 슬롯 (장소 포함)
+            (CourseSlot, 후보 풀): 추천된 슬롯과 점수순 나머지 후보 (실패 시 (None, []))
         """
         category = slot_config["category"]
 
-        print(f"\n[SEARCH] [{slot_config['slot_type']}] Recommending for category: {category}")
+        logger.debug("[SEARCH] [%s] Recommending for category: %s", slot_config['slot_type'], category)
         if exclude_places:
-            print(f"   Excluding places: {exclude_places}")
+            logger.debug("   Excluding places: %s", exclude_places)
         if extra_feature:
-            print(f"   Extra feature: {extra_feature}")
+            logger.debug("   Extra feature: %s", extra_feature)
 
         # suggest_service를 통해 장소 추천
         # 점진적으로 검색 개수를 늘려가며 시도
         try:
             places = None
             for k in [10, 20, 30, 50]:  # 점진적으로 증가
-                places = self.suggest_service.get_recommendations(
-                    user_id=user_id,
-                    date=date,
-                    category=category,
-                    specific_food=keyword,
-                    extra_feature=extra_feature,
-                    last_recommend=exclude_places,  # 이미 사용된 장소 제외
-                    k=k,
-                    user_lat=user_lat,
-                    user_lng=user_lng
-                )
+                with stage_timer("course", "recommend"):
+                    places = self.suggest_service.get_recommendations(
+                        user_id=user_id,
+                        date=date,
+                        category=category,
+                        specific_food=keyword,
+                        extra_feature=extra_feature,
+                        last_recommend=exclude_places,  # 이미 사용된 장소 제외
+                        k=k,
+                        user_lat=user_lat,
+                        user_lng=user_lng
+                    )
 
                 if places:
-                    print(f"   Found {len(places)} places with k={k}")
+                    logger.debug("   Found %s places with k=%s", len(places), k)
                     break
                 else:
-                    print(f"   No places with k={k}, trying larger search...")
+                    logger.debug("   No places with k=%s, trying larger search...", k)
 
             if not places:
-                print(f"[ERROR] No places found for category: {category} (tried up to k=50)")
-                return None
+                logger.error("No places found for category: %s (tried up to k=50)", category)
+                return None, []
 
             place = places[0]
+            slot = self._build_slot(slot_config, place, previous_location)
 
-            # 이전 장소로부터 거리 계산
-            distance = None
-            if previous_location:
-                distance = self._calculate_distance(
-                    previous_location[0], previous_location[1],
-                    place["latitude"], place["longitude"]
-                )
+            logger.debug("[OK] Recommended: %s (score: %.2f)", place['name'], place['score'])
+            if slot.distance_from_previous:
+                logger.debug("   Distance from previous: %.2fkm", slot.distance_from_previous)
 
-            slot = CourseSlot(
-                slot_type=slot_config["slot_type"],
-                category=category,
-                start_time=slot_config["start_time"],
-                duration=slot_config["duration"],
-                emoji=slot_config["emoji"],
-                place_name=place["name"],
-                place_address=place.get("address"),
-                latitude=place["latitude"],
-                longitude=place["longitude"],
-                rating=place.get("rating"),
-                price_range=place.get("price_range"),
-                score=place["score"],
-                distance_from_previous=distance
-            )
+            pool = [
+                {key: p.get(key) for key in POOL_PLACE_KEYS}
+                for p in places[1:settings.COURSE_CANDIDATE_POOL_SIZE + 1]
+            ]
+            return slot, pool
 
-            print(f"[OK] Recommended: {place['name']} (score: {place['score']:.2f})")
-            if distance:
-                print(f"   Distance from previous: {distance:.2f}km")
+        except Exception as e:
+            logger.error("Error recommending for slot: %s", e)
+            return None, []
 
-            return slot
+    def _build_slot(
+        self,
+        slot_config: Dict,
+        place: dict,
+        previous_location: Optional[Tuple[float, float]] = None
+    ) -> CourseSlot:
+        """슬롯 설정 + 장소 정보 → CourseSlot (이전 장소로부터 거리 포함)"""
+        distance = None
+        if previous_location:
+            distance = self._calculate_distance(
+                previous_location[0], previous_location[1],
+                place["latitude"], place["longitude"]
+            )
 
-        except Exception as e:
-            print(f"[ERROR] Error recommending for slot: {e}")
-            return None
+        return CourseSlot(
+            slot_type=slot_config["slot_type"],
+            category=slot_config["category"],
+            start_time=slot_config["start_time"],
+            duration=slot_config["duration"],
+            emoji=slot_config["emoji"],
+            place_name=place["name"],
+            place_address=place.get("address"),
+            latitude=place["latitude"],
+            longitude=place["longitude"],
+            rating=place.get("rating"),
+            price_range=place.get("price_range"),
+            score=place["score"],
+            distance_from_previous=distance
+        )
 
     def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """
@@ -574,6 +794,7 @@ class CourseService:
         adjusted = dt + timedelta(minutes=minutes)
         return adjusted.strftime("%H:%M")
 
+    @traced("course.regenerate_course_slot")
     def regenerate_course_slot(
         self,
         course: DateCourse,
@@ -597,14 +818,15 @@ class CourseService:
 
         Returns:
             DateCourse: 슬롯이 교체된 새로운 코스
+
+        category / keyword / extra_feature 변경 없이 "다른 곳으로"만 요청하면
+        코스 생성 시 저장한 후보 풀에서 다음 순위 장소를 꺼내 씀 (풀이 없으면 전체 재계산)
         """
         
         if slot_index < 0 or slot_index >= len(course.slots):
             raise ValueError(f"Invalid slot_index: {slot_index}")
 
-        print(f"\n{'='*60}")
-        print(f"[REGENERATE] Slot #{slot_index} in {course.template} course")
-        print(f"{'='*60}")
+        logger.debug("[REGENERATE] Slot #%s in %s course", slot_index, course.template)
 
         # 기존 슬롯 정보
         old_slot = course.slots[slot_index]
@@ -623,8 +845,8 @@ class CourseService:
 
         # 이미 사용된 장소들 (현재 슬롯 포함 - 같은 장소가 다시 나오지 않도록)
         exclude_places = [s.place_name for s in course.slots]
-        print(f"   Excluding ALL current places: {exclude_places}")
-        print(f"[slot change] {slot_config['category']} >> {new_category}")
+        logger.debug("   Excluding ALL current places: %s", exclude_places)
+        logger.debug("[slot change] %s >> %s", slot_config['category'], new_category)
         # 이전 위치 (이전 슬롯이 있으면, 없으면 사용자 현재 위치)
         previous_location = None
         if slot_index > 0:
@@ -633,17 +855,35 @@ class CourseService:
         elif user_lat is not None and user_lng is not None:
             previous_location = (user_lat, user_lng)
 
-        # 새로운 장소 추천 (GPS 위치 전달)
-        new_slot = self._recommend_for_slot(
-            user_id=user_id,
-            slot_config=slot_config,
-            previous_location=previous_location,
-            exclude_places=exclude_places,
-            keyword=keyword,
-            extra_feature=extra_feature,
-            user_lat=user_lat,
-            user_lng=user_lng
-        )
+        # 후보 풀에서 다음 순위 장소 꺼내기 (조건 변경이 없을 때만)
+        pools = self._load_slot_pools(course, user_id)
+        new_slot = None
+        criteria_changed = new_category != old_slot.category or keyword or extra_feature
+        if pools is not None and not criteria_changed:
+            pool = pools[slot_index]
+            while pool:
+                candidate = pool.pop(0)
+                if candidate["name"] not in exclude_places:
+                    new_slot = self._build_slot(slot_config, candidate, previous_location)
+                    logger.debug("[POOL] Using next candidate: %s (%s left)", candidate['name'], len(pool))
+                    break
+
+        if new_slot is None:
+            # 새로운 장소 추천 (GPS 위치 전달)
+            new_slot, new_pool = self._recommend_for_slot_with_pool(
+                user_id=user_id,
+                slot_config=slot_config,
+                previous_location=previous_location,
+                exclude_places=exclude_places,
+                keyword=keyword,
+                extra_feature=extra_feature,
+                user_lat=user_lat,
+                user_lng=user_lng
+            )
+            # 풀이 없었으면(다른 워커 / 만료) 이 슬롯 풀만 채워서 저장 → 다음 요청부터 풀 사용
+            if pools is None:
+                pools = [[] for _ in course.slots]
+            pools[slot_index] = new_pool
 
         if not new_slot:
             raise RuntimeError(f"Failed to find alternative place for slot #{slot_index}")
@@ -674,7 +914,7 @@ class CourseService:
         # 슬롯 교체
         course.slots[slot_index] = new_slot
         new_template = self._find_template(course.slots)
-        print(f"[DEBUG] template changed from {course.template} to {new_template}")
+        logger.debug("template changed from %s to %s", course.template, new_template)
         course.template = new_template
         # 총 거리 재계산
         course.total_distance = sum(
@@ -682,9 +922,13 @@ class CourseService:
             if s.distance_from_previous is not None
         )
 
-        print(f"\n✅ Slot #{slot_index} regenerated:")
-        print(f"   Old: {old_slot.place_name}")
-        print(f"   New: {new_slot.place_name} (score: {new_slot.score:.2f})")
+        # 바뀐 코스 기준으로 후보 풀 다시 저장 (다음 "다른 곳으로" 요청용)
+        self._save_slot_pools(course, pools, user_id)
+
+        logger.debug(
+            "✅ Slot #%d regenerated: %s -> %s (score: %.2f)",
+            slot_index, old_slot.place_name, new_slot.place_name, new_slot.score
+        )
 
         return course
 
@@ -760,13 +1004,21 @@ class CourseService:
 
         Returns:
             Created course dict
+
+        Raises:
+            ValueError: If couple_id is missing and the user is not in a couple
         """
         import uuid
+        # 기간 조회(courses.couple_id)와 전체 조회가 같은 코스를 보도록 couple_id는 항상 채움
+        couple_id = course_data.get("couple_id") or self._get_user_couple_id(user_id)
+        if not couple_id:
+            raise ValueError("couple_id is required (user is not in a couple)")
+
         course_id = str(uuid.uuid4())
         payload = {
             "course_id": course_id,
             "user_id": user_id,
-            "couple_id": course_data.get("couple_id"),
+            "couple_id": couple_id,
             "date": course_data["date"],
             "template": course_data["template"],
             "slots": course_data["slots"],              # JSONB array
@@ -787,6 +1039,17 @@ class CourseService:
 
         return response.data[0]
 
+    def _get_user_couple_id(self, user_id: str) -> Optional[str]:
+        """users.couple_id (커플이 없으면 None)"""
+        response = (
+            self.supabase.table("users")
+            .select("couple_id")
+            .eq("user_id", user_id)
+            .limit(1)
+            .execute()
+        )
+        return response.data[0].get("couple_id") if response.data else None
+
     def get_course(self, course_id: str) -> Optional[dict]:
         """
         Get course by ID
@@ -810,6 +1073,91 @@ class CourseService:
         return response.data[0]
         
 
+    def get_courses_by_couple_range(
+        self,
+        couple_id: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Dict:
+        """
+        Get a couple's courses within a date range (server-side filter, keyset pagination)
+
+        Uses the (couple_id, date, course_id) index, so the cost depends on
+        the number of courses in the range, not on the couple's total history.
+
+        Args:
+            couple_id: Couple ID
+            start_date: Inclusive start date (YYYY-MM-DD, None for no lower bound)
+            end_date: Inclusive end date (YYYY-MM-DD, None for no upper bound)
+            cursor: next_cursor from the previous page (None for the first page)
+            limit: Page size
+
+        Returns:
+            {"courses": [...], "next_cursor": str or None}
+        """
+        query = (
+            self.supabase.table("courses")
+            .select("*")
+            .eq("couple_id", couple_id)
+        )
+        if start_date:
+            query = query.gte("date", start_date)
+        if end_date:
+            query = query.lte("date", end_date)
+
+        if cursor:
+            last_date, last_course_id = self._decode_course_cursor(cursor)
+            query = query.or_(
+                f"date.gt.{last_date},and(date.eq.{last_date},course_id.gt.{last_course_id})"
+            )
+
+        # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+        response = (
+            query.order("date")
+            .order("course_id")
+            .limit(limit + 1)
+            .execute()
+        )
+        courses = response.data if response.data else []
+
+        next_cursor = None
+        if len(courses) > limit:
+            courses = courses[:limit]
+            last = courses[-1]
+            next_cursor = self._encode_course_cursor(str(last["date"]), last["course_id"])
+
+        return {"courses": courses, "next_cursor": next_cursor}
+
+    @staticmethod
+    def _encode_course_cursor(date: str, course_id: str) -> str:
+        """(date, course_id) → opaque cursor string"""
+        raw = json.dumps([date, course_id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def _decode_course_cursor(cursor: str) -> Tuple[str, str]:
+        """
+        opaque cursor string → (date, course_id)
+
+        값이 그대로 PostgREST or_() 필터 문자열에 들어가므로
+        date는 YYYY-MM-DD, course_id는 UUID 형식만 허용 (",", ")" 등으로 필터 조작 방지)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            date, course_id = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            if not isinstance(date, str) or not _CURSOR_DATE_RE.fullmatch(date):
+                raise ValueError("bad date")
+            datetime.strptime(date, "%Y-%m-%d")
+            if not isinstance(course_id, str) or not _CURSOR_COURSE_ID_RE.fullmatch(course_id):
+                raise ValueError("bad course_id")
+            return date, course_id
+        except Exception:
+            raise ValueError(f"Invalid cursor: {cursor}")
+
     def get_courses_by_user(self, user_id: str) -> List[dict]:
         """
         Get all courses by user ID
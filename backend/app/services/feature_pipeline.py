@@ -5,14 +5,29 @@ Feature Pipeline 서비스
 features를 Google Places API + OpenAI로 정밀 계산하고,
 조건 충족 시 공식 장소(places)로 승격하는 배치 파이프라인
 """
+import asyncio
+import logging
 import json
+import sys
 import httpx
+import uuid
+from pathlib import Path
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from openai import AsyncOpenAI
 
 from app.config import settings
 from app.core.supabase_client import get_supabase
+from app.core.place_catalog import bump_catalog_version
+from app.core.metrics import stage_timer
+
+# backend/algorithm.py (카탈로그 번들 내보내기)
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+import algorithm
+
+logger = logging.getLogger(__name__)
 
 
 # OpenAI 클라이언트
@@ -30,8 +45,10 @@ class FeaturePipelineService:
         """
         파이프라인 실행
 
-        1. pending 상태의 승격 후보 조회 및 features 계산
-        2. completed 상태 + user_count >= 5인 승격 대기 장소 처리
+        1. 처리할 승격 후보(pending + lease 만료 processing)를 한 건씩 lease와 함께 가져와 features 계산
+           (처리 중에는 heartbeat로 lease 연장, 실패 시 지수 백오프 후 재시도,
+           PIPELINE_MAX_ATTEMPTS회 실패하면 dead_letter)
+        2. completed 상태 + user_count >= 5인 승격 대기 장소를 lease와 함께 가져와 승격
 
         Returns:
             처리 결과 요약
@@ -44,58 +61,23 @@ class FeaturePipelineService:
             "errors": []
         }
 
-        # Phase 1: pending 상태의 승격 후보 처리 (features 계산)
-        candidates = self._get_pending_candidates(limit)
-
-        for candidate in candidates:
+        # Phase 1: 처리할 승격 후보를 한 건씩 lease와 함께 원자적으로 가져옴 (features 계산)
+        # 동시에 실행 중인 다른 수동 실행 / 백그라운드 워커와 같은 행을 잡지 않음
+        # 한 번에 limit건을 잡으면 앞 행을 처리하는 동안 뒤 행의 lease가 만료되므로 처리 직전에 잡음
+        owner = f"manual-{uuid.uuid4().hex[:8]}"
+
+        for _ in range(limit):
+            claimed = await asyncio.to_thread(self.claim_candidates, owner, 1)
+            if not claimed:
+                break
+            candidate = claimed[0]
+            heartbeat = asyncio.create_task(self.keep_lease(candidate["place_hash"], owner))
             try:
-                # 상태를 processing으로 변경
-                self._update_candidate_status(candidate["place_hash"], "processing")
-
-                # Google Places API로 상세정보 조회
-                place_details = await self._fetch_google_place_details(
-                    candidate["canonical_name"],
-                    candidate["latitude"],
-                    candidate["longitude"]
-                )
-                print(f"[FeaturePipeline] Google API 결과: {candidate['canonical_name']} -> {place_details is not None}")
-                if place_details:
-                    print(f"  - rating: {place_details.get('rating')}")
-                    print(f"  - reviews: {len(place_details.get('reviews', []))}개")
-
-                # OpenAI로 features 계산
-                features = await self._calculate_features(
-                    name=candidate["canonical_name"],
-                    category=candidate.get("canonical_category"),
-                    place_details=place_details
-                )
-
-                if features:
-                    # DB 업데이트 (place_details도 함께 저장)
-                    self._update_features(candidate["place_hash"], features, place_details)
+                outcome = await self.process_candidate(candidate)
+                if outcome["features_calculated"]:
                     results["features_calculated"] += 1
-
-                    # candidate에 google_place_details 추가 (승격 시 사용)
-                    candidate["google_place_details"] = place_details
-
-                    # 최신 user_count 다시 조회 (features 계산 중 증가했을 수 있음)
-                    updated = self.supabase.table("place_adoption_candidates") \
-                        .select("user_count") \
-                        .eq("place_hash", candidate["place_hash"]) \
-                        .single() \
-                        .execute()
-
-                    current_user_count = updated.data["user_count"] if updated.data else candidate["user_count"]
-
-                    # 승격 조건 체크
-                    if current_user_count >= PROMOTION_THRESHOLD:
-                        promoted = self._promote_to_official(candidate, features)
-                        if promoted:
-                            results["promoted"] += 1
-                else:
-                    # features 계산 실패
-                    self._update_candidate_status(candidate["place_hash"], "failed")
-
+                if outcome["promoted"]:
+                    results["promoted"] += 1
                 results["processed"] += 1
 
             except Exception as e:
@@ -104,14 +86,17 @@ class FeaturePipelineService:
                     "name": candidate["canonical_name"],
                     "error": str(e)
                 })
-                self._update_candidate_status(candidate["place_hash"], "failed")
+                await asyncio.to_thread(self._record_failure, candidate, str(e))
+            finally:
+                heartbeat.cancel()
 
         # Phase 2: 승격 대기 장소 처리 (completed 상태 + user_count >= 5)
-        ready_for_promotion = self._get_ready_for_promotion()
+        # 승격도 lease를 잡은 행만 → 다른 워커와 같은 장소를 두 번 INSERT하지 않음
+        ready_for_promotion = await asyncio.to_thread(self.claim_promotions, owner)
 
         for candidate in ready_for_promotion:
             try:
-                promoted = self._promote_to_official(candidate, candidate["features"])
+                promoted = await asyncio.to_thread(self._promote_claimed, candidate, candidate["features"])
                 if promoted:
                     results["promoted"] += 1
                 results["promotion_ready_processed"] += 1
@@ -122,14 +107,289 @@ class FeaturePipelineService:
                     "error": str(e)
                 })
 
+        if results["promoted"]:
+            await asyncio.to_thread(self.export_catalog_bundle)
+
         return results
 
+    def export_catalog_bundle(self):
+        """승격으로 places가 바뀌면 카탈로그 번들 다시 내보내기 (CATALOG_BUNDLE_PATH가 있을 때, 실패해도 진행)"""
+        if not settings.CATALOG_BUNDLE_PATH:
+            return
+        try:
+            with stage_timer("pipeline", "bundle_export"):
+                algorithm.export_place_catalog()
+        except Exception as e:
+            logger.error("[FeaturePipeline] 카탈로그 번들 내보내기 실패: %s", e)
+
+    async def process_candidate(self, candidate: dict) -> Dict[str, bool]:
+        """
+        lease를 잡은(processing) 승격 후보 하나의 features 계산 + 승격 조건 체크
+
+        Args:
+            candidate: place_adoption_candidates row
+
+        Returns:
+            {"features_calculated": bool, "promoted": bool}
+            (예외는 호출하는 쪽에서 _record_failure 처리)
+        """
+        outcome = {"features_calculated": False, "promoted": False}
+
+        # Google Places API로 상세정보 조회
+        with stage_timer("pipeline", "google"):
+            place_details = await self._fetch_google_place_details(
+                candidate["canonical_name"],
+                candidate["latitude"],
+                candidate["longitude"]
+            )
+        logger.debug(
+            "[FeaturePipeline] Google API 결과: %s -> %s (rating: %s, reviews: %s개)",
+            candidate["canonical_name"], place_details is not None,
+            place_details.get("rating") if place_details else None,
+            len(place_details.get("reviews", [])) if place_details else 0
+        )
+
+        # OpenAI로 features 계산
+        with stage_timer("pipeline", "llm"):
+            features = await self._calculate_features(
+                name=candidate["canonical_name"],
+                category=candidate.get("canonical_category"),
+                place_details=place_details
+            )
+
+        # 이하 DB 호출은 동기 HTTP 요청 → 이벤트 루프(API 요청 처리)를 막지 않도록 스레드에서 실행
+        if not features:
+            # features 계산 실패 → 백오프 후 재시도 (횟수 초과 시 dead_letter)
+            await asyncio.to_thread(self._record_failure, candidate, "features calculation failed")
+            return outcome
+
+        # DB 업데이트 (place_details도 함께 저장, lease를 잃었으면 저장하지 않음)
+        with stage_timer("pipeline", "db_update"):
+            updated = await asyncio.to_thread(self._update_features, candidate, features, place_details)
+        if not updated:
+            logger.warning("[FeaturePipeline] lease를 잃어 결과 버림: %s", candidate.get("canonical_name"))
+            return outcome
+        outcome["features_calculated"] = True
+
+        # 승격 조건 체크 (최신 user_count 기준, features 계산 중 증가했을 수 있음)
+        # 조건을 만족하면 승격 lease를 잡음 → 다른 워커가 이미 승격 중이면 건너뜀
+        claimed = await asyncio.to_thread(self.claim_promotions, candidate["lease_owner"], candidate["place_hash"])
+        if claimed:
+            # 저장된 google_place_details는 claimed 행에 있음 (승격 시 사용)
+            outcome["promoted"] = await asyncio.to_thread(self._promote_claimed, claimed[0], features)
+
+        return outcome
+
+    def _get_candidate(self, place_hash: str) -> Optional[dict]:
+        """승격 후보 한 건 조회"""
+        response = self.supabase.table("place_adoption_candidates") \
+            .select("*") \
+            .eq("place_hash", place_hash) \
+            .limit(1) \
+            .execute()
+        return response.data[0] if response.data else None
+
+    async def process_place_hash(self, place_hash: str, owner: str, on_claimed=None) -> Optional[str]:
+        """
+        승격 후보 하나를 상태에 맞게 처리 (백그라운드 워커용)
+
+        - pending / lease 만료된 processing: lease 획득 후 features 계산
+        - completed + user_count >= 5 + 미승격: 승격
+        - 그 외(다른 워커가 처리 중, 이미 승격 등): 아무것도 안 함
+
+        Args:
+            place_hash: 승격 후보 해시
+            owner: lease 소유자 (워커 ID)
+            on_claimed: lease 획득 직후 호출할 콜백 (heartbeat 시작용)
+
+        Returns:
+            "calculated" | "promoted" | "failed" | None (처리할 것 없음)
+        """
+        # DB 호출은 동기 → 스레드에서 실행 (워커는 API 서버의 이벤트 루프 안에서 돎)
+        candidate = await asyncio.to_thread(self._get_candidate, place_hash)
+        if not candidate or candidate.get("is_promoted"):
+            return None
+
+        if candidate.get("features_status") == "completed":
+            claimed = await asyncio.to_thread(self.claim_promotions, owner, place_hash)
+            if not claimed:
+                return None
+            promoted = await asyncio.to_thread(self._promote_claimed, claimed[0], claimed[0]["features"])
+            return "promoted" if promoted else None
+
+        claimed = await asyncio.to_thread(self.claim_candidate, place_hash, owner)
+        if not claimed:
+            return None
+        if on_claimed:
+            on_claimed()
+
+        try:
+            outcome = await self.process_candidate(claimed)
+        except Exception as e:
+            logger.error("[FeaturePipeline] 처리 실패: %s (%s)", claimed.get('canonical_name'), e)
+            await asyncio.to_thread(self._record_failure, claimed, str(e))
+            return "failed"
+
+        if outcome["promoted"]:
+            return "promoted"
+        return "calculated" if outcome["features_calculated"] else "failed"
+
+    def claim_candidates(self, owner: str, limit: int, place_hash: Optional[str] = None) -> List[dict]:
+        """
+        처리할 승격 후보를 lease와 함께 가져옴 (claim_adoption_candidates RPC, FOR UPDATE SKIP LOCKED)
+
+        - 대상: 재시도 시각이 지난 pending + lease가 만료된 processing (처리 중 프로세스가 죽은 행)
+        - 가져온 행은 processing + lease_owner/lease_expires_at 설정, attempts 1 증가
+        - lease가 만료된 processing 중 attempts가 PIPELINE_MAX_ATTEMPTS 이상이면 dead_letter로 이동
+
+        Args:
+            owner: lease 소유자 (워커 ID)
+            limit: 최대 개수
+            place_hash: 지정하면 이 후보만 시도
+
+        Returns:
+            가져온 place_adoption_candidates row 리스트 (다른 워커가 잡은 행은 제외)
+        """
+        response = self.supabase.rpc("claim_adoption_candidates", {
+            "p_owner": owner,
+            "p_limit": limit,
+            "p_lease_seconds": settings.PIPELINE_LEASE_SECONDS,
+            "p_max_attempts": settings.PIPELINE_MAX_ATTEMPTS,
+            "p_place_hash": place_hash,
+        }).execute()
+        return response.data or []
+
+    def claim_candidate(self, place_hash: str, owner: str) -> Optional[dict]:
+        """승격 후보 하나의 lease 획득 (다른 워커가 처리 중이거나 재시도 대기 중이면 None)"""
+        claimed = self.claim_candidates(owner, 1, place_hash=place_hash)
+        return claimed[0] if claimed else None
+
+    def claim_promotions(self, owner: str, place_hash: Optional[str] = None) -> List[dict]:
+        """
+        승격 대기 후보를 lease와 함께 가져옴 (claim_adoption_promotions RPC, FOR UPDATE SKIP LOCKED)
+
+        - 대상: completed + user_count >= PROMOTION_THRESHOLD + 미승격, lease가 없거나 만료된 행
+        - 승격이 끝나면 _promote_claimed가 lease 해제
+
+        Args:
+            owner: lease 소유자 (워커 ID)
+            place_hash: 지정하면 이 후보만 시도
+
+        Returns:
+            가져온 place_adoption_candidates row 리스트 (다른 워커가 승격 중인 행은 제외)
+        """
+        response = self.supabase.rpc("claim_adoption_promotions", {
+            "p_owner": owner,
+            "p_lease_seconds": settings.PIPELINE_LEASE_SECONDS,
+            "p_min_users": PROMOTION_THRESHOLD,
+            "p_limit": None,
+            "p_place_hash": place_hash,
+        }).execute()
+        return response.data or []
+
+    def _promote_claimed(self, candidate: dict, features: dict) -> bool:
+        """승격 lease를 잡은 후보 승격 후 lease 해제 (실패하면 lease 만료 없이 바로 다시 잡을 수 있음)"""
+        try:
+            return self._promote_to_official(candidate, features)
+        finally:
+            self.supabase.table("place_adoption_candidates") \
+                .update({"lease_owner": None, "lease_expires_at": None}) \
+                .eq("place_hash", candidate["place_hash"]) \
+                .eq("lease_owner", candidate["lease_owner"]) \
+                .execute()
+
+    def _record_failure(self, candidate: dict, error: str):
+        """
+        처리 실패 기록
+
+        attempts가 PIPELINE_MAX_ATTEMPTS 미만이면 지수 백오프 후 다시 pending,
+        이상이면 dead_letter (자동 재시도 안 함, 관리자 확인용)
+        lease를 가진 워커만 기록 (lease를 잃은 뒤 늦게 끝난 워커는 무시)
+        """
+        attempts = candidate.get("attempts") or 1
+        update_data = {
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "last_error": error[:500],
+        }
+
+        if attempts >= settings.PIPELINE_MAX_ATTEMPTS:
+            update_data["features_status"] = "dead_letter"
+            logger.error("[FeaturePipeline] dead_letter: %s (%s회 실패: %s)", candidate.get('canonical_name'), attempts, error)
+        else:
+            backoff = min(
+                settings.PIPELINE_RETRY_BASE_SECONDS * (2 ** (attempts - 1)),
+                settings.PIPELINE_RETRY_MAX_SECONDS
+            )
+            update_data["features_status"] = "pending"
+            update_data["next_attempt_at"] = (datetime.now(timezone.utc) + timedelta(seconds=backoff)).isoformat()
+            logger.warning("[FeaturePipeline] 재시도 예약: %s (%s회 실패, %s초 후)", candidate.get('canonical_name'), attempts, backoff)
+
+        query = self.supabase.table("place_adoption_candidates") \
+            .update(update_data) \
+            .eq("place_hash", candidate["place_hash"]) \
+            .eq("features_status", "processing")
+        if candidate.get("lease_owner"):
+            query = query.eq("lease_owner", candidate["lease_owner"])
+        query.execute()
+
+    async def keep_lease(self, place_hash: str, owner: str):
+        """
+        처리하는 동안 lease를 주기적으로 연장 (heartbeat, 처리가 끝나면 호출한 쪽에서 cancel)
+
+        lease를 잃으면 종료 (결과 저장은 _update_features / _record_failure의 lease 확인에서 막힘)
+        """
+        interval = max(settings.PIPELINE_LEASE_SECONDS / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await asyncio.to_thread(self.extend_lease, place_hash, owner):
+                    logger.warning("[FeaturePipeline] lease 잃음: %s", place_hash)
+                    return
+            except Exception as e:
+                logger.warning("[FeaturePipeline] heartbeat 실패: %s (%s)", place_hash, e)
+
+    def extend_lease(self, place_hash: str, owner: str) -> bool:
+        """처리 중인 후보의 lease 연장 (heartbeat), 이미 다른 워커가 가져갔으면 False"""
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=settings.PIPELINE_LEASE_SECONDS)
+        response = self.supabase.table("place_adoption_candidates") \
+            .update({"lease_expires_at": expires_at.isoformat()}) \
+            .eq("place_hash", place_hash) \
+            .eq("features_status", "processing") \
+            .eq("lease_owner", owner) \
+            .execute()
+        return bool(response.data)
+
+    def get_claimable_hashes(self, limit: int) -> List[str]:
+        """처리할 승격 후보 해시 (pending + lease 만료된 processing + 승격 대기)"""
+        if limit <= 0:
+            return []
+
+        hashes = [row["place_hash"] for row in self._get_pending_candidates(limit)]
+
+        if len(hashes) < limit:
+            stale = self.supabase.table("place_adoption_candidates") \
+                .select("place_hash") \
+                .eq("features_status", "processing") \
+                .eq("is_promoted", False) \
+                .lt("lease_expires_at", datetime.now(timezone.utc).isoformat()) \
+                .limit(limit - len(hashes)) \
+                .execute()
+            hashes.extend(row["place_hash"] for row in stale.data or [])
+
+        if len(hashes) < limit:
+            hashes.extend(row["place_hash"] for row in self._get_ready_for_promotion()[:limit - len(hashes)])
+
+        return hashes
+
     def _get_pending_candidates(self, limit: int) -> List[dict]:
-        """pending 상태의 승격 후보 조회"""
+        """pending 상태이고 재시도 시각이 지난 승격 후보 조회 (lease 없이 읽기만)"""
+        now = datetime.now(timezone.utc).isoformat()
         result = self.supabase.table("place_adoption_candidates") \
             .select("*") \
             .eq("features_status", "pending") \
             .eq("is_promoted", False) \
+            .or_(f"next_attempt_at.is.null,next_attempt_at.lte.{now}") \
             .limit(limit) \
             .execute()
         return result.data
@@ -144,13 +404,6 @@ class FeaturePipelineService:
             .execute()
         return result.data or []
 
-    def _update_candidate_status(self, place_hash: str, status: str):
-        """승격 후보 상태 업데이트"""
-        self.supabase.table("place_adoption_candidates") \
-            .update({"features_status": status}) \
-            .eq("place_hash", place_hash) \
-            .execute()
-
     async def _fetch_google_place_details(
         self,
         name: str,
@@ -159,7 +412,7 @@ class FeaturePipelineService:
     ) -> Optional[dict]:
         """Google Places API (New)로 장소 상세정보 조회"""
         if not settings.GOOGLE_PLACES_API_KEY:
-            print("[FeaturePipeline] Google API 키 없음")
+            logger.debug("[FeaturePipeline] Google API 키 없음")
             return None
 
         try:
@@ -185,10 +438,10 @@ class FeaturePipelineService:
                 search_response = await client.post(search_url, headers=search_headers, json=search_body)
                 search_data = search_response.json()
 
-                print(f"[FeaturePipeline] Text Search 결과: {len(search_data.get('places', []))}개 장소")
+                logger.debug("[FeaturePipeline] Text Search 결과: %s개 장소", len(search_data.get('places', [])))
 
                 if not search_data.get("places"):
-                    print(f"[FeaturePipeline] Text Search 실패: 결과 없음")
+                    logger.warning("[FeaturePipeline] Text Search 실패: 결과 없음")
                     return None
 
                 place = search_data["places"][0]
@@ -257,13 +510,11 @@ class FeaturePipelineService:
                 else:
                     result["opening_hours"] = None
 
-                print(f"[FeaturePipeline] 장소 정보: place_id={result['place_id']}, rating={result['rating']}, reviews={len(result['reviews'])}개")
+                logger.debug("[FeaturePipeline] 장소 정보: place_id=%s, rating=%s, reviews=%s개", result['place_id'], result['rating'], len(result['reviews']))
                 return result
 
         except Exception as e:
-            print(f"[FeaturePipeline] Google API 오류: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[FeaturePipeline] Google API 오류: %s", e)
 
         return None
 
@@ -371,23 +622,38 @@ JSON 형식을 유지하고, 불필요한 설명 없이 JSON만 반환하세요.
             return features
 
         except Exception as e:
-            print(f"[FeaturePipeline] OpenAI 오류: {e}")
+            logger.error("[FeaturePipeline] OpenAI 오류: %s", e)
             return None
 
-    def _update_features(self, place_hash: str, features: dict, place_details: Optional[dict] = None):
-        """features 업데이트 (candidates + user_places)"""
+    def _update_features(self, candidate: dict, features: dict, place_details: Optional[dict] = None) -> bool:
+        """
+        features 업데이트 (candidates + user_places)
+
+        lease를 가진 워커만 기록 (_record_failure와 같음, lease를 잃은 뒤 늦게 끝난 워커는 무시)
+
+        Returns:
+            저장했으면 True, lease를 잃어 저장하지 않았으면 False
+        """
+        place_hash = candidate["place_hash"]
         # 1. place_adoption_candidates 업데이트 (place_details도 저장)
         update_data = {
             "features": features,
-            "features_status": "completed"
+            "features_status": "completed",
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "last_error": None
         }
         if place_details:
             update_data["google_place_details"] = place_details
 
-        self.supabase.table("place_adoption_candidates") \
+        response = self.supabase.table("place_adoption_candidates") \
             .update(update_data) \
             .eq("place_hash", place_hash) \
+            .eq("features_status", "processing") \
+            .eq("lease_owner", candidate["lease_owner"]) \
             .execute()
+        if not response.data:
+            return False
 
         # 2. 해당 place_hash를 가진 모든 user_places 업데이트
         self.supabase.table("user_places") \
@@ -398,6 +664,10 @@ JSON 형식을 유지하고, 불필요한 설명 없이 JSON만 반환하세요.
             .eq("place_hash", place_hash) \
             .execute()
 
+        # 여러 사용자의 개인 장소 features가 바뀜 → 추천 캐시 전체 무효화
+        bump_catalog_version()
+        return True
+
     def _promote_to_official(self, candidate: dict, features: dict) -> bool:
         """공식 장소로 승격"""
         try:
@@ -416,7 +686,7 @@ JSON 형식을 유지하고, 불필요한 설명 없이 JSON만 반환하세요.
             if existing.data:
                 # 이미 존재하면 승격 처리만 하고 INSERT 스킵
                 existing_place_id = existing.data[0]["place_id"]
-                print(f"[FeaturePipeline] 이미 존재하는 장소: {candidate['canonical_name']} (place_id: {existing_place_id})")
+                logger.info("[FeaturePipeline] 이미 존재하는 장소: %s (place_id: %s)", candidate['canonical_name'], existing_place_id)
 
                 # place_adoption_candidates 업데이트
                 self.supabase.table("place_adoption_candidates") \
@@ -433,6 +703,7 @@ JSON 형식을 유지하고, 불필요한 설명 없이 JSON만 반환하세요.
                     .eq("place_hash", candidate["place_hash"]) \
                     .execute()
 
+                bump_catalog_version()
                 return True
 
             # 2. places 테이블에 INSERT
@@ -496,11 +767,12 @@ JSON 형식을 유지하고, 불필요한 설명 없이 JSON만 반환하세요.
                 .eq("place_hash", candidate["place_hash"]) \
                 .execute()
 
-            print(f"[FeaturePipeline] 승격 완료: {candidate['canonical_name']} -> {new_place_id}")
+            bump_catalog_version()
+            logger.info("[FeaturePipeline] 승격 완료: %s -> %s", candidate['canonical_name'], new_place_id)
             return True
 
         except Exception as e:
-            print(f"[FeaturePipeline] 승격 실패: {e}")
+            logger.error("[FeaturePipeline] 승격 실패: %s", e)
             return False
 
     def get_pipeline_status(self) -> Dict[str, Any]:
@@ -521,9 +793,9 @@ JSON 형식을 유지하고, 불필요한 설명 없이 JSON만 반환하세요.
             .eq("features_status", "completed") \
             .execute()
 
-        failed = self.supabase.table("place_adoption_candidates") \
+        dead_letter = self.supabase.table("place_adoption_candidates") \
             .select("*", count="exact") \
-            .eq("features_status", "failed") \
+            .eq("features_status", "dead_letter") \
             .execute()
 
         promoted = self.supabase.table("place_adoption_candidates") \
@@ -543,7 +815,7 @@ JSON 형식을 유지하고, 불필요한 설명 없이 JSON만 반환하세요.
             "pending": pending.count or 0,
             "processing": processing.count or 0,
             "completed": completed.count or 0,
-            "failed": failed.count or 0,
+            "dead_letter": dead_letter.count or 0,
             "promoted": promoted.count or 0,
             "ready_for_promotion": ready_for_promotion.count or 0
         }
@@ -7,9 +7,12 @@
 - 원본에서 시작해 모든 일기 별점 누적 적용
 - DB 스키마 변경 없이 구현
 """
+import logging
 from typing import List, Optional, Dict, Any
 from app.core.supabase_client import get_supabase
 
+logger = logging.getLogger(__name__)
+
 
 # features 딕셔너리 → 20차원 리스트 변환을 위한 키 순서
 FEATURES_ORDER = [
@@ -88,7 +91,7 @@ def extract_place_features(place_features: Dict[str, Any]) -> Optional[List[floa
         return main_category_values + atmosphere_values + experience_values + space_values
 
     except (KeyError, TypeError) as e:
-        print(f"[FEEDBACK] Feature extraction error: {e}")
+        logger.warning("[FEEDBACK] Feature extraction error: %s", e)
         return None
 
 
@@ -158,7 +161,7 @@ class FeedbackService:
         )
 
         if not couple_response.data:
-            print(f"[FEEDBACK] Couple not found: {couple_id}")
+            logger.warning("[FEEDBACK] Couple not found: %s", couple_id)
             return None
 
         user_id1 = couple_response.data.get("user_id1")
@@ -173,7 +176,7 @@ class FeedbackService:
         )
 
         if not users_response.data or len(users_response.data) < 2:
-            print(f"[FEEDBACK] Users not found for couple: {couple_id}")
+            logger.warning("[FEEDBACK] Users not found for couple: %s", couple_id)
             return None
 
         # user1, user2 구분
@@ -191,7 +194,7 @@ class FeedbackService:
         user2_features = features_dict_to_list(user2_features_raw) if isinstance(user2_features_raw, dict) else (user2_features_raw or [])
 
         if len(user1_features) != 20 or len(user2_features) != 20:
-            print(f"[FEEDBACK] Invalid user features length")
+            logger.warning("[FEEDBACK] Invalid user features length")
             return None
 
         # 성별에 따라 가중치 적용 (match.py와 동일 로직)
@@ -346,14 +349,14 @@ class FeedbackService:
             result["new_persona"] = current_persona
 
             # 변화량 로그
-            print(f"[FEEDBACK] Couple {couple_id}: {feedback_count} feedbacks applied")
+            logger.debug("[FEEDBACK] Couple %s: %s feedbacks applied", couple_id, feedback_count)
             changed_dims = []
             for i in range(20):
                 diff = abs(current_persona[i] - base_persona[i])
                 if diff > 0.001:
                     changed_dims.append(f"dim[{i}]: {base_persona[i]:.3f}→{current_persona[i]:.3f}")
             if changed_dims:
-                print(f"[FEEDBACK] Changes: {', '.join(changed_dims[:5])}{'...' if len(changed_dims) > 5 else ''}")
+                logger.debug("[FEEDBACK] Changes: %s%s", ', '.join(changed_dims[:5]), '...' if len(changed_dims) > 5 else '')
         else:
             result["message"] = "Failed to update database"
 
@@ -1,20 +1,173 @@
 from openai import AsyncOpenAI
 from app.config import settings
 from app.core.extra_features import get_extra_feature_service
+from app.core.metrics import stage_timer
+from app.core.tracing import current_span
 import json
+import time
+import threading
+from functools import lru_cache
 from datetime import datetime, timedelta
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("o200k_base")
+except Exception:
+    # tiktoken이 없으면 문자 수 기반 근사치 사용
+    _encoding = None
+
+# extra_feature 설명이 들어가는 액션 (설정 버전이 바뀌면 프롬프트 재생성)
+EXTRA_FEATURE_ACTIONS = {"recommend_place", "regenerate_course_slot"}
+
+# 메시지 1개당 role/구분자 오버헤드 토큰
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def count_tokens(text: str) -> int:
+    """
+    텍스트 토큰 수 계산
+
+    tiktoken이 설치되어 있으면 실제 토크나이저로 계산하고,
+    없으면 ASCII 4자당 1토큰, 한글 등 비ASCII 1자당 1토큰으로 근사
+    """
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """텍스트를 max_tokens 이하로 자름 (앞부분 유지)"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    # 말줄임표("…") 자리 1토큰 남김
+    limit = max(max_tokens - 1, 0)
+    if _encoding is not None:
+        return _encoding.decode(_encoding.encode(text)[:limit]) + "…"
+
+    # 근사 모드: 토큰 수가 예산 안으로 들어올 때까지 비율대로 줄임
+    while text and count_tokens(text) > limit:
+        text = text[:int(len(text) * limit / count_tokens(text)) - 1]
+    return text + "…"
+
+
+def trim_history(history: list, token_budget: int = None, message_max_tokens: int = None) -> list:
+    """
+    토큰 예산 안에 들어가는 최근 대화만 남김
+
+    - 긴 메시지(코스/일정 요약 등)는 message_max_tokens로 잘라서 포함
+    - 최신 메시지부터 역순으로 채우고, 예산을 넘으면 그 이전 메시지는 버림
+
+    Args:
+        history: [{"role": ..., "content": ...}, ...] (오래된 순)
+        token_budget: 히스토리 전체 토큰 예산
+        message_max_tokens: 메시지 1개당 최대 토큰
+
+    Returns:
+        예산 안에 들어가는 히스토리 (오래된 순)
+    """
+    if token_budget is None:
+        token_budget = settings.OPENAI_HISTORY_TOKEN_BUDGET
+    if message_max_tokens is None:
+        message_max_tokens = settings.OPENAI_HISTORY_MESSAGE_MAX_TOKENS
+
+    trimmed = []
+    used = 0
+    for message in reversed(history or []):
+        content = _truncate_to_tokens(message.get("content") or "", message_max_tokens)
+        tokens = count_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+        if used + tokens > token_budget:
+            break
+        trimmed.append({"role": message["role"], "content": content})
+        used += tokens
+
+    trimmed.reverse()
+    return trimmed
+
+
+class TokenUsageRecorder:
+    """OpenAI 호출별 토큰 사용량 / 지연 시간 누적 기록"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def record(self, kind: str, usage, latency: float):
+        """
+        Args:
+            kind: 호출 종류 (analyze_intent, extract_data:<action>, summarize_schedule)
+            usage: response.usage (prompt_tokens, completion_tokens)
+            latency: 호출 시간 (초)
+        """
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+
+        with self._lock:
+            totals = self._totals.setdefault(kind, {
+                "calls": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "latency_seconds": 0.0
+            })
+            totals["calls"] += 1
+            totals["prompt_tokens"] += prompt_tokens
+            totals["completion_tokens"] += completion_tokens
+            totals["latency_seconds"] += latency
+
+        logger.debug(
+            "🧮 [%s] prompt=%s completion=%s latency=%.2fs",
+            kind, prompt_tokens, completion_tokens, latency
+        )
+
+    def snapshot(self) -> dict:
+        """호출 종류별 누적 사용량 반환"""
+        with self._lock:
+            return {kind: dict(totals) for kind, totals in self._totals.items()}
+
+
+token_usage = TokenUsageRecorder()
+
+
+async def _create_completion(kind: str, **kwargs):
+    """chat.completions.create 호출 + 토큰 사용량 기록"""
+    started = time.perf_counter()
+    with stage_timer("openai", kind):
+        response = await client.chat.completions.create(**kwargs)
+        span = current_span()
+        if span is not None and response.usage is not None:
+            span.set_attribute("llm.model", kwargs.get("model", ""))
+            span.set_attribute("llm.prompt_tokens", response.usage.prompt_tokens)
+            span.set_attribute("llm.completion_tokens", response.usage.completion_tokens)
+    token_usage.record(kind, response.usage, time.perf_counter() - started)
+    return response
+
+
+def _today_key() -> str:
+    """프롬프트 캐시 키로 쓰는 오늘 날짜 (YYYY-MM-DD)"""
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def _relative_days(day_key: str):
+    """오늘/내일/모레 datetime 반환"""
+    today = datetime.strptime(day_key, "%Y-%m-%d")
+    return today, today + timedelta(days=1), today + timedelta(days=2)
+
+
 def get_intent_system_prompt():
-    """간결하고 효과적인 시스템 프롬프트"""
-    today = datetime.now()
-    tomorrow = today + timedelta(days=1)
-    day_after = today + timedelta(days=2)
+    """간결하고 효과적인 시스템 프롬프트 (하루 단위로 캐시)"""
+    return _build_intent_system_prompt(_today_key())
+
+
+@lru_cache(maxsize=4)
+def _build_intent_system_prompt(day_key: str) -> str:
+    today, tomorrow, day_after = _relative_days(day_key)
 
     return f"""당신은 친근한 한국어 일정 관리 AI 비서입니다.
 
@@ -61,9 +214,16 @@ def get_intent_system_prompt():
 유연하게 이해하고, 자연스러운 한국어로 응답하세요."""
 
 def get_action_prompt(action:str):
-    today = datetime.now()
-    tomorrow = today + timedelta(days=1)
-    day_after = today + timedelta(days=2)
+    """액션별 추출 프롬프트 (날짜 + extra_feature 설정 버전 단위로 캐시)"""
+    version = 0
+    if action in EXTRA_FEATURE_ACTIONS:
+        version = get_extra_feature_service().get_version()
+    return _build_action_prompt(action, _today_key(), version)
+
+
+@lru_cache(maxsize=32)
+def _build_action_prompt(action: str, day_key: str, extra_feature_version: int) -> str:
+    today, tomorrow, day_after = _relative_days(day_key)
     prompt = ""
     if action == 'recommend_place':
         prompt = f"""
@@ -264,22 +424,7 @@ async def summarize_schedule(schedules: list, timeframe: str):
                 "address": slot.get("address"),
             })
         compact.append(day_entry)
-    today = datetime.now()
-    tomorrow = today + timedelta(days=1)
-    day_after = today + timedelta(days=2)  
-    system_prompt = f"""
-        오늘: {today.strftime('%Y-%m-%d (%A)')}
-        내일: {tomorrow.strftime('%Y-%m-%d (%A)')}
-        모레: {day_after.strftime('%Y-%m-%d (%A)')}
-        당신은 데이트/일정 관리 도우미 AI입니다.
-        아래 JSON 형식의 일정 목록을 보고, 사용자가 이해하기 쉽게
-        자연스러운 한국어로 요약해서 설명해 주세요.
-
-        - 너무 딱딱한 말투보다는, 친절한 비서처럼 말해 주세요.
-        - 일정이 여러 개면 번호나 줄바꿈을 적당히 써서 보기 좋게 정리해 주세요.
-        - 같은 날에 여러 슬롯이 있으면, 시간 순서대로 설명해도 좋습니다.
-        - 장소 이름과 시간을 중심으로 간단히 설명해 주세요.
-        """
+    system_prompt = _build_summary_system_prompt(_today_key())
 
     user_prompt = f"""
         조회 범위(timeframe): {timeframe}
@@ -291,7 +436,8 @@ async def summarize_schedule(schedules: list, timeframe: str):
         위 데이터를 기반으로, 사용자가 바로 읽고 이해할 수 있도록
         구어체 한글로 요약해 주세요.
         """
-    response = await client.chat.completions.create(
+    response = await _create_completion(
+        "summarize_schedule",
         model=settings.OPENAI_MODEL,
         messages=[
             {"role": "system", "content": system_prompt},   # 시스템 프롬프트
@@ -303,15 +449,33 @@ async def summarize_schedule(schedules: list, timeframe: str):
 
     return response.choices[0].message.content.strip()
 
+
+@lru_cache(maxsize=4)
+def _build_summary_system_prompt(day_key: str) -> str:
+    today, tomorrow, day_after = _relative_days(day_key)
+    return f"""
+        오늘: {today.strftime('%Y-%m-%d (%A)')}
+        내일: {tomorrow.strftime('%Y-%m-%d (%A)')}
+        모레: {day_after.strftime('%Y-%m-%d (%A)')}
+        당신은 데이트/일정 관리 도우미 AI입니다.
+        아래 JSON 형식의 일정 목록을 보고, 사용자가 이해하기 쉽게
+        자연스러운 한국어로 요약해서 설명해 주세요.
+
+        - 너무 딱딱한 말투보다는, 친절한 비서처럼 말해 주세요.
+        - 일정이 여러 개면 번호나 줄바꿈을 적당히 써서 보기 좋게 정리해 주세요.
+        - 같은 날에 여러 슬롯이 있으면, 시간 순서대로 설명해도 좋습니다.
+        - 장소 이름과 시간을 중심으로 간단히 설명해 주세요.
+        """
+
 async def analyze_intent(message: str, context: dict = None, history: list = None):
     """의도 분석 - 개선된 버전"""
 
     system_prompt = get_intent_system_prompt()
     messages = [{"role": "system", "content": system_prompt}]
 
-    # 🔥 대화 히스토리 더 많이 포함 (2턴 → 6턴)
+    # 🔥 대화 히스토리는 토큰 예산(OPENAI_HISTORY_TOKEN_BUDGET) 안에서 최신 순으로 포함
     if history:
-        messages.extend(history[-12:])  # 최근 6턴
+        messages.extend(trim_history(history))
 
     # context 정보
     if context and any(context.values()):
@@ -331,13 +495,11 @@ async def analyze_intent(message: str, context: dict = None, history: list = Non
 
     messages.append({"role": "user", "content": message})
 
-    logger.info(f"\n{'='*60}")
-    logger.info(f"📤 입력: {message}")
-    if context:
-        logger.info(f"📋 Context: {context}")
+    logger.debug("📤 입력: %s (context: %s)", message, context)
 
     try:
-        response = await client.chat.completions.create(
+        response = await _create_completion(
+            "analyze_intent",
             model=settings.OPENAI_MODEL,
             messages=messages,
             temperature=0.3,  # 🔥 0.1 → 0.3 (더 창의적)
@@ -346,7 +508,7 @@ async def analyze_intent(message: str, context: dict = None, history: list = Non
         )
 
         content = response.choices[0].message.content.strip()
-        logger.info(f"📥 응답: {content[:200]}...")
+        logger.debug("📥 응답: %s...", content[:200])
 
         result = json.loads(content)
 
@@ -354,19 +516,18 @@ async def analyze_intent(message: str, context: dict = None, history: list = Non
         if "extracted_data" not in result:
             result["extracted_data"] = {}
 
-        logger.info(f"✅ 액션: {result.get('action')}")
-        logger.info(f"✅ 추출: {result.get('extracted_data')}")
-        logger.info(f"{'='*60}\n")
+        logger.debug("✅ 액션: %s, 추출: %s", result.get("action"), result.get("extracted_data"))
 
         return result
 
     except Exception as e:
-        logger.error(f"❌ OpenAI 오류: {e}")
+        logger.error("❌ OpenAI 오류: %s", e)
         return fallback_response(message, context)
 
 async def extract_data(action:str, message: str):
     prompt = get_action_prompt(action)
-    response = await client.chat.completions.create(
+    response = await _create_completion(
+        f"extract_data:{action}",
         model=settings.OPENAI_MODEL,
         messages=[
             {"role": "system", "content": prompt},   # 시스템 프롬프트
@@ -380,7 +541,7 @@ async def extract_data(action:str, message: str):
 
 def fallback_response(message: str, context: dict = None) -> dict:
     """폴백 - 더 관대하게"""
-    logger.warning(f"⚠️  폴백 모드")
+    logger.warning("⚠️  폴백 모드")
 
     normalized = normalize_message(message)
     message_lower = normalized.lower().strip()
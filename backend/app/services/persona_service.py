@@ -1,4 +1,4 @@
-from typing import Dict
+import logging
 from datetime import datetime, timedelta
 from app.schemas.persona import ChatRequest, ChatResponse
 from app.services.openai_service import analyze_intent, extract_data, summarize_schedule
@@ -6,40 +6,55 @@ from app.services.suggest_service import SuggestService
 from app.core.supabase_client import get_supabase
 from app.services.course_service import CourseService
 from app.services.schedule_service import ScheduleService
-from app.schemas.course import CoursePreferences
+from app.schemas.course import CoursePreferences, DateCourse
+from app.core.session_store import SessionStore
+from app.core.metrics import stage_timer
+from app.core.tracing import span, traced
+from app.config import settings
+
+logger = logging.getLogger(__name__)
 
 class PersonaService:
-    def __init__(self, sessions: Dict):
+    def __init__(self, sessions: SessionStore):
         self.sessions = sessions
         self.supabase = get_supabase()
         self.suggest_service = SuggestService()
         self.course_service = CourseService()
 
+    @traced("persona.process_message")
     async def process_message(self, request: ChatRequest) -> ChatResponse:
         """사용자 메시지 처리"""
 
-        # 1️⃣ 세션 초기화
-        if request.session_id not in self.sessions:
-            self.sessions[request.session_id] = {
+        # 1️⃣ 세션 로드 (없으면 초기화)
+        session = self.sessions.get(request.session_id)
+        if session is None:
+            session = {
                 "history": [],
                 "pending_data": {}
             }
 
-        session = self.sessions[request.session_id]
+        try:
+            return await self._process_message(session, request)
+        finally:
+            # 처리 중 변경된 세션 저장 (다른 워커에서도 이어서 사용)
+            self.sessions.save(request.session_id, session)
 
-        print(f"\n{'='*60}")
-        print(f"[NEW MESSAGE] {request.message}")
-        print(f"[SESSION ID] {request.session_id}")
-        print(f"[PENDING DATA] {session['pending_data']}")
-        print(f"{'='*60}\n")
+    async def _process_message(self, session: dict, request: ChatRequest) -> ChatResponse:
+        """세션 기반 메시지 처리 (process_message 내부 구현)"""
 
-        # 2️⃣ OpenAI에게 의도 분석 (기존 pending_data 전달)
-        intent = await analyze_intent(
-            message=request.message,
-            context=session["pending_data"],  # 🔥 중요: 기존 정보 전달
-            history=session["history"]
+        logger.debug(
+            "[NEW MESSAGE] %s (session: %s, pending: %s)",
+            request.message, request.session_id, session["pending_data"]
         )
 
+        # 2️⃣ OpenAI에게 의도 분석 (기존 pending_data 전달)
+        with stage_timer("persona", "llm"):
+            intent = await analyze_intent(
+                message=request.message,
+                context=session["pending_data"],  # 🔥 중요: 기존 정보 전달
+                history=session["history"]
+            )
+
         # 3️⃣ 히스토리 업데이트
         self._update_history(session, request.message, intent["message"])
 
@@ -51,40 +66,41 @@ class PersonaService:
                 if value:  # None이나 빈 값이 아닌 경우만
                     session["pending_data"][key] = value
 
-            print(f"[UPDATED] pending_data: {session['pending_data']}")
+            logger.debug("[UPDATED] pending_data: %s", session['pending_data'])
 
         # 5️⃣ 액션별 처리
         response_data = None
         action = intent["action"]
 
-        if action == "general_chat":
-            response_data = self._handle_general_chat(session)
-        elif action == "update_info":
-            response_data = await self._handle_update_info(session, intent, request)
-        elif action == "recommend_place":
-            response_data = await self._handle_recommend_place(session, intent, request, request.user_id, request.user_lat, request.user_lng)
-        elif action == "re_recommend_place":
-            response_data = self._handle_re_recommend_place(session, intent, request.user_id, request.user_lat, request.user_lng)
-        elif action == "select_place":
-            response_data = await self._handle_select_place(session, intent, request)
-        elif action == "generate_course":
-            response_data = await self._handle_generate_course(session, intent, request, request.user_id, request.user_lat, request.user_lng)
-        elif action == "view_schedule":
-            response_data = await self._handle_view_schedule(session, intent, request, request.user_id)
-        elif action == "regenerate_course_slot":
-            print(f"\n[ACTION] Calling _handle_regenerate_course_slot")
-            response_data = await self._handle_regenerate_course_slot(session, intent, request, request.user_id, request.user_lat, request.user_lng)
-            print(f"[ACTION] Response data keys: {response_data.keys() if response_data else None}")
+        with span(f"persona.{action}", action=action):
+            if action == "general_chat":
+                response_data = self._handle_general_chat(session)
+            elif action == "update_info":
+                response_data = await self._handle_update_info(session, intent, request)
+            elif action == "recommend_place":
+                response_data = await self._handle_recommend_place(session, intent, request, request.user_id, request.user_lat, request.user_lng)
+            elif action == "re_recommend_place":
+                response_data = self._handle_re_recommend_place(session, intent, request.user_id, request.user_lat, request.user_lng)
+            elif action == "select_place":
+                response_data = await self._handle_select_place(session, intent, request)
+            elif action == "generate_course":
+                response_data = await self._handle_generate_course(session, intent, request, request.user_id, request.user_lat, request.user_lng)
+            elif action == "view_schedule":
+                response_data = await self._handle_view_schedule(session, intent, request, request.user_id)
+            elif action == "regenerate_course_slot":
+                logger.debug("[ACTION] Calling _handle_regenerate_course_slot")
+                response_data = await self._handle_regenerate_course_slot(session, intent, request, request.user_id, request.user_lat, request.user_lng)
+                logger.debug("[ACTION] Response data keys: %s", response_data.keys() if response_data else None)
 
         # improved_message가 있으면 그걸 사용, 없으면 intent["message"] 사용
         final_message = intent["message"]
         if response_data and "improved_message" in response_data:
             final_message = response_data["improved_message"]
-            print(f"[DEBUG] Using improved_message: {final_message[:50]}...")
+            logger.debug("Using improved_message: %s...", final_message[:50])
         else:
-            print(f"[DEBUG] Using intent message: {final_message[:50]}...")
+            logger.debug("Using intent message: %s...", final_message[:50])
             if response_data:
-                print(f"[DEBUG] response_data keys: {response_data.keys()}")
+                logger.debug("response_data keys: %s", response_data.keys())
 
         return ChatResponse(
             message=final_message,
@@ -98,13 +114,13 @@ class PersonaService:
             {"role": "user", "content": user_msg},
             {"role": "assistant", "content": bot_msg}
         ])
-        if len(session["history"]) > 10:
-            session["history"] = session["history"][-10:]
+        if len(session["history"]) > settings.SESSION_MAX_HISTORY:
+            session["history"] = session["history"][-settings.SESSION_MAX_HISTORY:]
 
     def _handle_general_chat(self, session: dict) -> dict:
         """일반 대화 - pending_data 초기화"""
         session["pending_data"] = {}
-        print(f"[GENERAL CHAT] pending_data initialized")
+        logger.debug("[GENERAL CHAT] pending_data initialized")
 
         return {
             "action_taken": "general_chat"
@@ -114,11 +130,9 @@ class PersonaService:
         """정보 수집 중"""
         
         missing = self._check_missing_fields(session["pending_data"])
-        extracted_data = await extract_data("update_info", request.message)
-        
-        print(f"[UPDATE INFO] Collecting information")
-        print(f"   Updated data: {extracted_data}")
-        print(f"   Missing fields: {missing}")
+        with stage_timer("persona", "llm"):
+            extracted_data = await extract_data("update_info", request.message)
+        logger.debug("[UPDATE INFO] updated=%s missing=%s", extracted_data, missing)
         
         for field in missing:
             session["pending_data"][field] = extracted_data[field]
@@ -185,18 +199,16 @@ class PersonaService:
     async def _handle_recommend_place(self, session: dict, intent: dict, request: ChatRequest, user_id: str = None, user_lat: float = None, user_lng: float = None) -> dict:
         """장소 추천 처리"""
         
-        extracted_data = await extract_data(action=intent['action'], message=request.message)
+        with stage_timer("persona", "llm"):
+            extracted_data = await extract_data(action=intent['action'], message=request.message)
         specific_food = extracted_data["specific_food"]
         category = extracted_data["category"]
         extra_feature = extracted_data["extra_feature"]  # extra_feature는 없을 수 있음
 
-        print(f"\n{'='*60}")
-        print(f"[RECOMMENDATION START]")
-        print(f"   User ID: {user_id}")
-        print(f"   User Location: ({user_lat}, {user_lng})")
-        if extra_feature:
-            print(f"   Extra Feature: {extra_feature}")
-        print(f"{'='*60}\n")
+        logger.debug(
+            "[RECOMMENDATION START] user=%s location=(%s, %s) extra_feature=%s",
+            user_id, user_lat, user_lng, extra_feature
+        )
         # suggest_service를 통해 추천 장소 가져오기 (user_id와 위치 전달)
         places = self.suggest_service.get_recommendations(
             user_id=user_id,
@@ -214,13 +226,10 @@ class PersonaService:
         session["last_food"] = specific_food
         session["last_extra_feature"] = extra_feature
 
-        # 터미널 로깅
-        print(f"\n{'='*60}")
-        print(f"[RECOMMENDATION RESULTS]")
-        print(f"{'='*60}")
-        for idx, place in enumerate(places, 1):
-            print(f"{idx}. {place['name']:<40} | Score: {place['score']:.2f}")
-        print(f"{'='*60}\n")
+        logger.debug(
+            "[RECOMMENDATION RESULTS] %s",
+            [(place["name"], round(place["score"], 2)) for place in places]
+        )
 
         return {
             "action_taken": "place_recommended",
@@ -245,8 +254,8 @@ class PersonaService:
             user_lat=user_lat,
             user_lng=user_lng
         )
-        print(f"{[p['name'] for p in new_places]}")
-        # 세션 업데이트
+        logger.debug("new places: %s", [p["name"] for p in new_places])
+        # 세션 업데이트 (저장 시 최신 SESSION_MAX_RECOMMENDED_PLACES개만 유지)
         session["recommended_places"].extend(new_places)
 
         return {
@@ -258,7 +267,8 @@ class PersonaService:
     async def _handle_select_place(self, session: dict, intent: dict, request: ChatRequest) -> dict:
         """장소 선택 및 일정에 추가"""
 
-        extracted = await extract_data(action="select_place", message=request.message)
+        with stage_timer("persona", "llm"):
+            extracted = await extract_data(action="select_place", message=request.message)
         place_index = extracted.get("place_index")  # 1, 2, 3, 4, 5
         place_name = extracted.get("place_name")  # "스타벅스"
 
@@ -362,8 +372,8 @@ class PersonaService:
                 "message": "로그인이 필요합니다."
             }
 
-        extracted = await extract_data("generate_course", message=request.message)
-
+        with stage_timer("persona", "llm"):
+            extracted = await extract_data("generate_course", message=request.message)
         # 날짜 추출 (기본값: 오늘)
         date_str = extracted.get("date")
         if not date_str:
@@ -385,15 +395,10 @@ class PersonaService:
                 exclude=exclude_slots
             )
 
-        print(f"\n{'='*60}")
-        print(f"[GENERATE COURSE]")
-        print(f"   User ID: {user_id}")
-        print(f"   Date: {date_str}")
-        print(f"   Template: {template}")
-        print(f"   Preferences: {preferences}")
-        print(f"   Keyword: {keyword}")
-        print(f"   User Location: ({user_lat}, {user_lng})")
-        print(f"{'='*60}\n")
+        logger.debug(
+            "[GENERATE COURSE] user=%s date=%s template=%s preferences=%s keyword=%s location=(%s, %s)",
+            user_id, date_str, template, preferences, keyword, user_lat, user_lng
+        )
 
         try:
             # CourseService를 통해 코스 생성 (GPS 위치 전달)
@@ -416,8 +421,8 @@ class PersonaService:
                     user_lng=user_lng
                 )
 
-            # 세션에 생성된 코스 저장
-            session["generated_course"] = course
+            # 세션에 생성된 코스 저장 (직렬화 가능한 dict 형태)
+            session["generated_course"] = course.model_dump(mode="json")
 
             # 코스 정보를 보기 좋게 포맷팅
             course_lines = []
@@ -433,9 +438,7 @@ class PersonaService:
 
             formatted_message = "\n".join(course_lines)
 
-            print(f"\n[COURSE GENERATED]")
-            print(formatted_message)
-            print(f"{'='*60}\n")
+            logger.debug("[COURSE GENERATED]\n%s", formatted_message)
 
             # 응답 데이터 준비
             course_data = {
@@ -471,9 +474,7 @@ class PersonaService:
             }
 
         except Exception as e:
-            print(f"[ERROR] Failed to generate course: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Failed to generate course: %s", e)
 
             return {
                 "action_taken": "error",
@@ -496,7 +497,8 @@ class PersonaService:
                 "message": "로그인이 필요합니다."
             }
 
-        extracted = await extract_data("regenerate_course_slot", request.message)
+        with stage_timer("persona", "llm"):
+            extracted = await extract_data("regenerate_course_slot", request.message)
         slot_index = extracted.get("slot_index")
         category = extracted.get("category")
         keyword = extracted.get("keyword")
@@ -511,15 +513,13 @@ class PersonaService:
         # slot_index는 1부터 시작하는 사용자 입력을 0-based로 변환
         slot_index = int(slot_index) - 1
 
-        print(f"\n{'='*60}")
-        print(f"[REGENERATE SLOT] #{slot_index}")
-        print(f"   User Location: ({user_lat}, {user_lng})")
-        if extracted:
-            print(f"[EXTRACTED] {extracted}")
-        print(f"{'='*60}\n")
+        logger.debug(
+            "[REGENERATE SLOT] #%d location=(%s, %s) extracted=%s",
+            slot_index, user_lat, user_lng, extracted
+        )
 
         try:
-            course = session["generated_course"]
+            course = DateCourse.model_validate(session["generated_course"])
 
             # CourseService를 통해 슬롯 재생성 (GPS 위치 전달)
             updated_course = self.course_service.regenerate_course_slot(
@@ -534,7 +534,7 @@ class PersonaService:
             )
 
             # 세션에 업데이트된 코스 저장
-            session["generated_course"] = updated_course
+            session["generated_course"] = updated_course.model_dump(mode="json")
 
             # 변경된 슬롯 정보
             new_slot = updated_course.slots[slot_index]
@@ -573,8 +573,7 @@ class PersonaService:
                 ]
             }
 
-            print(f"\n[SUCCESS] Slot regenerated successfully")
-            print(f"   Returning improved_message: {message[:80]}...")
+            logger.debug("[SUCCESS] Slot regenerated: %s...", message[:80])
 
             return {
                 "action_taken": "slot_regenerated",
@@ -584,15 +583,13 @@ class PersonaService:
             }
 
         except ValueError as e:
-            print(f"[ERROR] ValueError in regenerate: {e}")
+            logger.error("ValueError in regenerate: %s", e)
             return {
                 "action_taken": "error",
                 "message": f"잘못된 슬롯 번호입니다: {str(e)}"
             }
         except Exception as e:
-            print(f"[ERROR] Failed to regenerate slot: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Failed to regenerate slot: %s", e)
 
             return {
                 "action_taken": "error",
@@ -617,15 +614,11 @@ class PersonaService:
                 "message": "로그인이 필요합니다."
             }
 
-        extracted = await extract_data("view_schedule", request.message )
+        with stage_timer("persona", "llm"):
+            extracted = await extract_data("view_schedule", request.message )
         timeframe = extracted.get("timeframe", "all")
 
-        print(f"\n{'='*60}")
-        print(f"[VIEW SCHEDULE]")
-        print(f"   User ID: {user_id}")
-        print(f"   Timeframe: {timeframe}")
-        print(f"   Current datetime: {datetime.now()}")
-        print(f"{'='*60}\n")
+        logger.debug("[VIEW SCHEDULE] user=%s timeframe=%s", user_id, timeframe)
         
         
         schedule_service = ScheduleService()
@@ -641,19 +634,19 @@ class PersonaService:
         elif timeframe == "this_week":
             # 이번 주 월요일 ~ 일요일
             start_of_week = now - timedelta(days=now.weekday())
+            end_of_week = start_of_week + timedelta(days=6)
+            # 월~일 전체를 한 번에 조회 후 날짜순으로 펼침
+            schedules_by_day = schedule_service.get_by_range(user_id, start_of_week, end_of_week)
             schedules = []
-            # 월~일 각 날짜별로 조회
-            for i in range(7):
-                day = start_of_week + timedelta(days=i)
-                day_schedules = schedule_service.get_by_date(user_id, day)
+            for day_schedules in schedules_by_day.values():
                 schedules.extend(day_schedules)
         else:  # "all"
             schedules = schedule_service.get_by_user(user_id)
 
-        print(f"[FOUND] {len(schedules)} schedule(s)")
-
-        formatted_message = await summarize_schedule(schedules, timeframe)
+        logger.debug("[FOUND] %s schedule(s)", len(schedules))
 
+        with stage_timer("persona", "llm"):
+            formatted_message = await summarize_schedule(schedules, timeframe)
         # 응답 데이터 준비
         # 11.21 : schedules_data 일단 주석처리. 이거 어디 쓰이는건지?
         schedules_data = [
@@ -672,8 +665,7 @@ class PersonaService:
             # for s in schedules
         ]
 
-        print(f"[RESPONSE]\n{formatted_message if formatted_message else 'No schedules'}\n")
-        print(f"{'='*60}\n")
+        logger.debug("[RESPONSE]\n%s", formatted_message if formatted_message else 'No schedules')
 
         result = {
             "action_taken": "schedules_retrieved",
@@ -0,0 +1,158 @@
+"""
+Feature 파이프라인 백그라운드 워커
+
+/admin/run-pipeline 수동 배치 대신 API 프로세스 안에서 승격 후보를 계속 처리
+- UserPlaceService가 승격 후보를 추가/갱신하면 notify()로 바로 큐에 넣음 (수 초 안에 처리)
+- 놓친 후보(다른 워커 프로세스에서 추가, 큐가 꽉 차서 버림, 재시작 등)는 지터를 준 주기 폴링으로 회수
+- 동시 처리 수는 PIPELINE_WORKER_CONCURRENCY, 큐 크기는 PIPELINE_QUEUE_MAX로 제한
+  (큐가 차 있으면 알림은 버리고 폴링도 빈 자리만큼만 가져옴 → 백프레셔)
+- 후보는 lease(lease_owner, lease_expires_at)를 잡고 처리, 처리 중에는 heartbeat로 연장
+  → 프로세스가 죽어 processing에 멈춘 행은 lease 만료 후 다른 워커가 다시 잡음
+- supabase 호출은 동기 HTTP 요청이므로 asyncio.to_thread로 실행 (API 요청 처리를 막지 않음)
+
+사용법:
+  PIPELINE_WORKER_ENABLED=true 로 서버 실행 (main.py startup에서 시작)
+"""
+import asyncio
+import logging
+import random
+import uuid
+from typing import Dict, Optional, Set
+
+from app.config import settings
+from app.services.feature_pipeline import FeaturePipelineService
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineWorker:
+    """프로세스 내 승격 후보 처리 워커 (asyncio 태스크)"""
+
+    def __init__(
+        self,
+        concurrency: int = None,
+        poll_interval: float = None,
+        poll_jitter: float = None,
+        queue_max: int = None
+    ):
+        self.concurrency = concurrency or settings.PIPELINE_WORKER_CONCURRENCY
+        self.poll_interval = poll_interval if poll_interval is not None else settings.PIPELINE_POLL_INTERVAL_SECONDS
+        self.poll_jitter = poll_jitter if poll_jitter is not None else settings.PIPELINE_POLL_JITTER_SECONDS
+        self.queue_max = queue_max or settings.PIPELINE_QUEUE_MAX
+        self.worker_id = f"worker-{uuid.uuid4().hex[:8]}"
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: Set[str] = set()
+        self._tasks = []
+        self._stats = {"processed": 0, "calculated": 0, "promoted": 0, "failed": 0, "dropped": 0}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        """폴러 1개 + 처리 태스크 concurrency개 시작"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_max)
+        self._tasks = [asyncio.create_task(self._poll_loop(), name="pipeline-poller")]
+        self._tasks.extend(
+            asyncio.create_task(self._consume_loop(), name=f"pipeline-consumer-{i}")
+            for i in range(self.concurrency)
+        )
+        logger.info("[PipelineWorker] 시작: %s (concurrency=%s)", self.worker_id, self.concurrency)
+
+    async def stop(self):
+        """태스크 종료 (처리 중이던 후보는 lease 만료 후 다른 워커가 다시 잡음)"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queued.clear()
+        self._loop = None
+        logger.info("[PipelineWorker] 종료: %s", self.worker_id)
+
+    def notify(self, place_hash: str):
+        """
+        승격 후보 추가/갱신 알림 (어느 스레드에서 호출해도 됨, 워커가 꺼져 있으면 무시)
+
+        Args:
+            place_hash: 승격 후보 해시
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._enqueue, place_hash)
+
+    def status(self) -> Dict:
+        """워커 상태 (관리자 API용)"""
+        return {
+            "running": self.running,
+            "worker_id": self.worker_id,
+            "concurrency": self.concurrency,
+            "queued": self._queue.qsize() if self._queue else 0,
+            **self._stats,
+        }
+
+    def _enqueue(self, place_hash: str) -> bool:
+        if self._queue is None or place_hash in self._queued:
+            return False
+        try:
+            self._queue.put_nowait(place_hash)
+        except asyncio.QueueFull:
+            # 버려도 다음 폴링에서 회수됨
+            self._stats["dropped"] += 1
+            return False
+        self._queued.add(place_hash)
+        return True
+
+    async def _poll_loop(self):
+        service = FeaturePipelineService()
+        while True:
+            free = self.queue_max - self._queue.qsize()
+            try:
+                for place_hash in await asyncio.to_thread(service.get_claimable_hashes, free):
+                    self._enqueue(place_hash)
+            except Exception as e:
+                logger.error("[PipelineWorker] 폴링 실패: %s", e)
+
+            # 여러 프로세스의 폴링이 같은 시각에 몰리지 않도록 지터
+            await asyncio.sleep(self.poll_interval + random.uniform(0, self.poll_jitter))
+
+    async def _consume_loop(self):
+        service = FeaturePipelineService()
+        while True:
+            place_hash = await self._queue.get()
+            heartbeat = None
+
+            def start_heartbeat():
+                nonlocal heartbeat
+                heartbeat = asyncio.create_task(service.keep_lease(place_hash, self.worker_id))
+
+            try:
+                result = await service.process_place_hash(place_hash, self.worker_id, on_claimed=start_heartbeat)
+                if result:
+                    self._stats["processed"] += 1
+                    self._stats[result] += 1
+                if result == "promoted":
+                    await asyncio.to_thread(service.export_catalog_bundle)
+            except Exception as e:
+                logger.error("[PipelineWorker] %s 처리 실패: %s", place_hash, e)
+            finally:
+                if heartbeat:
+                    heartbeat.cancel()
+                self._queued.discard(place_hash)
+                self._queue.task_done()
+
+
+_worker: Optional[PipelineWorker] = None
+
+
+def get_pipeline_worker() -> PipelineWorker:
+    """프로세스 전역 파이프라인 워커"""
+    global _worker
+    if _worker is None:
+        _worker = PipelineWorker()
+    return _worker
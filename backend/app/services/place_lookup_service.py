@@ -0,0 +1,146 @@
+"""
+장소 근접 조회 서비스 (지도 핀 탭 시 상태 확인)
+
+이름 + 좌표 하나로
+- 정식 장소인지 (places 스냅샷의 격자 인덱스, DB 조회 없음)
+- 이미 개인 장소로 저장했는지 (user_places의 (user_id, place_hash) 일치 조회)
+- 커플이 찜했는지 (wishlists의 (couple_id, geohash 셀) 일치 조회 후 좌표 비교)
+를 한 번에 응답
+
+위도/경도 범위(gte/lte 4개) 스캔 대신 인덱스가 있는 키의 일치 조회만 사용
+"""
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.geo import encode_geohash, place_hash
+from app.core.supabase_client import get_supabase
+
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+import algorithm
+
+
+# 같은 장소로 보는 좌표 오차 (0.0001도 ≈ 11m)
+TOLERANCE_DEG = 0.0001
+
+# wishlists.geohash 길이 (7: 약 153m 셀, 오차 범위보다 커서 주변 최대 4칸만 확인)
+WISHLIST_GEOHASH_PRECISION = 7
+
+
+def _is_near(lat1: float, lng1: float, lat2: float, lng2: float) -> bool:
+    return abs(lat1 - lat2) <= TOLERANCE_DEG and abs(lng1 - lng2) <= TOLERANCE_DEG
+
+
+def wishlist_geohash(latitude: float, longitude: float) -> str:
+    """찜 항목 저장용 geohash (wishlists.geohash)"""
+    return encode_geohash(latitude, longitude, WISHLIST_GEOHASH_PRECISION)
+
+
+def nearby_geohashes(latitude: float, longitude: float) -> List[str]:
+    """
+    오차 범위 박스가 걸치는 geohash 셀들
+
+    박스 네 꼭짓점의 셀을 모음 (셀이 박스보다 커서 꼭짓점 셀로 박스 전체가 덮임)
+
+    Returns:
+        중복 없는 geohash 리스트 (1~4개)
+    """
+    cells = {
+        wishlist_geohash(latitude + dlat, longitude + dlng)
+        for dlat in (-TOLERANCE_DEG, TOLERANCE_DEG)
+        for dlng in (-TOLERANCE_DEG, TOLERANCE_DEG)
+    }
+    return sorted(cells)
+
+
+class PlaceLookupService:
+    """정식 장소 / 개인 장소 / 찜 여부 근접 조회"""
+
+    def __init__(self):
+        self.supabase = get_supabase()
+
+    @staticmethod
+    def find_official(name: str, latitude: float, longitude: float) -> Optional[dict]:
+        """
+        정식 장소(places) 중 이름이 같고 좌표가 오차 범위 안인 장소
+
+        Returns:
+            places row 또는 None
+        """
+        catalog = algorithm.get_place_catalog()
+        for i in catalog.grid.near(latitude, longitude):
+            i = int(i)
+            if catalog.names[i] != name:
+                continue
+            lat, lng = catalog.coords[i]
+            if _is_near(lat, lng, latitude, longitude):
+                return catalog.rows[i]
+        return None
+
+    def find_saved(self, user_id: str, name: str, latitude: float, longitude: float) -> Optional[dict]:
+        """이미 저장한 개인 장소 (place_hash 일치)"""
+        response = self.supabase.table("user_places") \
+            .select("*") \
+            .eq("user_id", user_id) \
+            .eq("place_hash", place_hash(name, latitude, longitude)) \
+            .limit(1) \
+            .execute()
+        return response.data[0] if response.data else None
+
+    def find_wishlist(self, couple_id: str, latitude: float, longitude: float) -> Optional[dict]:
+        """커플 찜목록 중 좌표가 오차 범위 안인 항목 (주변 geohash 셀만 조회)"""
+        response = self.supabase.table("wishlists") \
+            .select("*") \
+            .eq("couple_id", couple_id) \
+            .in_("geohash", nearby_geohashes(latitude, longitude)) \
+            .execute()
+        return self.match_wishlist(response.data or [], latitude, longitude)
+
+    @staticmethod
+    def match_wishlist(wishlists: List[dict], latitude: float, longitude: float) -> Optional[dict]:
+        """찜목록 리스트에서 좌표가 오차 범위 안인 첫 항목"""
+        for item in wishlists:
+            if _is_near(item["latitude"], item["longitude"], latitude, longitude):
+                return item
+        return None
+
+    def lookup(
+        self,
+        user_id: str,
+        name: str,
+        latitude: float,
+        longitude: float,
+        couple_id: Optional[str] = None
+    ) -> dict:
+        """
+        핀 하나의 상태를 한 번에 조회
+
+        Args:
+            user_id: 사용자 ID
+            name: 장소 이름
+            latitude / longitude: 좌표
+            couple_id: 커플 ID (없으면 찜 여부는 확인하지 않음)
+
+        Returns:
+            {
+                "is_official": bool,
+                "official_place_id": str | None,
+                "user_place": dict | None,
+                "is_wishlisted": bool,
+                "wishlist": dict | None
+            }
+        """
+        official = self.find_official(name, latitude, longitude)
+        # 정식 장소는 개인 장소로 저장되지 않으므로 조회 생략
+        user_place = None if official else self.find_saved(user_id, name, latitude, longitude)
+        wishlist = self.find_wishlist(couple_id, latitude, longitude) if couple_id else None
+
+        return {
+            "is_official": official is not None,
+            "official_place_id": official.get("place_id") if official else None,
+            "user_place": user_place,
+            "is_wishlisted": wishlist is not None,
+            "wishlist": wishlist,
+        }
@@ -1,114 +1,124 @@
 from app.core.supabase_client import get_supabase
 from app.services.course_service import CourseService
 from datetime import datetime
+from typing import Dict, List, Optional
 
 class ScheduleService:
     def __init__(self):
         self.supabase = get_supabase()
         self.table_name = "couples"
-    
-    def _get_course_ids(self, user_id):
+
+    def _get_couple_id(self, user_id) -> Optional[str]:
         response = (
             self.supabase
             .table(self.table_name)
-            .select("schedules")
+            .select("couple_id")
             .or_(f"user_id1.eq.{user_id},user_id2.eq.{user_id}")
             .maybe_single()
             .execute()
         )
-        
-        if not response.data:
-            return []
-        else:
-            course_ids = response.data.get("schedules", [])
-        
-        return course_ids
-    
-    def get_by_date(
+
+        if not response or not response.data:
+            return None
+        return response.data.get("couple_id")
+
+    def _course_to_schedules(self, course: dict) -> List[dict]:
+        """코스 1개 → 슬롯별 일정 리스트"""
+        slots = course.get("slots", [{}]) if course.get("slots") else {}
+        schedules = []
+        for slot in slots:
+            schedule = {
+                "id": slot.get("course_id"),  # course_id를 그대로 사용
+                "user_id": course.get("user_id"),
+                "title": slot.get("place_name", ""),
+                "date": str(course.get("date", "")) if course.get("date") else "",
+                "time": course.get("start_time"),
+                "duration": slot.get("duration", ""),
+                "place_name": slot.get("place_name"),
+                "latitude": slot.get("latitude"),
+                "longitude": slot.get("longitude"),
+                "address": slot.get("place_address"),
+                "created_at": str(course.get("created_at", "")) if course.get("created_at") else "",
+                "updated_at": str(course.get("updated_at")) if course.get("updated_at") else None,
+            }
+            schedules.append(schedule)
+        return schedules
+
+    def get_by_range(
         self,
         user_id: str,
-        date: datetime,
-    ):
-        start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        end = date.replace(hour=23, minute=59, second=59, microsecond=999999)
+        start: datetime,
+        end: datetime,
+    ) -> Dict[str, list]:
+        """
+        기간 내 일정을 날짜별로 묶어서 조회
 
-        start_str = start.isoformat()
-        end_str = end.isoformat()
-        
-        course_ids = self._get_course_ids(user_id)
-        course_service = CourseService()
-        
-        courses = [course_service.get_course(course_id) for course_id in course_ids]
-        
-        schedules_total = []
+        courses (couple_id, date) 인덱스로 기간 내 코스만 서버에서 필터링
+        → 커플의 전체 일정 수와 무관하게 기간 내 코스 수에 비례
+
+        Args:
+            user_id: 사용자 ID
+            start: 시작 날짜 (포함)
+            end: 종료 날짜 (포함)
+
+        Returns:
+            {"YYYY-MM-DD": [코스별 일정 리스트, ...], ...} (날짜 오름차순)
+        """
+        couple_id = self._get_couple_id(user_id)
+        if not couple_id:
+            return {}
+
+        courses = self._get_couple_courses(couple_id, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+
+        schedules_by_day: Dict[str, list] = {}
         for course in courses:
-            course_date = course.get("date")
-            if isinstance(course_date, str):
-                try:
-                    parsed = datetime.fromisoformat(course_date.replace("Z", "+00:00"))
-                    course_datetime = parsed.replace(tzinfo=None)
-                except Exception:
-                    continue
-            elif isinstance(course_date, datetime):
-                # datetime이면 tz정보 있을 수 있으므로 제거
-                course_datetime = course_date.replace(tzinfo=None)
-            else:
+            # date는 "YYYY-MM-DD" 또는 ISO datetime 문자열 → 앞 10자리가 날짜
+            day = str(course.get("date") or "")[:10]
+            if not day:
                 continue
+            schedules_by_day.setdefault(day, []).append(self._course_to_schedules(course))
 
-            # 날짜 범위 비교
-            if not (start <= course_datetime <= end):
-                continue
-            slots = course.get("slots", [{}]) if course.get("slots") else {}
-            schedules = []
-            for slot in slots:
-                
-                schedule = {
-                    "id": slot.get("course_id"),  # course_id를 그대로 사용
-                    "user_id": course.get("user_id"),
-                    "title": slot.get("place_name", ""),
-                    "date": str(course.get("date", "")) if course.get("date") else "",
-                    "time": course.get("start_time"),
-                    "duration": slot.get("duration", ""),
-                    "place_name": slot.get("place_name"),
-                    "latitude": slot.get("latitude"),
-                    "longitude": slot.get("longitude"),
-                    "address": slot.get("place_address"),
-                    "created_at": str(course.get("created_at", "")) if course.get("created_at") else "",
-                    "updated_at": str(course.get("updated_at")) if course.get("updated_at") else None,
-                }
-                schedules.append(schedule)
-            schedules_total.append(schedules)
+        return dict(sorted(schedules_by_day.items()))
+
+    def get_by_date(
+        self,
+        user_id: str,
+        date: datetime,
+    ):
+        schedules_by_day = self.get_by_range(user_id, date, date)
+        return schedules_by_day.get(date.strftime("%Y-%m-%d"), [])
 
-        return schedules_total
-    
     def get_by_user(
         self,
         user_id: str
     ):
-        course_ids = self._get_course_ids(user_id)
+        """커플의 전체 일정 (get_by_range와 같은 courses.couple_id 기준, 날짜 오름차순)"""
+        couple_id = self._get_couple_id(user_id)
+        if not couple_id:
+            return []
+
+        courses = self._get_couple_courses(couple_id)
+        return [self._course_to_schedules(course) for course in courses]
+
+    def _get_couple_courses(
+        self,
+        couple_id: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> List[dict]:
+        """커플의 코스를 (기간 내에서) 모든 페이지 조회"""
         course_service = CourseService()
-        
-        courses = [course_service.get_course(course_id) for course_id in course_ids]
-        
-        schedules_total = []
-        for course in courses:
-            schedules = []
-            slots = course.get("slots", [{}]) if course.get("slots") else {}
-            for slot in slots:
-                schedule = {
-                    "id": slot.get("course_id"),  # course_id를 그대로 사용
-                    "user_id": course.get("user_id"),
-                    "title": slot.get("place_name", ""),
-                    "date": str(course.get("date", "")) if course.get("date") else "",
-                    "time": course.get("start_time"),
-                    "duration": slot.get("duration", ""),
-                    "place_name": slot.get("place_name"),
-                    "latitude": slot.get("latitude"),
-                    "longitude": slot.get("longitude"),
-                    "address": slot.get("place_address"),
-                    "created_at": str(course.get("created_at", "")) if course.get("created_at") else "",
-                    "updated_at": str(course.get("updated_at")) if course.get("updated_at") else None,
-                }
-                schedules.append(schedule)
-            schedules_total.append(schedules)
-        return schedules_total
+        courses = []
+        cursor = None
+        while True:
+            page = course_service.get_courses_by_couple_range(
+                couple_id,
+                start_date=start_date,
+                end_date=end_date,
+                cursor=cursor,
+            )
+            courses.extend(page["courses"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        return courses
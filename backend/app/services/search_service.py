@@ -1,6 +1,9 @@
+import logging
 import httpx
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 class SearchService:
     NAVER_SEARCH_URL = "https://openapi.naver.com/v1/search/local.json"
     
@@ -29,7 +32,7 @@ class SearchService:
             )
             
             if response.status_code != 200:
-                print(f"[SearchService] Naver API error: {response.status_code} - {response.text}")
+                logger.warning("[SearchService] Naver API error: %s - %s", response.status_code, response.text)
                 return []
             
             data = response.json()
@@ -55,7 +58,7 @@ class SearchService:
                     item['longitude'] = lon
                     
                 except Exception as e:
-                    print(f"Coordinate conversion error: {e}")
+                    logger.warning("Coordinate conversion error: %s", e)
                     pass
             
             return items
@@ -2,10 +2,13 @@
 장소 추천 서비스
 algorithm.py를 import하여 사용 (수정 없이 재사용)
 """
+import logging
 import sys
 from pathlib import Path
 from typing import List, Dict, Optional
 from app.core.supabase_client import get_supabase
+from app.core.metrics import stage_timer
+from app.core.tracing import traced
 
 # backend/algorithm.py를 import하기 위한 경로 설정
 backend_path = Path(__file__).parent.parent.parent
@@ -13,6 +16,9 @@ sys.path.insert(0, str(backend_path))
 
 # algorithm.py import (수정 없이 사용)
 import algorithm
+from app.services.feedback_service import FEATURES_ORDER
+
+logger = logging.getLogger(__name__)
 
 class SuggestService:
     """장소 추천 서비스"""
@@ -56,7 +62,7 @@ class SuggestService:
         if couple_id:
             couple_persona = self.get_couple_persona(couple_id)
             if couple_persona:
-                print(f"[PERSONA] Using COUPLE persona (used_id: {couple_id})")
+                logger.debug("[PERSONA] Using COUPLE persona (used_id: %s)", couple_id)
                 return couple_persona
 
         # 개인 페르소나 사용
@@ -65,7 +71,7 @@ class SuggestService:
         if not data or not user.data.get("survey_done"):
             return None
 
-        print(f"[PERSONA] Using INDIVIDUAL persona (used_id: {user_id})")
+        logger.debug("[PERSONA] Using INDIVIDUAL persona (used_id: %s)", user_id)
         return [
             data["food_cafe"], data["culture_art"], data["activity_sports"],
             data["nature_healing"], data["craft_experience"], data["shopping"],
@@ -112,7 +118,7 @@ class SuggestService:
         all_places = []
         page_token = None
         place_query = f"송도 {specific_food} 맛집"
-        print(f"🔍 '{place_query}' 검색 중...")
+        logger.debug("🔍 '%s' 검색 중...", place_query)
 
         for _ in range(5):
             result = search_place_google_v1(place_query, page_token)
@@ -125,11 +131,12 @@ class SuggestService:
                 break
             time.sleep(2)
 
-        print(f"✅ 총 {len(all_places)}개 장소 수집 완료")
+        logger.debug("✅ 총 %s개 장소 수집 완료", len(all_places))
         candidate_names = []
         for p in all_places:
             candidate_names.append(p["displayName"]["text"])
         return candidate_names
+    @traced("suggest.get_recommendations")
     def get_recommendations(
         self,
         last_recommend=None,
@@ -170,35 +177,27 @@ class SuggestService:
         persona_source = "직접 전달"
         if persona is None:
             if user_id:
-                persona = self.get_user_persona(user_id)
+                with stage_timer("suggest", "db_fetch"):
+                    persona = self.get_user_persona(user_id)
                 if persona:
                     persona_source = "DB 조회 (위 로그 참조)"
             if persona is None:
                 persona = self.default_persona
                 persona_source = "기본값 (default)"
 
-        # 페르소나 값 출력
-        print(f"\n{'='*60}")
-        print(f"[PERSONA USED] Source: {persona_source}")
-        print(f"{'='*60}")
-        print(f"Main Category (6):")
-        print(f"  food_cafe: {persona[0]:.2f}, culture_art: {persona[1]:.2f}, activity_sports: {persona[2]:.2f}")
-        print(f"  nature_healing: {persona[3]:.2f}, craft_experience: {persona[4]:.2f}, shopping: {persona[5]:.2f}")
-        print(f"\nAtmosphere (6):")
-        print(f"  quiet: {persona[6]:.2f}, romantic: {persona[7]:.2f}, trendy: {persona[8]:.2f}")
-        print(f"  private_vibe: {persona[9]:.2f}, artistic: {persona[10]:.2f}, energetic: {persona[11]:.2f}")
-        print(f"\nExperience Type (4):")
-        print(f"  passive_enjoyment: {persona[12]:.2f}, active_participation: {persona[13]:.2f}")
-        print(f"  social_bonding: {persona[14]:.2f}, relaxation_focused: {persona[15]:.2f}")
-        print(f"\nSpace Characteristics (4):")
-        print(f"  indoor_ratio: {persona[16]:.2f}, crowdedness_expected: {persona[17]:.2f}")
-        print(f"  photo_worthiness: {persona[18]:.2f}, scenic_view: {persona[19]:.2f}")
-        print(f"{'='*60}\n")
+        # 페르소나 값 출력 (DEBUG 레벨일 때만 포맷팅)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[PERSONA USED] Source: %s | %s",
+                persona_source,
+                ", ".join(f"{key}: {value:.2f}" for key, value in zip(FEATURES_ORDER, persona))
+            )
         candidates=None
         # 특정 음식이 있는 경우 검색 먼저
         if specific_food:
-            print(f"search for food {specific_food}...")
-            candidates = self.get_candidate_places(specific_food)
+            logger.debug("search for food %s...", specific_food)
+            with stage_timer("suggest", "google"):
+                candidates = self.get_candidate_places(specific_food)
 
         # algorithm.py의 recommend_topk() 호출
         results = []
@@ -221,56 +220,120 @@ class SuggestService:
                 include_user_places=True
             )
         except Exception as e:
-            print(f"[ERROR] algorithm.recommend_topk failed: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("algorithm.recommend_topk failed: %s", e)
 
         # results는 [(name, score, source), ...] 형태
-        # DB에서 상세 정보를 가져와서 병합
-        places = (
-            self.supabase
-            .table("places")
-            .select("*")
-            .execute()
-        )
-        places = places.data or []
-
-        # 개인 장소도 조회 (user_id가 있을 때만)
-        user_places_data = []
-        if user_id:
-            user_places_response = (
-                self.supabase
-                .table("user_places")
-                .select("*")
-                .eq("user_id", user_id)
-                .execute()
-            )
-            user_places_data = user_places_response.data or []
+        # 공식 장소 상세 정보는 카탈로그 스냅샷에서 이름으로 바로 조회 (places 전체 재조회 X)
+        catalog = algorithm.get_place_catalog()
+
+        # 개인 장소 상세 정보는 recommend_topk가 쓴 개인 장소 블록에서 조회 (user_places 재조회 X)
+        overlay = algorithm.get_user_overlay(user_id, catalog) if user_id else None
 
         formatted_results = []
 
         for name, score, source in results:
-            # source에 따라 다른 테이블에서 조회
+            # source에 따라 다른 블록에서 조회
             if source == "user_place":
-                detail = next((p for p in user_places_data if p["name"] == name), None)
+                index = overlay.index_by_name.get(name) if overlay else None
+                detail = overlay.rows[index] if index is not None else None
             else:
-                detail = next((p for p in places if p["name"] == name), None)
+                index = catalog.index_by_name.get(name)
+                detail = catalog.rows[index] if index is not None else None
 
             if not detail:
                 continue
 
-            place_info = {
-                "name": detail["name"],
-                "score": round(float(score), 2),
-                "category": detail.get("category"),
-                "address": detail.get("address"),
-                "latitude": detail.get("latitude"),
-                "longitude": detail.get("longitude"),
-                "rating": detail.get("rating"),
-                "price_range": detail.get("price_range"),
-                "opening_hours": detail.get("opening_hours"),
-                "source": source,  # "official" or "user_place"
-            }
-            formatted_results.append(place_info)
+            formatted_results.append(self._format_place(detail, score, source))
 
         return formatted_results
+
+    @staticmethod
+    def _format_place(detail: dict, score: float, source: str) -> Dict:
+        """추천 결과 한 건 (장소 상세 + 점수)"""
+        return {
+            "name": detail["name"],
+            "score": round(float(score), 2),
+            "category": detail.get("category"),
+            "address": detail.get("address"),
+            "latitude": detail.get("latitude"),
+            "longitude": detail.get("longitude"),
+            "rating": detail.get("rating"),
+            "price_range": detail.get("price_range"),
+            "opening_hours": detail.get("opening_hours"),
+            "source": source,  # "official" or "user_place"
+        }
+
+    @traced("suggest.get_recommendations_batch")
+    def get_recommendations_batch(
+        self,
+        items: List[Dict],
+        date: str = None,
+        k: int = 5,
+        alpha: float = 0.8,
+        beta: float = 0.7,
+        gamma: float = 0.2,
+        delta: float = 0.4
+    ) -> List[List[Dict]]:
+        """
+        여러 페르소나 / 커플 일괄 추천 (내부 배치 작업용)
+        get_recommendations를 반복 호출하는 대신 algorithm.recommend_topk_batch() 한 번으로 계산
+
+        Args:
+            items: [{"persona" 또는 "couple_id", "user_lat", "user_lng", "category", "last_recommend"}, ...]
+                   couple_id는 한 번의 쿼리로 페르소나 조회, 둘 다 없거나 조회 실패 시 기본 페르소나
+            date: 영업일 필터 (YYYY-MM-DD)
+            k: 항목별 추천 개수
+            alpha~delta: 스코어 가중치
+
+        Returns:
+            items 순서대로 [{"name": str, "score": float, ...}, ...] 리스트
+        """
+        couple_ids = list({item["couple_id"] for item in items if item.get("persona") is None and item.get("couple_id")})
+        couple_personas = {}
+        if couple_ids:
+            with stage_timer("suggest", "db_fetch"):
+                response = (
+                    self.supabase.table("couples")
+                    .select("couple_id, features")
+                    .in_("couple_id", couple_ids)
+                    .execute()
+                )
+            for row in response.data or []:
+                features = row.get("features")
+                if features and isinstance(features, list) and len(features) == 20:
+                    couple_personas[row["couple_id"]] = features
+
+        personas = []
+        for item in items:
+            persona = item.get("persona")
+            if persona is None:
+                persona = couple_personas.get(item.get("couple_id"), self.default_persona)
+            personas.append(persona)
+
+        # 결과 이름 → row 조회도 같은 스냅샷에서 (사이에 카탈로그가 다시 로드되어도 이름이 빠지지 않음)
+        catalog = algorithm.get_place_catalog()
+        results = algorithm.recommend_topk_batch(
+            personas,
+            locations=[
+                (item["user_lat"], item["user_lng"])
+                if item.get("user_lat") is not None and item.get("user_lng") is not None else None
+                for item in items
+            ],
+            categories=[item.get("category") for item in items],
+            exclude=[item.get("last_recommend") for item in items],
+            date=date,
+            k=k,
+            alpha=alpha,
+            beta=beta,
+            gamma=gamma,
+            delta=delta,
+            catalog=catalog
+        )
+
+        return [
+            [
+                self._format_place(catalog.rows[catalog.index_by_name[name]], score, source)
+                for name, score, source in result
+            ]
+            for result in results
+        ]
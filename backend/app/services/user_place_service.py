@@ -1,168 +1,16 @@
 """
 개인 장소 (User Places) 서비스
 """
-import hashlib
-import copy
+import logging
 from typing import Optional, List, Dict
 from app.core.supabase_client import get_supabase
+from app.core.place_catalog import bump_user_places_version
+from app.core.geo import place_hash as compute_place_hash
+from app.core.feature_templates import template_id_for_category, template_reference
+from app.services.place_lookup_service import PlaceLookupService
+from app.services.pipeline_worker import get_pipeline_worker
 
-
-# 카테고리별 기본 features (20차원 벡터 구조)
-# extracted_features.json 형식과 동일
-DEFAULT_FEATURES = {
-    "food": {
-        "placeFeatures": {
-            "mainCategory": {
-                "food": 1.0, "cafe": 0.2, "culture_art": 0.0,
-                "activity_sports": 0.0, "nature_healing": 0.0,
-                "craft_experience": 0.0, "shopping": 0.0
-            },
-            "atmosphere": {
-                "quiet": 0.4, "romantic": 0.4, "trendy": 0.5,
-                "private": 0.3, "artistic": 0.2, "energetic": 0.5
-            },
-            "experienceType": {
-                "passive_enjoyment": 0.7, "active_participation": 0.2,
-                "social_bonding": 0.7, "relaxation_focused": 0.5
-            },
-            "spaceCharacteristics": {
-                "indoor_ratio": 0.9, "crowdedness_expected": 0.5,
-                "photo_worthiness": 0.4, "scenic_view": 0.2
-            },
-            "contextual": {
-                "average_rating": 0,
-                "max_travel_distance": 0
-            }
-        }
-    },
-    "cafe": {
-        "placeFeatures": {
-            "mainCategory": {
-                "food": 0.3, "cafe": 1.0, "culture_art": 0.1,
-                "activity_sports": 0.0, "nature_healing": 0.1,
-                "craft_experience": 0.0, "shopping": 0.0
-            },
-            "atmosphere": {
-                "quiet": 0.6, "romantic": 0.5, "trendy": 0.6,
-                "private": 0.4, "artistic": 0.4, "energetic": 0.3
-            },
-            "experienceType": {
-                "passive_enjoyment": 0.8, "active_participation": 0.1,
-                "social_bonding": 0.6, "relaxation_focused": 0.7
-            },
-            "spaceCharacteristics": {
-                "indoor_ratio": 0.85, "crowdedness_expected": 0.4,
-                "photo_worthiness": 0.6, "scenic_view": 0.3
-            },
-            "contextual": {
-                "average_rating": 0,
-                "max_travel_distance": 0
-            }
-        }
-    },
-    "activity": {
-        "placeFeatures": {
-            "mainCategory": {
-                "food": 0.0, "cafe": 0.0, "culture_art": 0.2,
-                "activity_sports": 1.0, "nature_healing": 0.3,
-                "craft_experience": 0.2, "shopping": 0.0
-            },
-            "atmosphere": {
-                "quiet": 0.2, "romantic": 0.3, "trendy": 0.5,
-                "private": 0.2, "artistic": 0.2, "energetic": 0.9
-            },
-            "experienceType": {
-                "passive_enjoyment": 0.2, "active_participation": 0.9,
-                "social_bonding": 0.7, "relaxation_focused": 0.2
-            },
-            "spaceCharacteristics": {
-                "indoor_ratio": 0.5, "crowdedness_expected": 0.6,
-                "photo_worthiness": 0.5, "scenic_view": 0.4
-            },
-            "contextual": {
-                "average_rating": 0,
-                "max_travel_distance": 0
-            }
-        }
-    },
-    "culture": {
-        "placeFeatures": {
-            "mainCategory": {
-                "food": 0.0, "cafe": 0.1, "culture_art": 1.0,
-                "activity_sports": 0.1, "nature_healing": 0.2,
-                "craft_experience": 0.3, "shopping": 0.1
-            },
-            "atmosphere": {
-                "quiet": 0.7, "romantic": 0.5, "trendy": 0.5,
-                "private": 0.4, "artistic": 0.9, "energetic": 0.3
-            },
-            "experienceType": {
-                "passive_enjoyment": 0.8, "active_participation": 0.3,
-                "social_bonding": 0.5, "relaxation_focused": 0.6
-            },
-            "spaceCharacteristics": {
-                "indoor_ratio": 0.8, "crowdedness_expected": 0.5,
-                "photo_worthiness": 0.7, "scenic_view": 0.4
-            },
-            "contextual": {
-                "average_rating": 0,
-                "max_travel_distance": 0
-            }
-        }
-    },
-    "nature": {
-        "placeFeatures": {
-            "mainCategory": {
-                "food": 0.0, "cafe": 0.0, "culture_art": 0.1,
-                "activity_sports": 0.3, "nature_healing": 1.0,
-                "craft_experience": 0.0, "shopping": 0.0
-            },
-            "atmosphere": {
-                "quiet": 0.8, "romantic": 0.7, "trendy": 0.3,
-                "private": 0.5, "artistic": 0.4, "energetic": 0.3
-            },
-            "experienceType": {
-                "passive_enjoyment": 0.6, "active_participation": 0.4,
-                "social_bonding": 0.5, "relaxation_focused": 0.9
-            },
-            "spaceCharacteristics": {
-                "indoor_ratio": 0.1, "crowdedness_expected": 0.3,
-                "photo_worthiness": 0.8, "scenic_view": 0.9
-            },
-            "contextual": {
-                "average_rating": 0,
-                "max_travel_distance": 0
-            }
-        }
-    }
-}
-
-# 중립 features (카테고리 매핑 실패 시)
-NEUTRAL_FEATURES = {
-    "placeFeatures": {
-        "mainCategory": {
-            "food": 0.5, "cafe": 0.5, "culture_art": 0.5,
-            "activity_sports": 0.5, "nature_healing": 0.5,
-            "craft_experience": 0.5, "shopping": 0.5
-        },
-        "atmosphere": {
-            "quiet": 0.5, "romantic": 0.5, "trendy": 0.5,
-            "private": 0.5, "artistic": 0.5, "energetic": 0.5
-        },
-        "experienceType": {
-            "passive_enjoyment": 0.5, "active_participation": 0.5,
-            "social_bonding": 0.5, "relaxation_focused": 0.5
-        },
-        "spaceCharacteristics": {
-            "indoor_ratio": 0.5, "crowdedness_expected": 0.5,
-            "photo_worthiness": 0.5, "scenic_view": 0.5
-        },
-        "contextual": {
-            "average_rating": 0,
-            "max_travel_distance": 0
-        }
-    }
-}
+logger = logging.getLogger(__name__)
 
 
 class UserPlaceService:
@@ -172,53 +20,17 @@ class UserPlaceService:
     @staticmethod
     def generate_place_hash(name: str, lat: float, lng: float) -> str:
         """장소 고유 해시 생성 (중복 검사용)"""
-        # 소수점 5자리까지 정규화 (약 1m 정밀도)
-        normalized = f"{name}:{lat:.5f}:{lng:.5f}"
-        return hashlib.sha256(normalized.encode()).hexdigest()
+        return compute_place_hash(name, lat, lng)
 
     @staticmethod
     def get_default_features(category: Optional[str]) -> dict:
         """
-        카테고리 기반 기본 features 반환
+        카테고리 기반 기본 features (템플릿 참조)
 
-        지원 형식:
-        1. 네이버 Local Search API: "대분류>세부분류" (예: "음식점>육류,고기요리")
-        2. Flutter slotType: "food", "cafe", "activity", "culture", "nature"
+        전체 JSON 대신 {"template_id": ...}만 저장
+        → 추천 시 algorithm.TEMPLATE_VECTORS의 미리 계산된 벡터 사용 (app.core.feature_templates 참고)
         """
-        if not category:
-            return copy.deepcopy(NEUTRAL_FEATURES)
-
-        # 대분류 추출 (첫 번째 ">" 앞부분)
-        main_category = category.split(">")[0].lower()
-
-        # 1단계: 영문 카테고리 (Flutter slotType) 직접 매핑
-        if main_category == 'food':
-            return copy.deepcopy(DEFAULT_FEATURES["food"])
-        if main_category == 'cafe':
-            return copy.deepcopy(DEFAULT_FEATURES["cafe"])
-        if main_category == 'activity':
-            return copy.deepcopy(DEFAULT_FEATURES["activity"])
-        if main_category == 'culture':
-            return copy.deepcopy(DEFAULT_FEATURES["culture"])
-        if main_category == 'nature':
-            return copy.deepcopy(DEFAULT_FEATURES["nature"])
-
-        # 2단계: 한글 카테고리 (네이버 API 대분류) 매핑
-        if '음식점' in main_category:
-            return copy.deepcopy(DEFAULT_FEATURES["food"])
-        if '카페' in main_category or '디저트' in main_category:
-            return copy.deepcopy(DEFAULT_FEATURES["cafe"])
-        if '스포츠' in main_category or '레저' in main_category:
-            return copy.deepcopy(DEFAULT_FEATURES["activity"])
-        if '관람' in main_category or '체험' in main_category:
-            return copy.deepcopy(DEFAULT_FEATURES["activity"])
-        if '문화' in main_category or '예술' in main_category:
-            return copy.deepcopy(DEFAULT_FEATURES["culture"])
-        if '여행' in main_category or '명소' in main_category:
-            return copy.deepcopy(DEFAULT_FEATURES["nature"])
-
-        # 3단계: 매핑 실패 시 NEUTRAL 반환
-        return copy.deepcopy(NEUTRAL_FEATURES)
+        return template_reference(template_id_for_category(category))
 
     def add_user_place(self, user_id: str, data: dict) -> dict:
         """
@@ -230,38 +42,40 @@ class UserPlaceService:
         place_hash = self.generate_place_hash(
             data["name"], data["latitude"], data["longitude"]
         )
+        lookup = PlaceLookupService()
 
-        # 1. 정식 DB(places)에 있는지 확인 (이름 + 좌표 근사 비교)
-        # 0.0001도 ≈ 약 11m 오차 범위
-        official = self.supabase.table("places") \
-            .select("place_id") \
-            .eq("name", data["name"]) \
-            .gte("latitude", data["latitude"] - 0.0001) \
-            .lte("latitude", data["latitude"] + 0.0001) \
-            .gte("longitude", data["longitude"] - 0.0001) \
-            .lte("longitude", data["longitude"] + 0.0001) \
-            .execute()
-
-        if official.data:
+        # 1. 정식 DB(places)에 있는지 확인 (이름 + 좌표 근사 비교, places 스냅샷 격자 인덱스)
+        if lookup.find_official(data["name"], data["latitude"], data["longitude"]):
             # 정식 DB에 있으면 저장하지 않고 None 반환
             return None
 
         # 2. 이미 이 유저가 추가했는지 확인
-        existing = self.supabase.table("user_places") \
-            .select("*") \
-            .eq("user_id", user_id) \
-            .eq("place_hash", place_hash) \
+        existing = lookup.find_saved(user_id, data["name"], data["latitude"], data["longitude"])
+        if existing:
+            # 이미 있으면 기존 데이터 그대로 반환 (중복 추가 무시)
+            return existing
+
+        # 3~4. 기본 features 할당 + user_places에 추가
+        # insert 응답에 삽입된 row가 포함됨 (다시 조회하지 않음)
+        inserted = self.supabase.table("user_places") \
+            .insert(self._build_user_place(user_id, place_hash, data)) \
             .execute()
+        bump_user_places_version(user_id)
 
-        if existing.data:
-            # 이미 있으면 기존 데이터 그대로 반환 (중복 추가 무시)
-            return existing.data[0]
+        # 5. place_adoption_candidates 업데이트 (실패해도 진행)
+        try:
+            self._update_adoption_candidate(place_hash, user_id, data)
+        except Exception as e:
+            logger.warning("adoption_candidate 업데이트 실패: %s", e)
+        else:
+            # 백그라운드 워커가 켜져 있으면 바로 features 계산 / 승격 체크
+            get_pipeline_worker().notify(place_hash)
 
-        # 3. 기본 features 할당
-        default_features = self.get_default_features(data.get("category"))
+        return inserted.data[0] if inserted.data else None
 
-        # 4. user_places에 추가
-        new_place = {
+    def _build_user_place(self, user_id: str, place_hash: str, data: dict) -> dict:
+        """user_places insert용 row (카테고리 기본 features 포함)"""
+        return {
             "place_hash": place_hash,
             "name": data["name"],
             "address": data.get("address"),
@@ -270,30 +84,95 @@ class UserPlaceService:
             "longitude": data["longitude"],
             "naver_data": data.get("naver_data"),
             "user_id": user_id,
-            "features": default_features,
+            "features": self.get_default_features(data.get("category")),
             "features_status": "default",
             "added_from": data["added_from"]
         }
 
-        self.supabase.table("user_places") \
-            .insert(new_place) \
+    def add_user_places_bulk(self, user_id: str, places: List[dict]) -> Dict[str, list]:
+        """
+        개인 장소 일괄 추가 (네이버 검색 기록 / 공유 리스트 가져오기)
+
+        add_user_place를 장소마다 호출하는 대신
+        - 배치 내 중복 제거 (place_hash 기준, 먼저 나온 것 우선)
+        - 정식 장소 확인은 places 스냅샷에서 (DB 조회 없음)
+        - 이미 저장한 장소는 in_ 쿼리 한 번으로 확인
+        - 새 장소는 insert 한 번, 승격 후보도 RPC 한 번으로 갱신
+
+        Args:
+            user_id: 사용자 ID
+            places: UserPlaceCreate 형태의 dict 리스트
+
+        Returns:
+            {
+                "added": 새로 추가된 row 리스트,
+                "existing": 이미 저장되어 있던 row 리스트,
+                "official": 정식 DB에 있어서 저장하지 않은 장소 이름 리스트
+            }
+        """
+        result = {"added": [], "existing": [], "official": []}
+        lookup = PlaceLookupService()
+
+        # 1. 해시 + 배치 내 중복 제거 + 정식 장소 제외 (정식 장소도 한 번만 기록)
+        candidates: Dict[str, dict] = {}
+        seen = set()
+        for data in places:
+            place_hash = self.generate_place_hash(data["name"], data["latitude"], data["longitude"])
+            if place_hash in seen:
+                continue
+            seen.add(place_hash)
+            if lookup.find_official(data["name"], data["latitude"], data["longitude"]):
+                result["official"].append(data["name"])
+                continue
+            candidates[place_hash] = data
+
+        if not candidates:
+            return result
+
+        # 2. 이미 저장한 장소 (set 쿼리 한 번)
+        existing = self.supabase.table("user_places") \
+            .select("*") \
+            .eq("user_id", user_id) \
+            .in_("place_hash", list(candidates)) \
             .execute()
+        for row in existing.data or []:
+            if candidates.pop(row["place_hash"], None) is not None:
+                result["existing"].append(row)
 
-        # 삽입된 데이터 다시 조회
+        if not candidates:
+            return result
+
+        # 3. 새 장소 insert 한 번
         inserted = self.supabase.table("user_places") \
-            .select("*") \
-            .eq("user_id", user_id) \
-            .eq("place_hash", place_hash) \
-            .single() \
+            .insert([self._build_user_place(user_id, h, data) for h, data in candidates.items()]) \
             .execute()
+        result["added"] = inserted.data or []
+        bump_user_places_version(user_id)
 
-        # 5. place_adoption_candidates 업데이트 (실패해도 진행)
+        # 4. 승격 후보 일괄 갱신 (실패해도 진행)
         try:
-            self._update_adoption_candidate(place_hash, user_id, data)
+            self.supabase.rpc("add_adoption_candidates_bulk", {
+                "p_user_id": user_id,
+                "p_places": [
+                    {
+                        "place_hash": h,
+                        "name": data["name"],
+                        "address": data.get("address"),
+                        "category": data.get("category"),
+                        "latitude": data["latitude"],
+                        "longitude": data["longitude"],
+                    }
+                    for h, data in candidates.items()
+                ]
+            }).execute()
         except Exception as e:
-            print(f"[WARNING] adoption_candidate 업데이트 실패: {e}")
+            logger.warning("adoption_candidate 일괄 업데이트 실패: %s", e)
+        else:
+            worker = get_pipeline_worker()
+            for h in candidates:
+                worker.notify(h)
 
-        return inserted.data
+        return result
 
     def _update_adoption_candidate(self, place_hash: str, user_id: str, data: dict):
         """승격 후보 테이블 업데이트 (atomic operation via RPC)"""
@@ -352,6 +231,7 @@ class UserPlaceService:
             .eq("user_id", user_id) \
             .eq("user_place_id", user_place_id) \
             .execute()
+        bump_user_places_version(user_id)
 
         # 3. adoption_candidate에서 user_id 제거 (실패해도 진행)
         try:
@@ -360,6 +240,6 @@ class UserPlaceService:
                 "p_user_id": user_id
             }).execute()
         except Exception as e:
-            print(f"[WARNING] adoption_candidate에서 유저 제거 실패: {e}")
+            logger.warning("adoption_candidate에서 유저 제거 실패: %s", e)
 
         return True
@@ -1,6 +1,7 @@
 from typing import List, Optional
 from app.core.supabase_client import get_supabase
 from app.schemas.wishlist import WishlistCreate, WishlistResponse
+from app.services.place_lookup_service import PlaceLookupService, wishlist_geohash
 
 
 class WishlistService:
@@ -29,6 +30,7 @@ class WishlistService:
             "category": data.category,
             "latitude": data.latitude,
             "longitude": data.longitude,
+            "geohash": wishlist_geohash(data.latitude, data.longitude),
             "memo": data.memo,
             "link": data.link,
         }
@@ -49,16 +51,4 @@ class WishlistService:
     @staticmethod
     def check_wishlist(couple_id: str, latitude: float, longitude: float) -> Optional[dict]:
         """특정 좌표의 찜 여부 확인 (오차 범위 0.0001도 ≈ 11m)"""
-        supabase = get_supabase()
-        tolerance = 0.0001
-
-        response = supabase.table("wishlists") \
-            .select("*") \
-            .eq("couple_id", couple_id) \
-            .gte("latitude", latitude - tolerance) \
-            .lte("latitude", latitude + tolerance) \
-            .gte("longitude", longitude - tolerance) \
-            .lte("longitude", longitude + tolerance) \
-            .execute()
-
-        return response.data[0] if response.data else None
+        return PlaceLookupService().find_wishlist(couple_id, latitude, longitude)
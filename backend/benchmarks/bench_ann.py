@@ -0,0 +1,127 @@
+"""
+ANN(IVF) 후보 검색 벤치마크
+
+합성 feature 벡터(클러스터 구조) + 송도 주변 좌표로
+- IVF 코사인 top-M recall (exact top-M 대비)
+- 최종 점수 top-k recall (IVF ∪ 주변 격자 후보 vs 전체 exact 점수)
+- 쿼리당 latency (exact vs IVF)
+를 측정
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_ann --sizes 20000 100000 --queries 50
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from app.core.place_index import IVFIndex, GridIndex
+
+# 송도 주변 (위도, 경도) 범위
+SONGDO_LAT = (37.36, 37.42)
+SONGDO_LNG = (126.62, 126.70)
+# 점수 가중치 (algorithm.recommend_topk 기본값)
+ALPHA, BETA, GAMMA = 0.8, 0.7, 0.2
+
+
+def make_catalog(n: int, rng: np.random.Generator, n_clusters: int = 64):
+    """클러스터 구조가 있는 20차원 feature + 좌표 + 평점"""
+    centers = rng.random((n_clusters, 20))
+    labels = rng.integers(0, n_clusters, n)
+    features = np.clip(centers[labels] + rng.normal(0, 0.15, (n, 20)), 0, 1)
+    # 전국 단위 카탈로그 가정: 10%만 송도, 나머지는 전국에 분산
+    coords = np.column_stack([
+        rng.uniform(33.0, 38.5, n),
+        rng.uniform(125.0, 129.5, n),
+    ])
+    local = rng.random(n) < 0.1
+    coords[local, 0] = rng.uniform(*SONGDO_LAT, local.sum())
+    coords[local, 1] = rng.uniform(*SONGDO_LNG, local.sum())
+    ratings = rng.choice([0, 3.5, 4.0, 4.5], n)
+    return features, coords, ratings
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 6371 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def full_score(idx, features, coords, ratings, persona, position):
+    f = features[idx]
+    sim = (f @ persona) / (np.linalg.norm(f, axis=1) * np.linalg.norm(persona))
+    dist = haversine_km(position[0], position[1], coords[idx, 0], coords[idx, 1])
+    return ALPHA * sim - BETA * dist + GAMMA * ratings[idx]
+
+
+def top_by_score(idx, scores, k):
+    return set(idx[np.argsort(-scores, kind="stable")[:k]].tolist())
+
+
+def run(n: int, queries: int, top_m: int, nprobe: int, k: int, seed: int):
+    rng = np.random.default_rng(seed)
+    features, coords, ratings = make_catalog(n, rng)
+    personas = rng.random((queries, 20))
+    positions = np.column_stack([
+        rng.uniform(*SONGDO_LAT, queries),
+        rng.uniform(*SONGDO_LNG, queries),
+    ])
+
+    t0 = time.perf_counter()
+    ivf = IVFIndex(features)
+    grid = GridIndex(coords)
+    build_s = time.perf_counter() - t0
+
+    unit = features / np.linalg.norm(features, axis=1, keepdims=True)
+    all_idx = np.arange(n)
+    cos_recalls, score_recalls = [], []
+    exact_ms, ann_ms, scored = [], [], []
+
+    for persona, position in zip(personas, positions):
+        # exact: 전체 코사인 + 전체 점수
+        t = time.perf_counter()
+        sims = unit @ (persona / np.linalg.norm(persona))
+        exact_cos = set(np.argsort(-sims)[:top_m].tolist())
+        exact_top = top_by_score(all_idx, full_score(all_idx, features, coords, ratings, persona, position), k)
+        exact_ms.append((time.perf_counter() - t) * 1000)
+
+        # ANN: IVF top-M ∪ 주변 격자 → 후보만 점수 계산
+        t = time.perf_counter()
+        similar = ivf.search(persona, top_m, nprobe)
+        candidates = np.union1d(similar, grid.near(position[0], position[1]))
+        ann_top = top_by_score(candidates, full_score(candidates, features, coords, ratings, persona, position), k)
+        ann_ms.append((time.perf_counter() - t) * 1000)
+
+        cos_recalls.append(len(exact_cos & set(similar.tolist())) / top_m)
+        score_recalls.append(len(exact_top & ann_top) / k)
+        scored.append(len(candidates))
+
+    print(f"N={n:>9,}  build={build_s:6.2f}s  nlist={ivf.nlist}  nprobe={nprobe}  M={top_m}")
+    print(f"   cosine recall@{top_m}: {np.mean(cos_recalls):.3f}")
+    print(f"   score  recall@{k}:   {np.mean(score_recalls):.3f}")
+    print(f"   scored candidates: {np.mean(scored):,.0f} ({np.mean(scored) / n:.1%} of catalog)")
+    print(f"   latency exact p50={np.percentile(exact_ms, 50):7.2f}ms  p95={np.percentile(exact_ms, 95):7.2f}ms")
+    print(f"   latency ANN   p50={np.percentile(ann_ms, 50):7.2f}ms  p95={np.percentile(ann_ms, 95):7.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IVF 후보 검색 recall / latency 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20000, 100000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-m", type=int, default=2000)
+    parser.add_argument("--nprobe", type=int, default=32)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        run(n, args.queries, args.top_m, args.nprobe, args.k, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+추천 / 코스 생성 / 피드백 재계산 오프라인 벤치마크
+
+live Supabase / OpenAI 없이 합성 카탈로그 + 로컬 데이터 백엔드(app.core.local_db, memory)로
+- algorithm.recommend_topk (기준 구현 benchmarks/reference.py와 결과 비교)
+- algorithm.recommend_topk_batch (페르소나 전체 한 번에 vs recommend_topk 반복 호출)
+- CourseService.generate_date_course (캐시 미사용 / 캐시 hit)
+- FeedbackService.recalculate_couple_persona
+의 p50 / p95 latency, throughput, peak memory를 측정
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_recommend --sizes 1000 10000 --queries 20
+    python -m benchmarks.bench_recommend --sizes 10000 --save before.json
+    python -m benchmarks.bench_recommend --sizes 10000 --compare before.json   # 변경 전후 결과 동일성 확인
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+# app.config Settings 필수 값 (벤치마크는 외부 서비스를 호출하지 않음)
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_KEY", "benchmark")
+os.environ["DATA_BACKEND"] = "memory"
+
+import algorithm
+from app.services import course_service as course_module
+from app.services.course_service import CourseService
+from app.services.feedback_service import FeedbackService
+from app.core.local_db import MemoryClient, set_local_client
+from app.core.session_store import get_slot_pool_store
+from benchmarks import reference
+from benchmarks.synthetic import SONGDO_LAT, SONGDO_LNG, make_couples, make_personas, make_places
+
+SLOT_CATEGORIES = ["food", "cafe", "activity_sports", "nature_healing", "culture_art"]
+BENCH_DATE = "2025-11-20"
+
+
+def measure(fn: Callable[[int], object], iterations: int) -> Dict[str, float]:
+    """fn(i)를 iterations번 실행 → latency / throughput / peak memory"""
+    latencies = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn(0)  # warm-up (카탈로그 스냅샷 로드 등)
+        start = time.perf_counter()
+        for i in range(iterations):
+            t = time.perf_counter()
+            fn(i)
+            latencies.append((time.perf_counter() - t) * 1000)
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        fn(0)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "throughput_per_s": iterations / elapsed if elapsed > 0 else float("inf"),
+        "peak_mb": peak / 1024 / 1024,
+    }
+
+
+def report(name: str, stats: Dict[str, float]):
+    print(
+        f"   {name:<28} p50={stats['p50_ms']:9.2f}ms  p95={stats['p95_ms']:9.2f}ms  "
+        f"{stats['throughput_per_s']:9.1f}/s  peak={stats['peak_mb']:8.1f}MB"
+    )
+
+
+def fingerprint(value) -> str:
+    """결과 비교용 해시 (float는 6자리 반올림)"""
+    def normalize(v):
+        if isinstance(v, float):
+            return round(v, 6)
+        if isinstance(v, (list, tuple)):
+            return [normalize(x) for x in v]
+        if isinstance(v, dict):
+            return {k: normalize(x) for k, x in sorted(v.items())}
+        return v
+    raw = json.dumps(normalize(value), ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def run_size(n: int, queries: int, seed: int) -> Dict[str, str]:
+    """카탈로그 크기 n 하나에 대해 세 경로 측정, 결과 fingerprint 반환"""
+    places = make_places(n, seed)
+    tables = make_couples(places, n_couples=max(queries, 1), diaries_per_couple=20, seed=seed + 2)
+    tables["places"] = places
+    tables["user_places"] = []
+    set_local_client(MemoryClient(tables))
+
+    # 이전 크기의 스냅샷 / 코스 캐시 초기화
+    algorithm._catalog = None
+    course_module._course_cache.clear()
+    get_slot_pool_store().clear()
+
+    rng = np.random.default_rng(seed + 3)
+    personas = make_personas(queries, seed + 1).tolist()
+    positions = np.column_stack([
+        rng.uniform(*SONGDO_LAT, queries),
+        rng.uniform(*SONGDO_LNG, queries),
+    ]).tolist()
+
+    def query(i):
+        return dict(
+            persona=personas[i % queries],
+            category=SLOT_CATEGORIES[i % len(SLOT_CATEGORIES)],
+            date=BENCH_DATE,
+            k=10,
+            user_lat=positions[i % queries][0],
+            user_lng=positions[i % queries][1],
+        )
+
+    print(f"\nN={n:,} places, {queries} queries")
+
+    # 1. recommend_topk: 기준 구현 vs 현재 구현 (MMR 끔 → 결과 동일해야 함)
+    report("reference.recommend_topk", measure(lambda i: reference.recommend_topk(**query(i)), queries))
+    report("recommend_topk (lambda=1)", measure(
+        lambda i: algorithm.recommend_topk(**query(i), diversity_lambda=1.0), queries))
+    report("recommend_topk (MMR)", measure(lambda i: algorithm.recommend_topk(**query(i)), queries))
+
+    mismatches, max_diff = 0, 0.0
+    current_results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(queries):
+            expected = reference.recommend_topk(**query(i))
+            actual = algorithm.recommend_topk(**query(i), diversity_lambda=1.0)
+            current_results.append(actual)
+            if [r[0] for r in expected] != [r[0] for r in actual]:
+                mismatches += 1
+            for e, a in zip(expected, actual):
+                max_diff = max(max_diff, abs(float(e[1]) - float(a[1])))
+    status = "OK" if mismatches == 0 else "MISMATCH"
+    print(f"   equivalence vs reference: {status} ({mismatches}/{queries} differ, max score diff {max_diff:.2e})")
+
+    # 1-1. 일괄 추천: recommend_topk를 queries번 반복 vs recommend_topk_batch 한 번
+    batch_args = dict(
+        personas=personas,
+        locations=[tuple(pos) for pos in positions],
+        categories=[query(i)["category"] for i in range(queries)],
+        date=BENCH_DATE,
+        k=10,
+    )
+    report(f"recommend_topk x{queries}", measure(
+        lambda _: [algorithm.recommend_topk(**query(i)) for i in range(queries)], 3))
+    report(f"recommend_topk_batch ({queries})", measure(
+        lambda _: algorithm.recommend_topk_batch(**batch_args), 3))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        batch_results = algorithm.recommend_topk_batch(**batch_args)
+        single_results = [algorithm.recommend_topk(**query(i)) for i in range(queries)]
+    mismatches = sum(
+        [r[0] for r in b] != [r[0] for r in s] for b, s in zip(batch_results, single_results)
+    )
+    status = "OK" if mismatches == 0 else "MISMATCH"
+    print(f"   batch vs recommend_topk: {status} ({mismatches}/{queries} differ)")
+
+    # 2. 코스 생성 (캐시 미사용 / hit)
+    users = [u["user_id"] for u in tables["users"]]
+    service = CourseService()
+
+    def generate(i, cold=True):
+        if cold:
+            course_module._course_cache.clear()
+        return service.generate_date_course(
+            user_id=users[i % len(users)],
+            date=BENCH_DATE,
+            template="full_day",
+            user_lat=positions[i % queries][0],
+            user_lng=positions[i % queries][1],
+        )
+
+    report("generate_date_course (cold)", measure(generate, queries))
+    report("generate_date_course (cached)", measure(lambda i: generate(0, cold=False), queries))
+    with contextlib.redirect_stdout(io.StringIO()):
+        course_module._course_cache.clear()
+        courses = [generate(i).model_dump(mode="json") for i in range(min(queries, 5))]
+
+    # 3. 피드백 재계산
+    couples = [c["couple_id"] for c in tables["couples"]]
+    feedback = FeedbackService()
+    report("recalculate_couple_persona", measure(
+        lambda i: feedback.recalculate_couple_persona(couples[i % len(couples)]), queries))
+    with contextlib.redirect_stdout(io.StringIO()):
+        personas_after = [feedback.recalculate_couple_persona(c)["new_persona"] for c in couples[:5]]
+
+    return {
+        "recommend": fingerprint([[list(r) for r in res] for res in current_results]),
+        "course": fingerprint(courses),
+        "feedback": fingerprint(personas_after),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추천 / 코스 / 피드백 오프라인 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="결과 fingerprint 저장 경로 (JSON)")
+    parser.add_argument("--compare", help="이전에 저장한 fingerprint와 비교")
+    args = parser.parse_args()
+
+    fingerprints = {}
+    for n in args.sizes:
+        fingerprints[str(n)] = run_size(n, args.queries, args.seed)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(fingerprints, indent=2))
+        print(f"\nfingerprints saved to {args.save}")
+
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text())
+        print(f"\ncompare with {args.compare}:")
+        for size, paths in fingerprints.items():
+            for path, value in paths.items():
+                before = previous.get(size, {}).get(path)
+                status = "-" if before is None else ("same" if before == value else "DIFFERENT")
+                print(f"   N={size:<8} {path:<10} {status}")
+
+
+if __name__ == "__main__":
+    main()
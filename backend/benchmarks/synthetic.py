@@ -0,0 +1,145 @@
+"""
+벤치마크용 합성 데이터 생성
+
+- places: placeFeatures 스키마 (algorithm.extract_features가 읽는 구조) + 송도 주변 좌표 + 영업시간
+- personas: 20차원 페르소나 벡터
+- users / couples / diary: 코스 생성, 피드백 재계산 경로용
+
+같은 seed면 항상 같은 데이터 (결과 비교용)
+"""
+from typing import Dict, List
+
+import numpy as np
+
+# 송도 주변 (위도, 경도) 범위
+SONGDO_LAT = (37.36, 37.42)
+SONGDO_LNG = (126.62, 126.70)
+
+MAIN_CATEGORIES = ["food", "cafe", "culture_art", "activity_sports", "nature_healing", "craft_experience", "shopping"]
+ATMOSPHERE = ["quiet", "romantic", "trendy", "private", "artistic", "energetic"]
+EXPERIENCE_TYPE = ["passive_enjoyment", "active_participation", "social_bonding", "relaxation_focused"]
+SPACE = ["indoor_ratio", "crowdedness_expected", "photo_worthiness", "scenic_view"]
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+
+# users.features 키 (SuggestService.get_user_persona / FeedbackService 순서)
+PERSONA_KEYS = [
+    "food_cafe", "culture_art", "activity_sports", "nature_healing", "craft_experience", "shopping",
+    "quiet", "romantic", "trendy", "private_vibe", "artistic", "energetic",
+    "passive_enjoyment", "active_participation", "social_bonding", "relaxation_focused",
+    "indoor_ratio", "crowdedness_expected", "photo_worthiness", "scenic_view",
+]
+
+
+def _round(values) -> List[float]:
+    return [round(float(v), 2) for v in values]
+
+
+def make_places(n: int, seed: int = 0) -> List[dict]:
+    """
+    places row n개 생성
+
+    카테고리는 1~2개가 0.5 이상 (multi-membership), 70%는 요일별 영업시간 보유
+    """
+    rng = np.random.default_rng(seed)
+    primary = rng.integers(0, len(MAIN_CATEGORIES), n)
+    secondary = rng.integers(0, len(MAIN_CATEGORIES), n)
+    has_secondary = rng.random(n) < 0.25
+    lats = rng.uniform(*SONGDO_LAT, n)
+    lngs = rng.uniform(*SONGDO_LNG, n)
+    ratings = np.round(rng.uniform(3.0, 5.0, n), 1)
+    rated = rng.random(n) < 0.9
+    has_hours = rng.random(n) < 0.7
+    closed_day = rng.integers(0, 7, n)
+    atmosphere = rng.random((n, len(ATMOSPHERE)))
+    experience = rng.random((n, len(EXPERIENCE_TYPE)))
+    space = rng.random((n, len(SPACE)))
+
+    places = []
+    for i in range(n):
+        main = {c: 0.0 for c in MAIN_CATEGORIES}
+        main[MAIN_CATEGORIES[primary[i]]] = 1.0
+        if has_secondary[i]:
+            main[MAIN_CATEGORIES[secondary[i]]] = max(main[MAIN_CATEGORIES[secondary[i]]], 0.6)
+
+        opening_hours = None
+        if has_hours[i]:
+            opening_hours = {
+                day: {"open": "11:00", "close": "22:00"}
+                for d, day in enumerate(WEEKDAYS) if d != closed_day[i]
+            }
+
+        rating = float(ratings[i]) if rated[i] else None
+        places.append({
+            "id": i + 1,
+            "place_id": f"synthetic_{i}",
+            "name": f"장소{i:07d}",
+            "category": MAIN_CATEGORIES[primary[i]],
+            "address": f"인천 연수구 송도동 {i}",
+            "latitude": float(lats[i]),
+            "longitude": float(lngs[i]),
+            "rating": rating,
+            "price_range": "₩10000 ~ ₩20000",
+            "opening_hours": opening_hours,
+            "features": {
+                "placeFeatures": {
+                    "mainCategory": main,
+                    "atmosphere": dict(zip(ATMOSPHERE, _round(atmosphere[i]))),
+                    "experienceType": dict(zip(EXPERIENCE_TYPE, _round(experience[i]))),
+                    "spaceCharacteristics": dict(zip(SPACE, _round(space[i]))),
+                    "contextual": {"average_rating": rating},
+                }
+            },
+        })
+    return places
+
+
+def make_personas(n: int, seed: int = 1) -> np.ndarray:
+    """(n, 20) 페르소나 (mainCategory는 one-hot에 가깝게)"""
+    rng = np.random.default_rng(seed)
+    personas = rng.random((n, 20))
+    personas[:, :6] = 0
+    personas[np.arange(n), rng.integers(0, 6, n)] = 1
+    return np.round(personas, 2)
+
+
+def make_couples(places: List[dict], n_couples: int, diaries_per_couple: int, seed: int = 2) -> Dict[str, List[dict]]:
+    """
+    users / couples / diary 테이블 생성
+
+    Returns:
+        {"users": [...], "couples": [...], "diary": [...]}
+    """
+    rng = np.random.default_rng(seed)
+    personas = make_personas(n_couples * 2, seed)
+    users, couples, diary = [], [], []
+
+    for c in range(n_couples):
+        couple_id = f"couple_{c}"
+        ids = [f"user_{c}_a", f"user_{c}_b"]
+        for j, user_id in enumerate(ids):
+            users.append({
+                "user_id": user_id,
+                "gender": "male" if j == 0 else "female",
+                "couple_id": couple_id,
+                "survey_done": True,
+                "features": dict(zip(PERSONA_KEYS, personas[c * 2 + j].tolist())),
+            })
+        couples.append({
+            "couple_id": couple_id,
+            "user_id1": ids[0],
+            "user_id2": ids[1],
+            "features": None,  # recalculate_couple_persona가 채움
+            "schedules": [],
+        })
+        for d in range(diaries_per_couple):
+            picked = rng.choice(len(places), 3, replace=False)
+            diary.append({
+                "course_id": f"course_{c}_{d}",
+                "couple_id": couple_id,
+                "json": [
+                    {"place_name": places[p]["name"], "rating": float(rng.integers(1, 6))}
+                    for p in picked
+                ],
+            })
+
+    return {"users": users, "couples": couples, "diary": diary}
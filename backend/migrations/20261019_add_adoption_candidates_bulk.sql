@@ -0,0 +1,27 @@
+-- 승격 후보 일괄 갱신 RPC
+-- UserPlaceService.add_user_places_bulk (POST /api/v1/user-places/bulk) 에서 사용
+-- 장소마다 add_adoption_candidate 를 호출하던 것을 요청 한 번으로 처리 (한 트랜잭션)
+--
+-- p_places: [{"place_hash", "name", "address", "category", "latitude", "longitude"}, ...]
+
+CREATE OR REPLACE FUNCTION add_adoption_candidates_bulk(p_user_id TEXT, p_places JSONB)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    place JSONB;
+BEGIN
+    FOR place IN SELECT * FROM jsonb_array_elements(p_places)
+    LOOP
+        PERFORM add_adoption_candidate(
+            p_place_hash => place->>'place_hash',
+            p_user_id => p_user_id,
+            p_name => place->>'name',
+            p_address => place->>'address',
+            p_category => place->>'category',
+            p_latitude => (place->>'latitude')::DOUBLE PRECISION,
+            p_longitude => (place->>'longitude')::DOUBLE PRECISION
+        );
+    END LOOP;
+END;
+$$;
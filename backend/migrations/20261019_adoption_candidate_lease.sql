@@ -0,0 +1,16 @@
+-- 승격 후보 처리 lease
+-- FeaturePipelineService.claim_candidate / extend_lease, 백그라운드 워커(app/services/pipeline_worker.py) 에서 사용
+-- processing 상태로 멈춘 행은 lease_expires_at이 지나면 다른 워커가 다시 잡음
+
+ALTER TABLE place_adoption_candidates
+    ADD COLUMN IF NOT EXISTS lease_owner TEXT,
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+
+-- 이전 수동 실행 중 멈춘 processing 행은 즉시 회수 대상으로
+UPDATE place_adoption_candidates
+    SET lease_expires_at = now()
+    WHERE features_status = 'processing' AND lease_expires_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_adoption_candidates_status_lease
+    ON place_adoption_candidates (features_status, lease_expires_at)
+    WHERE is_promoted = false;
@@ -0,0 +1,65 @@
+-- 승격 후보 원자적 claim + 재시도 / dead_letter
+-- FeaturePipelineService.claim_candidates (수동 /admin/run-pipeline, 백그라운드 워커) 에서 사용
+-- 여러 워커가 동시에 호출해도 FOR UPDATE SKIP LOCKED로 같은 행을 두 번 가져가지 않음
+--
+-- features_status: pending → processing → completed
+--                  processing 실패 → pending (next_attempt_at까지 대기, 지수 백오프) → ... → dead_letter
+-- attempts는 claim할 때 증가 (처리 중 크래시도 1회 실패로 셈)
+
+ALTER TABLE place_adoption_candidates
+    ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS last_error TEXT;
+
+-- 이전 failed 행은 새 재시도 정책으로 다시 시도
+UPDATE place_adoption_candidates
+    SET features_status = 'pending', next_attempt_at = NULL
+    WHERE features_status = 'failed' AND is_promoted = false;
+
+CREATE INDEX IF NOT EXISTS idx_adoption_candidates_pending_due
+    ON place_adoption_candidates (next_attempt_at)
+    WHERE features_status = 'pending' AND is_promoted = false;
+
+CREATE OR REPLACE FUNCTION claim_adoption_candidates(
+    p_owner TEXT,
+    p_limit INTEGER,
+    p_lease_seconds INTEGER,
+    p_max_attempts INTEGER,
+    p_place_hash TEXT DEFAULT NULL
+)
+RETURNS SETOF place_adoption_candidates
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- 재시도 횟수를 다 쓴 채 lease가 만료된 행 (처리 중 반복 크래시) → dead_letter
+    UPDATE place_adoption_candidates
+        SET features_status = 'dead_letter', lease_owner = NULL, lease_expires_at = NULL
+        WHERE features_status = 'processing'
+          AND lease_expires_at < now()
+          AND attempts >= p_max_attempts
+          AND (p_place_hash IS NULL OR place_hash = p_place_hash);
+
+    RETURN QUERY
+    WITH picked AS (
+        SELECT place_hash
+        FROM place_adoption_candidates
+        WHERE is_promoted = false
+          AND (p_place_hash IS NULL OR place_hash = p_place_hash)
+          AND (
+              (features_status = 'pending' AND (next_attempt_at IS NULL OR next_attempt_at <= now()))
+              OR (features_status = 'processing' AND lease_expires_at < now())
+          )
+        ORDER BY next_attempt_at NULLS FIRST
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE place_adoption_candidates c
+        SET features_status = 'processing',
+            lease_owner = p_owner,
+            lease_expires_at = now() + make_interval(secs => p_lease_seconds),
+            attempts = c.attempts + 1
+        FROM picked
+        WHERE c.place_hash = picked.place_hash
+        RETURNING c.*;
+END;
+$$;
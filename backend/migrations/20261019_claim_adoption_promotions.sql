@@ -0,0 +1,43 @@
+-- 승격 대기 후보 원자적 claim (공식 장소 승격 중복 방지)
+-- FeaturePipelineService.claim_promotions (수동 /admin/run-pipeline, 백그라운드 워커) 에서 사용
+-- completed + user_count >= p_min_users + 미승격 행에 lease를 잡고 반환
+-- → 여러 워커가 같은 후보를 동시에 승격해 places에 두 번 INSERT하지 않음
+--
+-- features_status는 completed 그대로 (lease_owner / lease_expires_at만 사용, attempts는 세지 않음)
+-- 승격이 끝나거나 실패하면 lease 해제, 워커가 죽으면 lease 만료 후 다른 워커가 다시 잡음
+
+CREATE INDEX IF NOT EXISTS idx_adoption_candidates_ready
+    ON place_adoption_candidates (user_count)
+    WHERE features_status = 'completed' AND is_promoted = false;
+
+CREATE OR REPLACE FUNCTION claim_adoption_promotions(
+    p_owner TEXT,
+    p_lease_seconds INTEGER,
+    p_min_users INTEGER,
+    p_limit INTEGER DEFAULT NULL,
+    p_place_hash TEXT DEFAULT NULL
+)
+RETURNS SETOF place_adoption_candidates
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    WITH picked AS (
+        SELECT place_hash
+        FROM place_adoption_candidates
+        WHERE features_status = 'completed'
+          AND is_promoted = false
+          AND user_count >= p_min_users
+          AND (p_place_hash IS NULL OR place_hash = p_place_hash)
+          AND (lease_owner IS NULL OR lease_expires_at < now())
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE place_adoption_candidates c
+        SET lease_owner = p_owner,
+            lease_expires_at = now() + make_interval(secs => p_lease_seconds)
+        FROM picked
+        WHERE c.place_hash = picked.place_hash
+        RETURNING c.*;
+END;
+$$;
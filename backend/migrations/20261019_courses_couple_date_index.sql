@@ -0,0 +1,13 @@
+-- 커플/기간별 코스 조회용 인덱스
+-- CourseService.get_courses_by_couple_range (GET /api/v1/courses/range) 에서 사용
+-- (couple_id, date, course_id) 순서 → 기간 필터 + keyset 페이지네이션을 인덱스만으로 처리
+
+-- couples.schedules 에만 연결되어 있고 couple_id 가 비어 있는 기존 코스 보정
+UPDATE courses c
+SET couple_id = cp.couple_id
+FROM couples cp
+WHERE c.couple_id IS NULL
+  AND c.course_id::text = ANY (cp.schedules::text[]);
+
+CREATE INDEX IF NOT EXISTS idx_courses_couple_date
+    ON courses (couple_id, date, course_id);
@@ -0,0 +1,78 @@
+-- 지도 핀 상태 조회용 인덱스
+-- PlaceLookupService (POST /api/v1/user-places/lookup, 개인 장소 추가, 찜 중복 확인) 에서 사용
+-- 좌표 범위 스캔 대신 (user_id, place_hash) / (couple_id, geohash) 일치 조회만 하도록 변경됨
+--
+-- wishlists.geohash: 찜 좌표의 geohash 7자리 (약 153m 셀, WishlistService.add_wishlist에서 채움)
+-- 찜 여부는 오차 범위 박스가 걸치는 셀(최대 4개)만 in_ 조회 후 좌표 비교
+-- 기존 행은 아래 geohash_encode (app/core/geo.py encode_geohash와 같은 인코딩) 로 채움
+
+CREATE INDEX IF NOT EXISTS idx_user_places_user_hash
+    ON user_places (user_id, place_hash);
+
+ALTER TABLE wishlists ADD COLUMN IF NOT EXISTS geohash TEXT;
+
+CREATE OR REPLACE FUNCTION geohash_encode(
+    p_latitude DOUBLE PRECISION,
+    p_longitude DOUBLE PRECISION,
+    p_precision INTEGER
+)
+RETURNS TEXT
+LANGUAGE plpgsql
+IMMUTABLE
+AS $$
+DECLARE
+    base32 CONSTANT TEXT := '0123456789bcdefghjkmnpqrstuvwxyz';
+    lat_lo DOUBLE PRECISION := -90;
+    lat_hi DOUBLE PRECISION := 90;
+    lng_lo DOUBLE PRECISION := -180;
+    lng_hi DOUBLE PRECISION := 180;
+    mid DOUBLE PRECISION;
+    bits INTEGER := 0;
+    bit_count INTEGER := 0;
+    even BOOLEAN := true;  -- 짝수 번째 비트는 경도, 홀수 번째 비트는 위도
+    result TEXT := '';
+BEGIN
+    WHILE length(result) < p_precision LOOP
+        IF even THEN
+            mid := (lng_lo + lng_hi) / 2;
+            IF p_longitude >= mid THEN
+                bits := bits * 2 + 1;
+                lng_lo := mid;
+            ELSE
+                bits := bits * 2;
+                lng_hi := mid;
+            END IF;
+        ELSE
+            mid := (lat_lo + lat_hi) / 2;
+            IF p_latitude >= mid THEN
+                bits := bits * 2 + 1;
+                lat_lo := mid;
+            ELSE
+                bits := bits * 2;
+                lat_hi := mid;
+            END IF;
+        END IF;
+
+        even := NOT even;
+        bit_count := bit_count + 1;
+        IF bit_count = 5 THEN
+            result := result || substr(base32, bits + 1, 1);
+            bits := 0;
+            bit_count := 0;
+        END IF;
+    END LOOP;
+
+    RETURN result;
+END;
+$$;
+
+UPDATE wishlists
+    SET geohash = geohash_encode(latitude, longitude, 7)
+    WHERE geohash IS NULL
+      AND latitude IS NOT NULL
+      AND longitude IS NOT NULL;
+
+DROP INDEX IF EXISTS idx_wishlists_couple;
+
+CREATE INDEX IF NOT EXISTS idx_wishlists_couple_geohash
+    ON wishlists (couple_id, geohash);
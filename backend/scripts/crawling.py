@@ -1,20 +1,61 @@
+"""
+Google Places 검색 결과 → SQLite places 테이블 (test.db) 크롤러
+
+- 여러 검색어(또는 지역 x 키워드 조합)를 스레드 풀로 동시에 실행, 전체 호출은 rate limiter로 제한
+- place_id 중복은 메모리(이번 실행 + 기존 DB의 place_id 전체를 시작할 때 한 번에 로드)에서 제거
+- 저장은 batch 단위 INSERT ... ON CONFLICT(place_id) DO NOTHING (한 행씩 존재 확인 X)
+- 검색어별 진행 상황(다음 페이지 토큰, 완료 여부)을 체크포인트 파일에 기록 → 중단 후 같은 명령으로 재개
+
+사용 예시:
+  python scripts/crawling.py --place "인천 송도 맛집"
+  python scripts/crawling.py --regions 송도동,연수동,청학동 --keywords 맛집,카페,전시 --concurrency 8 --qps 5
+  python scripts/crawling.py --queries-file queries.txt --db ../seoul.db --checkpoint seoul.ckpt.json
+  python scripts/crawling.py --bbox 37.36,126.61,37.41,126.70 --keywords 맛집,카페 --tile-km 1 --max-depth 4
+
+타일 모드(--bbox): 검색어 하나는 최대 60개까지만 나오므로 지역을 격자로 나눠 타일마다 locationRestriction으로 검색,
+60개에 닿은 타일은 4분할해서 다시 검색 (타일별 수집 통계는 --coverage 파일)
+"""
 import json
+import math
 import time
 import argparse
 import sys
 import os
+import sqlite3
+import threading
+import requests
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # 상위 디렉토리의 app 모듈을 임포트하기 위해
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.config import settings
 from app.external.google_search import search_place_google_v1
-from app.core.database import SessionLocal, engine
-from app.models import place as models
-from app.models.place import PlaceModel
 from tqdm import tqdm
 
-# DB 테이블 생성
-models.Base.metadata.create_all(bind=engine)
+MAX_PAGES = 5
+
+PLACES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS places (
+    id INTEGER NOT NULL,
+    place_id VARCHAR,
+    name VARCHAR,
+    category VARCHAR,
+    address VARCHAR,
+    latitude FLOAT,
+    longitude FLOAT,
+    rating FLOAT,
+    price_range VARCHAR,
+    opening_hours JSON,
+    reviews JSON,
+    scores JSON,
+    PRIMARY KEY (id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_places_place_id ON places (place_id);
+CREATE INDEX IF NOT EXISTS ix_places_name ON places (name);
+CREATE INDEX IF NOT EXISTS ix_places_category ON places (category);
+"""
 
 def process_price(price_range):
     CURRENCY_SYMBOLS = {
@@ -41,70 +82,519 @@ def process_price(price_range):
 def process_review(reviews):
     return [r.get("text", {}).get("text", "") for r in reviews]
 
-def save_places_google(place_query: str, max_places: int = 60):
-    """Google Places API 결과를 DB에 저장"""
-    db = SessionLocal()
-    try:
-        all_places = []
-        page_token = None
+def to_row(p: dict) -> dict:
+    """searchText 결과 장소 하나 → places 테이블 row"""
+    location = p.get("location", {})
+    opening_hours = p.get("currentOpeningHours", {}).get("weekdayDescriptions")
+    return {
+        "place_id": p.get("id"),
+        "name": p["displayName"]["text"],
+        "category": p.get("primaryTypeDisplayName", {}).get("text"),
+        "address": p.get("shortFormattedAddress"),
+        "latitude": location.get("latitude"),
+        "longitude": location.get("longitude"),
+        "rating": p.get("rating"),
+        "price_range": process_price(p.get("priceRange")),
+        "opening_hours": json.dumps(opening_hours, ensure_ascii=False) if opening_hours else None,
+        "reviews": json.dumps(process_review(p.get("reviews", [])), ensure_ascii=False),
+    }
 
-        print(f"🔍 '{place_query}' 검색 중...")
 
-        for _ in range(5):
-            result = search_place_google_v1(place_query, page_token)
-            if not result or "places" not in result:
-                break
+class RateLimiter:
+    """전체 스레드 공용 초당 호출 수 제한 (호출 간 최소 간격)"""
+
+    def __init__(self, qps: float):
+        self.interval = 1.0 / qps if qps > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class Checkpoint:
+    """검색어(타일)별 진행 상황 파일 ({key: {"page_token", "pages", "fetched", "added", "done", "split", "error"}})"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state: Dict[str, dict] = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.state = json.load(f)
+
+    def get(self, query: str) -> dict:
+        with self._lock:
+            return dict(self.state.get(query) or {"page_token": None, "pages": 0, "fetched": 0, "done": False})
+
+    def update(self, query: str, **progress):
+        """메모리에만 반영 (파일은 해당 장소들이 DB에 저장된 뒤 save()로 기록)"""
+        with self._lock:
+            self.state.setdefault(query, {"page_token": None, "pages": 0, "fetched": 0, "done": False}).update(progress)
+
+    def save(self):
+        with self._lock:
+            if not self.path:
+                return
+            # 중간에 죽어도 파일이 깨지지 않게 임시 파일에 쓰고 교체
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
+
+
+class PlaceStore:
+    """
+    places 테이블 batch 저장 (place_id 중복은 메모리에서 먼저 제거)
+
+    체크포인트 파일은 commit 직후에만 기록 → 파일의 진행 상황이 DB보다 앞서지 않음
+    (중간에 죽으면 마지막 commit 이후 페이지만 다시 수집)
+    """
+
+    COLUMNS = ("place_id", "name", "category", "address", "latitude", "longitude",
+               "rating", "price_range", "opening_hours", "reviews")
+
+    def __init__(self, db_path: str, checkpoint: Checkpoint, batch_size: int = 200):
+        self.checkpoint = checkpoint
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.executescript(PLACES_SCHEMA)
+        self._lock = threading.Lock()
+        self._buffer: List[dict] = []
+        # 기존 place_id 전체를 한 번에 로드 (행마다 존재 확인 쿼리 X)
+        self.seen = {row[0] for row in self.conn.execute("SELECT place_id FROM places WHERE place_id IS NOT NULL")}
+        self.existing = len(self.seen)
+        self.inserted = 0
+
+    def add(self, places: Iterable[dict], query: str, **progress) -> int:
+        """
+        한 페이지 결과 중 새 place_id만 버퍼에 추가 + 검색어 진행 상황 갱신 (batch_size가 차면 저장)
 
-            all_places.extend(result["places"])
-            page_token = result.get("nextPageToken")
-            if not page_token or len(all_places) >= max_places:
+        Returns:
+            추가된 개수
+        """
+        added = 0
+        with self._lock:
+            self.checkpoint.update(query, **progress)
+            for p in places:
+                place_id = p.get("id")
+                if not place_id or place_id in self.seen:
+                    continue
+                self.seen.add(place_id)
+                self._buffer.append(to_row(p))
+                added += 1
+            if added:
+                self.checkpoint.update(query, added=self.checkpoint.get(query).get("added", 0) + added)
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+        return added
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            self.checkpoint.save()
+            return
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        cursor = self.conn.executemany(
+            f"INSERT INTO places ({', '.join(self.COLUMNS)}) VALUES ({placeholders}) "
+            f"ON CONFLICT(place_id) DO NOTHING",
+            [tuple(row[c] for c in self.COLUMNS) for row in self._buffer]
+        )
+        self.conn.commit()
+        self.inserted += cursor.rowcount
+        self._buffer = []
+        self.checkpoint.save()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+class CrawlError(RuntimeError):
+    """재시도 후에도 페이지를 받지 못함 (검색어는 done으로 기록되지 않아 다음 실행에서 재개)"""
+
+
+def crawl_query(
+    place_query: str,
+    store: PlaceStore,
+    limiter: RateLimiter,
+    max_places: int = 60,
+    retries: int = 2,
+    location_restriction: Optional[dict] = None,
+    key: Optional[str] = None
+) -> int:
+    """
+    검색어 하나를 페이지 끝(또는 max_places)까지 수집 (체크포인트의 다음 페이지부터 재개)
+
+    Args:
+        location_restriction: 결과를 제한할 사각형 (타일 모드)
+        key: 체크포인트 키 (기본값: 검색어)
+
+    Returns:
+        이번 호출에서 새로 추가한 장소 수
+
+    Raises:
+        CrawlError: 재시도(+ 페이지 토큰 초기화 1회) 후에도 응답이 없음
+    """
+    key = key or place_query
+    checkpoint = store.checkpoint
+    progress = checkpoint.get(key)
+    if progress["done"]:
+        return 0
+
+    page_token, pages, fetched = progress["page_token"], progress["pages"], progress["fetched"]
+    added = 0
+    token_reset = False
+
+    while pages < MAX_PAGES and fetched < max_places:
+        result = None
+        for attempt in range(retries + 1):
+            limiter.wait()
+            try:
+                result = search_place_google_v1(place_query, page_token, location_restriction)
+            except requests.RequestException as e:
+                tqdm.write(f"⚠️ '{place_query}' 요청 실패: {e}")
+                result = None
+            if result is not None:
                 break
-            time.sleep(2)
-
-        print(f"✅ 총 {len(all_places)}개 장소 수집 완료")
-
-        for p in tqdm(all_places):
-            place_id = p.get("id")
-            name = p["displayName"]["text"]
-            category = p.get("primaryTypeDisplayName", {}).get("text")
-            address = p.get("shortFormattedAddress")
-            location = p.get("location", {})
-            latitude = location.get("latitude")
-            longitude = location.get("longitude")
-            rating = p.get("rating")
-            price_range = process_price(p.get("priceRange"))
-            opening_hours = p.get("currentOpeningHours", {}).get("weekdayDescriptions")
-            reviews = process_review(p.get("reviews", []))
-
-            exists = db.query(PlaceModel).filter(PlaceModel.place_id == place_id).first()
-            if exists:
-                continue
-
-            db_place = PlaceModel(
-                place_id=place_id,
-                name=name,
-                category=category,
-                address=address,
-                latitude=latitude,
-                longitude=longitude,
-                rating=rating,
-                price_range=price_range,
-                opening_hours=json.dumps(opening_hours, ensure_ascii=False) if opening_hours else None,
-                reviews=json.dumps(reviews, ensure_ascii=False)
-            )
-
-            db.add(db_place)
-
-        db.commit()
-        print("💾 DB 저장 완료!")
+            time.sleep(2 ** attempt)
+
+        if result is None and page_token and not token_reset:
+            # 체크포인트의 페이지 토큰이 만료됐을 수 있음 → 검색어당 한 번만 처음부터 (이미 저장한 장소는 중복 제거됨)
+            page_token, pages, fetched = None, 0, 0
+            token_reset = True
+            continue
+        if result is None:
+            # 여기까지 받은 페이지는 저장하고 done 없이 실패 → 다음 실행에서 이어서 진행
+            store.flush()
+            raise CrawlError(f"'{place_query}' {pages + 1}페이지 조회 실패")
+        if "places" not in result:
+            break
+
+        fetched += len(result["places"])
+        pages += 1
+        page_token = result.get("nextPageToken")
+        added += store.add(result["places"], key, page_token=page_token, pages=pages, fetched=fetched)
+        if not page_token:
+            break
+
+    # 이 검색어의 장소를 저장한 뒤 done 기록
+    store.add([], key, done=True)
+    store.flush()
+    return added
+
+
+def build_queries(
+    places: Optional[List[str]] = None,
+    regions: Optional[List[str]] = None,
+    keywords: Optional[List[str]] = None
+) -> List[str]:
+    """검색어 목록 + 지역 x 키워드 조합 (중복 제거, 순서 유지)"""
+    queries = list(places or [])
+    for region in regions or []:
+        for keyword in keywords or []:
+            queries.append(f"{region} {keyword}")
+    return list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+
+
+def save_places_google(
+    place_queries,
+    max_places: int = 60,
+    db_path: str = settings.LOCAL_DB_SEED_PATH,
+    concurrency: int = 4,
+    qps: float = 5.0,
+    batch_size: int = 200,
+    checkpoint_path: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Google Places API 결과를 DB에 저장
+
+    Args:
+        place_queries: 검색어 (문자열 하나 또는 리스트)
+        max_places: 검색어당 최대 수집 장소 수
+        db_path: SQLite 파일 (places 테이블이 없으면 생성)
+        concurrency: 동시에 진행할 검색어 수
+        qps: 전체 Google API 초당 호출 수 상한
+        batch_size: 몇 개씩 모아서 저장할지
+        checkpoint_path: 진행 상황 파일 (없으면 재개 불가)
+
+    Returns:
+        {"queries": int, "inserted": int, "existing": int}
+    """
+    if isinstance(place_queries, str):
+        place_queries = [place_queries]
 
+    checkpoint = Checkpoint(checkpoint_path)
+    store = PlaceStore(db_path, checkpoint, batch_size=batch_size)
+    limiter = RateLimiter(qps)
+    remaining = [q for q in place_queries if not checkpoint.get(q)["done"]]
+
+    print(f"🔍 검색어 {len(remaining)}개 수집 시작 (전체 {len(place_queries)}개, 기존 장소 {store.existing}개)")
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+            futures = {
+                pool.submit(crawl_query, q, store, limiter, max_places): q
+                for q in remaining
+            }
+            with tqdm(total=len(futures)) as bar:
+                for future in as_completed(futures):
+                    query = futures[future]
+                    try:
+                        added = future.result()
+                        bar.set_postfix_str(f"{query}: +{added}")
+                    except Exception as e:
+                        # 실패한 검색어는 done이 아니므로 다음 실행에서 이어서 진행
+                        tqdm.write(f"❌ '{query}' 실패: {e}")
+                    bar.update(1)
     finally:
-        db.close()
+        store.close()
+
+    print(f"💾 DB 저장 완료! (새 장소 {store.inserted}개)")
+    return {"queries": len(remaining), "inserted": store.inserted, "existing": store.existing}
+
+
+# ========== 타일 모드 (지역 전체를 격자로 나눠 수집) ==========
+
+RESULT_CAP = 60  # searchText는 검색어 하나당 최대 60개 (20개 x 3페이지)
+KM_PER_DEG_LAT = 111.0
+
+
+class Tile:
+    """위경도 사각형 (depth: 처음 격자에서 몇 번 4분할됐는지)"""
+
+    def __init__(self, south: float, west: float, north: float, east: float, depth: int = 0):
+        self.south, self.west, self.north, self.east, self.depth = south, west, north, east, depth
+
+    @property
+    def key(self) -> str:
+        return f"{self.south:.5f},{self.west:.5f},{self.north:.5f},{self.east:.5f}"
+
+    def restriction(self) -> dict:
+        return {
+            "low": {"latitude": self.south, "longitude": self.west},
+            "high": {"latitude": self.north, "longitude": self.east},
+        }
+
+    def split(self) -> List["Tile"]:
+        """4등분"""
+        mid_lat, mid_lng = (self.south + self.north) / 2, (self.west + self.east) / 2
+        d = self.depth + 1
+        return [
+            Tile(self.south, self.west, mid_lat, mid_lng, d),
+            Tile(self.south, mid_lng, mid_lat, self.east, d),
+            Tile(mid_lat, self.west, self.north, mid_lng, d),
+            Tile(mid_lat, mid_lng, self.north, self.east, d),
+        ]
+
+    def area_km2(self) -> float:
+        mid_lat = math.radians((self.south + self.north) / 2)
+        return (self.north - self.south) * KM_PER_DEG_LAT * (self.east - self.west) * KM_PER_DEG_LAT * math.cos(mid_lat)
+
+
+def grid_tiles(south: float, west: float, north: float, east: float, tile_km: float) -> List[Tile]:
+    """bbox를 한 변 약 tile_km인 격자로 분할"""
+    lat_step = tile_km / KM_PER_DEG_LAT
+    lng_step = tile_km / (KM_PER_DEG_LAT * math.cos(math.radians((south + north) / 2)))
+    rows = max(math.ceil((north - south) / lat_step), 1)
+    cols = max(math.ceil((east - west) / lng_step), 1)
+    lat_size, lng_size = (north - south) / rows, (east - west) / cols
+    return [
+        Tile(south + r * lat_size, west + c * lng_size, south + (r + 1) * lat_size, west + (c + 1) * lng_size)
+        for r in range(rows)
+        for c in range(cols)
+    ]
+
+
+def crawl_tile(keyword: str, tile: Tile, store: PlaceStore, limiter: RateLimiter, max_depth: int) -> List[Tile]:
+    """
+    타일 하나를 locationRestriction으로 수집, 결과가 상한(60개)에 닿으면 4분할한 하위 타일 반환
+
+    Returns:
+        더 수집할 하위 타일 (없으면 [])
+    """
+    key = f"{keyword}@{tile.key}"
+    checkpoint = store.checkpoint
+    try:
+        crawl_query(keyword, store, limiter, max_places=RESULT_CAP, location_restriction=tile.restriction(), key=key)
+    except CrawlError as e:
+        # done 없이 오류만 기록 → 커버리지 통계에서 빈 타일과 구분, 다음 실행에서 재시도
+        store.add([], key, error=str(e))
+        store.flush()
+        raise
+
+    progress = checkpoint.get(key)
+    if progress.get("error"):
+        store.add([], key, error=None)
+        store.flush()
+    if progress["fetched"] < RESULT_CAP or tile.depth >= max_depth:
+        return []
+
+    # 결과가 잘렸을 수 있음 → 더 작은 타일로 다시 (부모 결과와 겹치는 장소는 중복 제거됨)
+    checkpoint.update(key, split=True)
+    return tile.split()
+
+
+def tile_coverage(checkpoint: Checkpoint, keyword: str, tiles: List[Tile], max_depth: int) -> List[dict]:
+    """타일별 수집 결과 (분할된 타일은 하위 타일까지 재귀)"""
+    stats = []
+    for tile in tiles:
+        progress = checkpoint.get(f"{keyword}@{tile.key}")
+        saturated = progress["fetched"] >= RESULT_CAP
+        stats.append({
+            "keyword": keyword,
+            "bbox": [tile.south, tile.west, tile.north, tile.east],
+            "depth": tile.depth,
+            "area_km2": round(tile.area_km2(), 4),
+            "fetched": progress["fetched"],
+            "added": progress.get("added", 0),
+            "done": progress["done"],
+            "error": progress.get("error"),
+            "split": bool(progress.get("split")),
+            # 최대 깊이에서도 상한에 닿음 → 이 타일은 전부 수집하지 못했을 수 있음
+            "truncated": saturated and tile.depth >= max_depth,
+        })
+        if progress.get("split"):
+            stats.extend(tile_coverage(checkpoint, keyword, tile.split(), max_depth))
+    return stats
+
+
+def crawl_region(
+    bbox: Tuple[float, float, float, float],
+    keywords: List[str],
+    tile_km: float = 2.0,
+    max_depth: int = 4,
+    db_path: str = settings.LOCAL_DB_SEED_PATH,
+    concurrency: int = 4,
+    qps: float = 5.0,
+    batch_size: int = 200,
+    checkpoint_path: Optional[str] = None,
+    coverage_path: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    지역(bbox) 전체를 격자 타일로 나눠 키워드별로 수집 (촘촘한 곳은 적응적으로 4분할)
+
+    Args:
+        bbox: (south, west, north, east)
+        keywords: 타일마다 검색할 키워드 (예: ["맛집", "카페"])
+        tile_km: 처음 격자 한 변 길이
+        max_depth: 최대 분할 횟수 (한 번에 변 길이 절반)
+        coverage_path: 타일별 수집 통계 JSON 파일
+
+    Returns:
+        {"tiles": int, "truncated": int, "failed": int, "inserted": int, "existing": int}
+    """
+    checkpoint = Checkpoint(checkpoint_path)
+    store = PlaceStore(db_path, checkpoint, batch_size=batch_size)
+    limiter = RateLimiter(qps)
+    roots = grid_tiles(*bbox, tile_km)
+
+    # 재개: 이미 분할된 타일은 하위 타일부터, 끝난 타일은 건너뜀
+    work, stack = [], [(k, t) for k in keywords for t in roots]
+    while stack:
+        keyword, tile = stack.pop()
+        progress = checkpoint.get(f"{keyword}@{tile.key}")
+        if progress.get("split"):
+            stack.extend((keyword, child) for child in tile.split())
+        elif not progress["done"] or (progress["fetched"] >= RESULT_CAP and tile.depth < max_depth):
+            work.append((keyword, tile))
+
+    print(f"🗺️ 타일 {len(roots)}개 x 키워드 {len(keywords)}개 수집 시작 (남은 작업 {len(work)}개, 기존 장소 {store.existing}개)")
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool, tqdm(total=len(work)) as bar:
+            pending = {pool.submit(crawl_tile, k, t, store, limiter, max_depth): (k, t) for k, t in work}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    keyword, tile = pending.pop(future)
+                    try:
+                        children = future.result()
+                    except Exception as e:
+                        tqdm.write(f"❌ '{keyword}' {tile.key} 실패: {e}")
+                        children = []
+                    for child in children:
+                        pending[pool.submit(crawl_tile, keyword, child, store, limiter, max_depth)] = (keyword, child)
+                    bar.total += len(children)
+                    bar.update(1)
+    finally:
+        store.close()
+
+    coverage = [s for k in keywords for s in tile_coverage(checkpoint, k, roots, max_depth)]
+    truncated = sum(1 for s in coverage if s["truncated"])
+    failed = sum(1 for s in coverage if s["error"])
+    if coverage_path:
+        with open(coverage_path, "w", encoding="utf-8") as f:
+            json.dump(coverage, f, ensure_ascii=False, indent=2)
+
+    print(f"💾 DB 저장 완료! (새 장소 {store.inserted}개, 타일 {len(coverage)}개, "
+          f"최대 깊이에서 잘린 타일 {truncated}개, 실패한 타일 {failed}개)")
+    return {
+        "tiles": len(coverage),
+        "truncated": truncated,
+        "failed": failed,
+        "inserted": store.inserted,
+        "existing": store.existing,
+    }
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--place", type=str, default="인천 송도 맛집")
-    parser.add_argument("--num_places", type=int, default=60)
+    parser.add_argument("--place", type=str, action="append", help="검색어 (여러 번 지정 가능)")
+    parser.add_argument("--queries-file", type=str, help="한 줄에 검색어 하나")
+    parser.add_argument("--regions", type=str, help="지역 목록 (콤마 구분, --keywords와 조합)")
+    parser.add_argument("--keywords", type=str, default="맛집", help="키워드 목록 (콤마 구분)")
+    parser.add_argument("--num_places", type=int, default=60, help="검색어당 최대 장소 수")
+    parser.add_argument("--db", type=str, default=settings.LOCAL_DB_SEED_PATH)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--qps", type=float, default=5.0, help="Google API 초당 호출 수 상한")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--checkpoint", type=str, default="crawl_checkpoint.json", help="비우면 체크포인트 없음")
+    parser.add_argument("--bbox", type=str, help="타일 모드: south,west,north,east (--keywords로 타일마다 검색)")
+    parser.add_argument("--tile-km", type=float, default=2.0, help="타일 모드: 처음 격자 한 변 길이")
+    parser.add_argument("--max-depth", type=int, default=4, help="타일 모드: 결과 상한에 닿은 타일 최대 분할 횟수")
+    parser.add_argument("--coverage", type=str, default="crawl_coverage.json", help="타일 모드: 타일별 통계 파일")
     args = parser.parse_args()
-    
-    save_places_google(args.place, args.num_places)
\ No newline at end of file
+
+    if args.bbox:
+        crawl_region(
+            tuple(float(v) for v in args.bbox.split(",")),
+            _split(args.keywords),
+            tile_km=args.tile_km,
+            max_depth=args.max_depth,
+            db_path=args.db,
+            concurrency=args.concurrency,
+            qps=args.qps,
+            batch_size=args.batch_size,
+            checkpoint_path=args.checkpoint or None,
+            coverage_path=args.coverage or None
+        )
+        sys.exit(0)
+
+    places = list(args.place or [])
+    if args.queries_file:
+        with open(args.queries_file, encoding="utf-8") as f:
+            places.extend(line for line in f.read().splitlines())
+    if not places and not args.regions:
+        places = ["인천 송도 맛집"]
+
+    save_places_google(
+        build_queries(places, _split(args.regions), _split(args.keywords)),
+        max_places=args.num_places,
+        db_path=args.db,
+        concurrency=args.concurrency,
+        qps=args.qps,
+        batch_size=args.batch_size,
+        checkpoint_path=args.checkpoint or None
+    )
@@ -0,0 +1,26 @@
+"""
+places 테이블 → 카탈로그 번들 내보내기 (app/core/catalog_bundle.py)
+
+워커는 settings.CATALOG_BUNDLE_PATH의 번들을 부팅 시 mmap으로 읽음
+(승격 / 관리자 API 수정·삭제 시에는 자동으로 다시 내보냄, 크롤링 / DB 직접 수정 후에는 이 스크립트 실행)
+
+사용 예시:
+  python -m scripts.export_catalog --out catalog_bundle
+"""
+import argparse
+import os
+import sys
+
+# 상위 디렉토리의 app 모듈을 임포트하기 위해
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+import algorithm
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", type=str, default=settings.CATALOG_BUNDLE_PATH or "catalog_bundle", help="번들 루트 디렉토리")
+    args = parser.parse_args()
+
+    bundle_dir = algorithm.export_place_catalog(args.out)
+    print(f"📦 카탈로그 번들 저장: {bundle_dir}")
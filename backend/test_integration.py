@@ -16,6 +16,7 @@ env_path = backend_path / ".env"
 load_dotenv(env_path)
 
 from app.services.persona_service import PersonaService
+from app.core.session_store import InMemorySessionStore
 from app.schemas.persona import ChatRequest
 
 
@@ -26,7 +27,7 @@ async def test_integration():
     print("="*60 + "\n")
 
     # PersonaService 초기화
-    sessions = {}
+    sessions = InMemorySessionStore()
     persona_service = PersonaService(sessions)
 
     test_cases = [
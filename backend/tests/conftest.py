@@ -0,0 +1,49 @@
+"""
+pytest 공통 설정
+
+live Supabase / OpenAI 없이 로컬 데이터 백엔드(app.core.local_db, memory)로 서비스 코드 실행
+
+실행 (backend 디렉토리에서):
+    python -m pytest -q
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+# app.config Settings 필수 값 (테스트는 외부 서비스를 호출하지 않음)
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_KEY", "test")
+os.environ["DATA_BACKEND"] = "memory"
+os.environ["SESSION_BACKEND"] = "memory"
+os.environ["CATALOG_BUNDLE_PATH"] = ""
+os.environ["TRACING_ENABLED"] = "false"
+
+import algorithm
+from app.core.local_db import MemoryClient, set_local_client
+from app.core.session_store import get_slot_pool_store
+from app.services import course_service as course_module
+
+
+@pytest.fixture
+def db():
+    """
+    빈 MemoryClient를 get_supabase()가 반환하도록 교체
+
+    places 스냅샷 / 개인 장소 블록 / 코스 캐시 / 슬롯 후보 풀도 초기화
+    (테이블은 서비스 생성 전에 db.tables에 채움)
+    """
+    client = MemoryClient()
+    set_local_client(client)
+    algorithm._catalog = None
+    algorithm._user_overlays.clear()
+    course_module._course_cache.clear()
+    get_slot_pool_store().clear()
+    yield client
+    set_local_client(None)
+    algorithm._catalog = None
@@ -0,0 +1,72 @@
+"""
+algorithm 캐시 테스트
+
+- places 스냅샷 / 사용자별 개인 장소 블록이 카탈로그 버전이 바뀔 때만 다시 만들어지는지
+"""
+import algorithm
+from app.core.place_catalog import bump_catalog_version, bump_user_places_version
+from benchmarks.synthetic import make_places
+
+
+def user_place(user_id: str, name: str) -> dict:
+    return {
+        "user_place_id": f"up_{name}",
+        "user_id": user_id,
+        "place_hash": f"hash_{name}",
+        "name": name,
+        "latitude": 37.39,
+        "longitude": 126.64,
+        "features": {"template_id": "cafe"},
+        "features_status": "default",
+    }
+
+
+def test_catalog_reloaded_on_version_bump(db):
+    db.tables["places"] = make_places(50)
+
+    catalog = algorithm.get_place_catalog()
+    assert algorithm.get_place_catalog() is catalog
+
+    db.tables["places"].extend(make_places(51)[50:])
+    assert len(algorithm.get_place_catalog()) == 50
+
+    bump_catalog_version()
+    assert len(algorithm.get_place_catalog()) == 51
+
+
+def test_user_overlay_cached_until_version_bump(db):
+    db.tables["places"] = make_places(50)
+    db.tables["user_places"] = [user_place("user_1", "개인 카페 1")]
+    catalog = algorithm.get_place_catalog()
+
+    overlay = algorithm.get_user_overlay("user_1", catalog)
+    assert len(overlay) == 1
+    assert algorithm.get_user_overlay("user_1", catalog) is overlay
+
+    # 버전을 올리지 않은 변경은 캐시된 블록 그대로
+    db.tables["user_places"].append(user_place("user_1", "개인 카페 2"))
+    assert algorithm.get_user_overlay("user_1", catalog) is overlay
+
+    # 다른 사용자의 개인 장소 변경은 영향 없음
+    bump_user_places_version("user_2")
+    assert algorithm.get_user_overlay("user_1", catalog) is overlay
+
+    bump_user_places_version("user_1")
+    refreshed = algorithm.get_user_overlay("user_1", catalog)
+    assert refreshed is not overlay
+    assert len(refreshed) == 2
+
+
+def test_user_overlay_invalidated_by_catalog_version(db):
+    db.tables["places"] = make_places(50)
+    db.tables["user_places"] = [user_place("user_1", "개인 카페 1")]
+    catalog = algorithm.get_place_catalog()
+    overlay = algorithm.get_user_overlay("user_1", catalog)
+
+    # features 계산 완료 / 승격은 bump_catalog_version으로 전체 무효화
+    db.tables["user_places"][0]["features_status"] = "pending"
+    bump_catalog_version()
+
+    refreshed = algorithm.get_user_overlay("user_1", algorithm.get_place_catalog())
+    assert refreshed is not overlay
+    assert len(refreshed) == 0
@@ -0,0 +1,150 @@
+"""
+CourseService 테스트
+
+- 기간 조회 커서 인코딩 / 디코딩, 잘못된 커서 거부, 커서로 전체 페이지 순회
+- 코스 캐시 / 슬롯 후보 풀이 카탈로그 버전이 바뀌면 무효화되는지
+"""
+import base64
+import json
+import uuid
+
+import pytest
+
+from app.core.place_catalog import bump_catalog_version, bump_user_places_version
+from app.services import course_service as course_module
+from app.services.course_service import CourseService
+from benchmarks.synthetic import SONGDO_LAT, SONGDO_LNG, make_couples, make_places
+
+COURSE_DATE = "2025-11-20"
+USER_LAT = sum(SONGDO_LAT) / 2
+USER_LNG = sum(SONGDO_LNG) / 2
+
+
+def raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+# ========== 커서 ==========
+
+def test_cursor_round_trip():
+    course_id = str(uuid.uuid4())
+    cursor = CourseService._encode_course_cursor("2026-10-19", course_id)
+
+    assert CourseService._decode_course_cursor(cursor) == ("2026-10-19", course_id)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 !!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    raw_cursor(["2026-10-19"]),
+    raw_cursor(["2026-10-19", str(uuid.uuid4()), "extra"]),
+    raw_cursor({"date": "2026-10-19"}),
+    raw_cursor([20261019, str(uuid.uuid4())]),
+    raw_cursor(["2026-13-40", str(uuid.uuid4())]),
+    raw_cursor(["2026-10-19,course_id.gt.0", str(uuid.uuid4())]),
+    raw_cursor(["2026-10-19", "not-a-uuid"]),
+    raw_cursor(["2026-10-19", "00000000-0000-0000-0000-000000000000),or(couple_id.neq.x"]),
+])
+def test_decode_rejects_bad_cursor(cursor):
+    with pytest.raises(ValueError):
+        CourseService._decode_course_cursor(cursor)
+
+
+def test_range_pages_through_all_courses(db):
+    dates = ["2026-09-30", "2026-10-01", "2026-10-01", "2026-10-01", "2026-10-15", "2026-11-01"]
+    db.tables["courses"] = [
+        {"course_id": str(uuid.uuid4()), "couple_id": "couple_1", "date": d} for d in dates
+    ] + [{"course_id": str(uuid.uuid4()), "couple_id": "couple_2", "date": "2026-10-01"}]
+    service = CourseService()
+
+    seen, cursor = [], None
+    while True:
+        page = service.get_courses_by_couple_range("couple_1", "2026-10-01", "2026-10-31", cursor=cursor, limit=2)
+        seen.extend(page["courses"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    expected = sorted(
+        (c for c in db.tables["courses"] if c["couple_id"] == "couple_1" and "2026-10-01" <= c["date"] <= "2026-10-31"),
+        key=lambda c: (c["date"], c["course_id"])
+    )
+    assert [c["course_id"] for c in seen] == [c["course_id"] for c in expected]
+
+
+def test_range_rejects_bad_cursor(db):
+    with pytest.raises(ValueError):
+        CourseService().get_courses_by_couple_range("couple_1", None, None, cursor=raw_cursor(["x", "y"]))
+
+
+# ========== 캐시 무효화 ==========
+
+@pytest.fixture
+def catalog_db(db):
+    places = make_places(300, seed=7)
+    db.tables.update(make_couples(places, n_couples=1, diaries_per_couple=0, seed=8))
+    db.tables["places"] = places
+    db.tables["user_places"] = []
+    return db
+
+
+def generate(service: CourseService, user_id: str = "user_0_a"):
+    return service.generate_date_course(
+        user_id=user_id,
+        date=COURSE_DATE,
+        template="full_day",
+        user_lat=USER_LAT,
+        user_lng=USER_LNG,
+    )
+
+
+def test_course_cache_hit(catalog_db):
+    service = CourseService()
+
+    first = generate(service)
+    second = generate(service)
+
+    assert len(course_module._course_cache) == 1
+    assert second == first
+    # 반환된 코스를 수정해도 캐시에는 영향 없음
+    second.slots[0].place_name = "changed"
+    assert generate(service) == first
+
+
+def test_course_cache_invalidated_by_catalog_version(catalog_db):
+    service = CourseService()
+    generate(service)
+
+    bump_catalog_version()
+    generate(service)
+
+    assert len(course_module._course_cache) == 2
+
+
+def test_course_cache_invalidated_by_user_places_version(catalog_db):
+    service = CourseService()
+    generate(service)
+
+    bump_user_places_version("user_0_b")
+    generate(service)
+    assert len(course_module._course_cache) == 1
+
+    bump_user_places_version("user_0_a")
+    generate(service)
+    assert len(course_module._course_cache) == 2
+
+
+def test_slot_pools_invalidated_by_catalog_version(catalog_db, monkeypatch):
+    service = CourseService()
+    course = generate(service)
+    pools = service._load_slot_pools(course, "user_0_a")
+    assert pools is not None and len(pools) == len(course.slots)
+
+    bump_user_places_version("user_0_a")
+    assert service._load_slot_pools(course, "user_0_a") is None
+
+    # 다른 워커가 저장한 풀은 버전을 비교하지 않음 (프로세스별 카운터, TTL로 만료)
+    service._save_slot_pools(course, pools, "user_0_a")
+    monkeypatch.setattr(course_module, "_POOL_WRITER", "other-worker")
+    bump_catalog_version()
+    assert service._load_slot_pools(course, "user_0_a") == pools
@@ -0,0 +1,311 @@
+"""
+FeaturePipelineService 테스트
+
+- _record_failure: 지수 백오프 / 상한 / dead_letter / lease 확인
+- lease로 막히는 갱신 (_update_features, _record_failure, extend_lease)
+- process_place_hash 처리 결과별 상태
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import settings
+from app.core.feature_templates import TEMPLATE_FEATURES
+from app.core.place_catalog import get_catalog_version
+from app.services.feature_pipeline import FeaturePipelineService, PROMOTION_THRESHOLD
+
+FEATURES = TEMPLATE_FEATURES["cafe"]
+
+
+def add_candidate(db, place_hash="hash_1", **overrides) -> dict:
+    row = {
+        "place_hash": place_hash,
+        "canonical_name": f"테스트 카페 {place_hash}",
+        "canonical_address": "인천 연수구 송도동 1",
+        "canonical_category": "카페",
+        "latitude": 37.39,
+        "longitude": 126.64,
+        "user_ids": ["user_1"],
+        "user_count": 1,
+        "features": None,
+        "features_status": "pending",
+        "is_promoted": False,
+        "attempts": 0,
+        "lease_owner": None,
+        "lease_expires_at": None,
+        "next_attempt_at": None,
+    }
+    row.update(overrides)
+    db.tables.setdefault("place_adoption_candidates", []).append(row)
+    return row
+
+
+def add_user_place(db, place_hash="hash_1", user_id="user_1") -> dict:
+    row = {
+        "user_place_id": f"up_{user_id}_{place_hash}",
+        "user_id": user_id,
+        "place_hash": place_hash,
+        "name": f"테스트 카페 {place_hash}",
+        "latitude": 37.39,
+        "longitude": 126.64,
+        "features": {"template_id": "cafe"},
+        "features_status": "default",
+    }
+    db.tables.setdefault("user_places", []).append(row)
+    return row
+
+
+def candidate_row(db, place_hash="hash_1") -> dict:
+    return next(r for r in db.tables["place_adoption_candidates"] if r["place_hash"] == place_hash)
+
+
+def expire_lease(db, place_hash="hash_1"):
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    candidate_row(db, place_hash)["lease_expires_at"] = past.isoformat()
+
+
+def seconds_until(value: str) -> float:
+    return (datetime.fromisoformat(value) - datetime.now(timezone.utc)).total_seconds()
+
+
+# ========== _record_failure ==========
+
+@pytest.mark.parametrize("attempts, backoff", [(1, 30), (2, 60), (3, 120)])
+def test_record_failure_backs_off_exponentially(db, monkeypatch, attempts, backoff):
+    monkeypatch.setattr(settings, "PIPELINE_RETRY_BASE_SECONDS", 30)
+    monkeypatch.setattr(settings, "PIPELINE_RETRY_MAX_SECONDS", 3600)
+    monkeypatch.setattr(settings, "PIPELINE_MAX_ATTEMPTS", 5)
+    add_candidate(db, attempts=attempts - 1)
+    service = FeaturePipelineService()
+
+    claimed = service.claim_candidate("hash_1", "worker_a")
+    assert claimed["attempts"] == attempts
+
+    service._record_failure(claimed, "boom")
+
+    row = candidate_row(db)
+    assert row["features_status"] == "pending"
+    assert row["lease_owner"] is None and row["lease_expires_at"] is None
+    assert row["last_error"] == "boom"
+    assert seconds_until(row["next_attempt_at"]) == pytest.approx(backoff, abs=5)
+
+
+def test_record_failure_caps_backoff(db, monkeypatch):
+    monkeypatch.setattr(settings, "PIPELINE_RETRY_BASE_SECONDS", 30)
+    monkeypatch.setattr(settings, "PIPELINE_RETRY_MAX_SECONDS", 60)
+    monkeypatch.setattr(settings, "PIPELINE_MAX_ATTEMPTS", 10)
+    add_candidate(db, attempts=5)
+    service = FeaturePipelineService()
+
+    service._record_failure(service.claim_candidate("hash_1", "worker_a"), "boom")
+
+    assert seconds_until(candidate_row(db)["next_attempt_at"]) == pytest.approx(60, abs=5)
+
+
+def test_record_failure_moves_to_dead_letter_after_max_attempts(db, monkeypatch):
+    monkeypatch.setattr(settings, "PIPELINE_MAX_ATTEMPTS", 3)
+    add_candidate(db, attempts=2)
+    service = FeaturePipelineService()
+
+    service._record_failure(service.claim_candidate("hash_1", "worker_a"), "x" * 1000)
+
+    row = candidate_row(db)
+    assert row["features_status"] == "dead_letter"
+    assert row["next_attempt_at"] is None
+    assert len(row["last_error"]) == 500
+    # dead_letter는 다시 잡히지 않음
+    assert service.claim_candidate("hash_1", "worker_b") is None
+
+
+def test_retry_waits_for_next_attempt_at(db):
+    add_candidate(db)
+    service = FeaturePipelineService()
+
+    service._record_failure(service.claim_candidate("hash_1", "worker_a"), "boom")
+    assert service.claim_candidate("hash_1", "worker_b") is None
+
+    candidate_row(db)["next_attempt_at"] = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()
+    assert service.claim_candidate("hash_1", "worker_b")["attempts"] == 2
+
+
+# ========== lease로 막히는 갱신 ==========
+
+@pytest.fixture
+def lost_lease(db):
+    """worker_a가 잡은 lease가 만료되어 worker_b가 다시 잡은 상태 → (service, worker_a 후보, worker_b 후보)"""
+    add_candidate(db)
+    add_user_place(db)
+    service = FeaturePipelineService()
+    stale = service.claim_candidate("hash_1", "worker_a")
+    expire_lease(db)
+    current = service.claim_candidate("hash_1", "worker_b")
+    assert current["lease_owner"] == "worker_b"
+    return service, stale, current
+
+
+def test_update_features_rejects_stale_lease(db, lost_lease):
+    service, stale, _ = lost_lease
+    version = get_catalog_version()
+
+    assert service._update_features(stale, FEATURES, None) is False
+
+    row = candidate_row(db)
+    assert row["features_status"] == "processing"
+    assert row["lease_owner"] == "worker_b"
+    assert row["features"] is None
+    assert db.tables["user_places"][0]["features_status"] == "default"
+    assert get_catalog_version() == version
+
+
+def test_update_features_by_lease_owner(db, lost_lease):
+    service, _, current = lost_lease
+    version = get_catalog_version()
+
+    assert service._update_features(current, FEATURES, {"rating": 4.5}) is True
+
+    row = candidate_row(db)
+    assert row["features_status"] == "completed"
+    assert row["lease_owner"] is None
+    assert row["google_place_details"] == {"rating": 4.5}
+    assert db.tables["user_places"][0]["features"] == FEATURES
+    assert db.tables["user_places"][0]["features_status"] == "completed"
+    assert get_catalog_version() != version
+
+
+def test_record_failure_ignores_stale_lease(db, lost_lease):
+    service, stale, _ = lost_lease
+
+    service._record_failure(stale, "late failure")
+
+    row = candidate_row(db)
+    assert row["features_status"] == "processing"
+    assert row["lease_owner"] == "worker_b"
+    assert row.get("last_error") is None
+
+
+def test_extend_lease_only_for_owner(db, lost_lease):
+    service, _, _ = lost_lease
+
+    assert service.extend_lease("hash_1", "worker_a") is False
+    assert service.extend_lease("hash_1", "worker_b") is True
+
+
+# ========== process_place_hash ==========
+
+@pytest.fixture
+def service(db, monkeypatch):
+    """Google / OpenAI 호출 없이 FEATURES를 계산하는 서비스 (calculate.calls로 호출 횟수 확인)"""
+    service = FeaturePipelineService()
+
+    async def fetch(name, lat, lng):
+        return None
+
+    async def calculate(name, category, place_details):
+        calculate.calls += 1
+        return calculate.result
+
+    calculate.calls = 0
+    calculate.result = FEATURES
+    monkeypatch.setattr(service, "_fetch_google_place_details", fetch)
+    monkeypatch.setattr(service, "_calculate_features", calculate)
+    service.calculate = calculate
+    return service
+
+
+def run(service, place_hash="hash_1", on_claimed=None):
+    return asyncio.run(service.process_place_hash(place_hash, "worker_a", on_claimed=on_claimed))
+
+
+def test_process_place_hash_unknown(service):
+    assert run(service, "missing") is None
+    assert service.calculate.calls == 0
+
+
+def test_process_place_hash_calculated(db, service):
+    add_candidate(db)
+    add_user_place(db)
+    claimed = []
+
+    assert run(service, on_claimed=lambda: claimed.append(True)) == "calculated"
+
+    row = candidate_row(db)
+    assert row["features_status"] == "completed"
+    assert row["features"] == FEATURES
+    assert row["is_promoted"] is False
+    assert db.tables["user_places"][0]["features_status"] == "completed"
+    assert claimed == [True]
+
+
+def test_process_place_hash_promotes_when_threshold_reached(db, service):
+    add_candidate(db, user_count=PROMOTION_THRESHOLD, user_ids=[f"user_{i}" for i in range(PROMOTION_THRESHOLD)])
+    add_user_place(db)
+
+    assert run(service) == "promoted"
+
+    row = candidate_row(db)
+    assert row["is_promoted"] is True
+    assert row["lease_owner"] is None
+    place = db.tables["places"][0]
+    assert row["promoted_place_id"] == place["place_id"]
+    assert place["promoted_from_hash"] == "hash_1"
+    assert db.tables["user_places"] == []
+
+
+def test_process_place_hash_promotes_completed_without_recalculating(db, service):
+    add_candidate(db, features=FEATURES, features_status="completed", user_count=PROMOTION_THRESHOLD)
+
+    assert run(service) == "promoted"
+    assert service.calculate.calls == 0
+    assert candidate_row(db)["is_promoted"] is True
+
+
+def test_process_place_hash_completed_below_threshold(db, service):
+    add_candidate(db, features=FEATURES, features_status="completed")
+
+    assert run(service) is None
+    assert candidate_row(db)["is_promoted"] is False
+
+
+def test_process_place_hash_failed_calculation(db, service):
+    add_candidate(db)
+    service.calculate.result = None
+
+    assert run(service) == "failed"
+
+    row = candidate_row(db)
+    assert row["features_status"] == "pending"
+    assert row["last_error"] == "features calculation failed"
+    assert row["next_attempt_at"] is not None
+
+
+def test_process_place_hash_exception(db, service, monkeypatch):
+    add_candidate(db)
+
+    async def calculate(name, category, place_details):
+        raise RuntimeError("openai down")
+
+    monkeypatch.setattr(service, "_calculate_features", calculate)
+
+    assert run(service) == "failed"
+
+    row = candidate_row(db)
+    assert row["features_status"] == "pending"
+    assert row["last_error"] == "openai down"
+    assert row["lease_owner"] is None
+
+
+def test_process_place_hash_leased_by_other_worker(db, service):
+    add_candidate(db)
+    FeaturePipelineService().claim_candidate("hash_1", "worker_b")
+
+    assert run(service) is None
+    assert service.calculate.calls == 0
+    assert candidate_row(db)["lease_owner"] == "worker_b"
+
+
+def test_process_place_hash_already_promoted(db, service):
+    add_candidate(db, is_promoted=True)
+
+    assert run(service) is None
+    assert service.calculate.calls == 0
@@ -0,0 +1,79 @@
+"""
+place_lookup_service.nearby_geohashes 테스트
+
+- 오차 범위 박스가 geohash 셀 경계 / 꼭짓점에 걸칠 때 주변 셀을 모두 포함하는지
+"""
+import pytest
+
+from app.services.place_lookup_service import (
+    PlaceLookupService,
+    TOLERANCE_DEG,
+    WISHLIST_GEOHASH_PRECISION,
+    nearby_geohashes,
+    wishlist_geohash,
+)
+
+# precision 7 = 35비트 (경도 18비트, 위도 17비트)
+LNG_BITS = (WISHLIST_GEOHASH_PRECISION * 5 + 1) // 2
+LAT_BITS = WISHLIST_GEOHASH_PRECISION * 5 // 2
+CELL_LNG = 360 / 2 ** LNG_BITS
+CELL_LAT = 180 / 2 ** LAT_BITS
+
+
+def cell_edge(value: float, start: float, size: float) -> float:
+    """value에서 가장 가까운 셀 경계"""
+    return start + round((value - start) / size) * size
+
+
+EDGE_LAT = cell_edge(37.3925, -90.0, CELL_LAT)
+EDGE_LNG = cell_edge(126.6404, -180.0, CELL_LNG)
+CENTER_LAT = EDGE_LAT + CELL_LAT / 2
+CENTER_LNG = EDGE_LNG + CELL_LNG / 2
+
+
+def offsets(latitude: float, longitude: float):
+    """오차 범위 안의 주변 좌표 (꼭짓점 + 변 중간)"""
+    d = TOLERANCE_DEG * 0.99
+    return [
+        (latitude + dlat, longitude + dlng)
+        for dlat in (-d, 0, d)
+        for dlng in (-d, 0, d)
+    ]
+
+
+def test_cell_inside():
+    assert nearby_geohashes(CENTER_LAT, CENTER_LNG) == [wishlist_geohash(CENTER_LAT, CENTER_LNG)]
+
+
+@pytest.mark.parametrize("latitude, longitude, cells", [
+    (CENTER_LAT, EDGE_LNG, 2),
+    (EDGE_LAT, CENTER_LNG, 2),
+    (EDGE_LAT, EDGE_LNG, 4),
+    (EDGE_LAT + TOLERANCE_DEG / 2, EDGE_LNG - TOLERANCE_DEG / 2, 4),
+])
+def test_cells_across_boundary(latitude, longitude, cells):
+    hashes = nearby_geohashes(latitude, longitude)
+
+    assert len(hashes) == cells
+    for lat, lng in offsets(latitude, longitude):
+        assert wishlist_geohash(lat, lng) in hashes
+
+
+def test_find_wishlist_across_boundary(db):
+    # 찜은 경계 바로 아래-왼쪽 셀, 조회 좌표는 위-오른쪽 셀
+    saved_lat, saved_lng = EDGE_LAT - TOLERANCE_DEG / 3, EDGE_LNG - TOLERANCE_DEG / 3
+    query_lat, query_lng = EDGE_LAT + TOLERANCE_DEG / 3, EDGE_LNG + TOLERANCE_DEG / 3
+    assert wishlist_geohash(saved_lat, saved_lng) != wishlist_geohash(query_lat, query_lng)
+    db.tables["wishlists"] = [{
+        "wishlist_id": "w1",
+        "couple_id": "couple_1",
+        "latitude": saved_lat,
+        "longitude": saved_lng,
+        "geohash": wishlist_geohash(saved_lat, saved_lng),
+    }]
+
+    service = PlaceLookupService()
+
+    assert service.find_wishlist("couple_1", query_lat, query_lng)["wishlist_id"] == "w1"
+    assert service.find_wishlist("couple_2", query_lat, query_lng) is None
+    assert service.find_wishlist("couple_1", query_lat + TOLERANCE_DEG * 3, query_lng) is None
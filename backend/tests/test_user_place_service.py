@@ -0,0 +1,92 @@
+"""
+UserPlaceService.add_user_places_bulk 테스트 (MemoryClient)
+
+- 배치 내 중복 제거, 이미 저장한 장소 / 정식 장소 분리, 승격 후보 갱신
+"""
+import pytest
+
+from app.core.place_catalog import get_catalog_version
+from app.services.user_place_service import UserPlaceService
+from benchmarks.synthetic import make_places
+
+
+def place(name: str, latitude: float = 37.39, longitude: float = 126.64, category: str = "카페") -> dict:
+    return {
+        "name": name,
+        "address": "인천 연수구 송도동",
+        "category": category,
+        "latitude": latitude,
+        "longitude": longitude,
+        "added_from": "wishlist",
+    }
+
+
+@pytest.fixture
+def official(db):
+    places = make_places(20)
+    db.tables["places"] = places
+    db.tables["user_places"] = []
+    return places[0]
+
+
+def test_bulk_dedups_within_batch_and_against_db(db, official):
+    service = UserPlaceService()
+    saved = service.add_user_place("user_1", place("저장된 카페", 37.40, 126.65))
+    assert saved is not None
+
+    official_place = place(official["name"], official["latitude"], official["longitude"])
+    result = service.add_user_places_bulk("user_1", [
+        place("새 카페"),
+        place("새 카페"),
+        official_place,
+        place("저장된 카페", 37.40, 126.65),
+        place("새 식당", 37.38, 126.63, "음식점>한식"),
+        official_place,
+    ])
+
+    assert [r["name"] for r in result["added"]] == ["새 카페", "새 식당"]
+    assert [r["user_place_id"] for r in result["existing"]] == [saved["user_place_id"]]
+    assert result["official"] == [official["name"]]
+
+    rows = [r for r in db.tables["user_places"] if r["user_id"] == "user_1"]
+    assert sorted(r["name"] for r in rows) == ["새 식당", "새 카페", "저장된 카페"]
+    assert {r["features"]["template_id"] for r in result["added"]} == {"cafe", "food"}
+
+    candidates = {r["canonical_name"]: r for r in db.tables["place_adoption_candidates"]}
+    assert set(candidates) == {"저장된 카페", "새 카페", "새 식당"}
+    assert all(c["user_ids"] == ["user_1"] for c in candidates.values())
+
+
+def test_bulk_repeat_adds_nothing(db, official):
+    service = UserPlaceService()
+    batch = [place("새 카페"), place("새 식당", 37.38, 126.63)]
+    service.add_user_places_bulk("user_1", batch)
+    version = get_catalog_version("user_1")
+
+    result = service.add_user_places_bulk("user_1", batch)
+
+    assert result["added"] == []
+    assert len(result["existing"]) == 2
+    assert len(db.tables["user_places"]) == 2
+    assert get_catalog_version("user_1") == version
+
+
+def test_bulk_other_user_counts_towards_promotion(db, official):
+    service = UserPlaceService()
+    service.add_user_places_bulk("user_1", [place("새 카페")])
+
+    result = service.add_user_places_bulk("user_2", [place("새 카페"), place("새 카페")])
+
+    assert len(result["added"]) == 1
+    candidate = db.tables["place_adoption_candidates"][0]
+    assert candidate["user_ids"] == ["user_1", "user_2"]
+    assert candidate["user_count"] == 2
+
+
+def test_bulk_only_official(db, official):
+    result = UserPlaceService().add_user_places_bulk("user_1", [
+        place(official["name"], official["latitude"], official["longitude"])
+    ])
+
+    assert result == {"added": [], "existing": [], "official": [official["name"]]}
+    assert db.tables["user_places"] == []
@@ -8,6 +8,7 @@ import 'package:table_calendar/table_calendar.dart';
 import 'package:uuid/uuid.dart';
 
 import '../models/date_course.dart';
+import '../services/course_api_service.dart';
 import '../services/feedback_api_service.dart';
 import '../services/user_place_api_service.dart';
 
@@ -109,12 +110,23 @@ class CourseProvider extends ChangeNotifier {
   /// couples.schedules 에 들어있는 course_id 리스트
   List<String> _courseIds = [];
 
-  /// course_id -> DateCourse
+  /// course_id -> DateCourse (불러온 월 + loadAllCourses로 불러온 전체)
   final Map<String, DateCourse> _coursesById = {};
 
   /// course_id -> DiarySlotEntry 리스트 (슬롯 순서와 동일)
   final Map<String, List<DiarySlotEntry>> _diariesByCourseId = {};
 
+  /// 서버에서 이미 불러온 월 ("YYYY-MM")
+  final Set<String> _loadedMonths = {};
+
+  /// 마지막으로 불러온 월 (새로고침 시 이 월을 다시 불러옴)
+  DateTime? _focusedMonth;
+
+  /// 전체 코스를 한 번 불러왔는지 (지도 "저장된 코스" 목록용)
+  bool _allCoursesLoaded = false;
+  bool _isLoadingAllCourses = false;
+  bool _allCoursesFailed = false;
+
   bool _isLoading = false;
   String? _error;
 
@@ -125,7 +137,12 @@ class CourseProvider extends ChangeNotifier {
   String? get coupleId => _currentCoupleId;
 
   List<String> get courseIds => List.unmodifiable(_courseIds);
-  List<DateCourse> get allCourses => _coursesById.values.toList();
+  bool get allCoursesLoaded => _allCoursesLoaded;
+  bool get allCoursesFailed => _allCoursesFailed;
+
+  /// 커플의 전체 코스 (loadAllCourses 완료 전에는 빈 리스트, allCoursesLoaded로 구분)
+  List<DateCourse> get allCourses =>
+      _allCoursesLoaded ? _coursesById.values.toList() : const [];
 
   DateCourse? getCourseById(String id) => _coursesById[id];
 
@@ -143,40 +160,128 @@ class CourseProvider extends ChangeNotifier {
   /// 특정 날짜의 코스들
   List<DateCourse> getCoursesByDate(DateTime day) {
     final key = _dateKey(day);
-    return allCourses.where((c) => c.date == key).toList();
+    return _coursesById.values.where((c) => c.date == key).toList();
   }
 
   /// 특정 날짜의 모든 슬롯 (캘린더 eventLoader 용)
   List<CourseSlot> getSlotsForDay(DateTime day) {
     final key = _dateKey(day);
-    return allCourses
+    return _coursesById.values
         .where((c) => c.date == key)
         .expand((c) => c.slots)
         .toList();
   }
 
-  /// 모든 슬롯 (지도/리스트용)
+  /// 불러온 코스의 모든 슬롯
   List<CourseSlot> getAllSlots() {
-    return allCourses.expand((c) => c.slots).toList();
+    return _coursesById.values.expand((c) => c.slots).toList();
   }
 
   /// 로그인 이후 커플 기준 초기화
+  ///
+  /// 전체 코스를 받지 않고 현재 월만 기간 조회 (다른 월은 캘린더 이동 시 loadCoursesForMonth)
   Future<void> initForCouple(String coupleId) async {
     // 이미 같은 커플 + 데이터가 있으면 스킵
-    if (_currentCoupleId == coupleId && _coursesById.isNotEmpty) return;
+    if (_currentCoupleId == coupleId && _loadedMonths.isNotEmpty) return;
 
     _currentCoupleId = coupleId;
     _courseIds = [];
     _coursesById.clear();
     _diariesByCourseId.clear();
+    _loadedMonths.clear();
+    _allCoursesLoaded = false;
+    _allCoursesFailed = false;
 
     await _subscribeCoupleCourses();
-    await _loadCoupleCoursesOnce();
+    await _loadCourseIds();
+    await loadCoursesForMonth(_focusedMonth ?? DateTime.now(), force: true);
   }
 
-  /// 수동 새로고침(필요할 때 호출)
+  /// 수동 새로고침(필요할 때 호출) - 보고 있는 월만 다시 불러옴
   Future<void> refreshCourses() async {
-    await _loadCoupleCoursesOnce();
+    _loadedMonths.clear();
+    await _loadCourseIds();
+    await loadCoursesForMonth(_focusedMonth ?? DateTime.now(), force: true);
+    // 전체 목록을 이미 보고 있었다면 전체도 다시 불러옴
+    if (_allCoursesLoaded || _allCoursesFailed) {
+      await loadAllCourses(force: true);
+    }
+  }
+
+  /// 커플의 전체 코스를 기간 없이 페이지 단위로 불러옴 (지도 "저장된 코스" 목록용)
+  ///
+  /// 한 번 불러온 뒤에는 생성/수정/삭제와 realtime 구독으로 반영, 일기는 불러오지 않음
+  Future<void> loadAllCourses({bool force = false}) async {
+    if (_currentCoupleId == null || _currentCoupleId!.isEmpty) {
+      // 커플 연결 전에는 코스가 없음 (initForCouple 에서 다시 불러옴)
+      if (!_allCoursesLoaded) {
+        _allCoursesLoaded = true;
+        notifyListeners();
+      }
+      return;
+    }
+    if (_isLoadingAllCourses || (_allCoursesLoaded && !force)) return;
+
+    _isLoadingAllCourses = true;
+    _allCoursesFailed = false;
+    try {
+      final courses = await CourseApiService.getCoursesInRange(null, null);
+      _coursesById.clear();
+      for (final course in courses) {
+        if (course.id != null) {
+          _coursesById[course.id!] = course;
+        }
+      }
+      _allCoursesLoaded = true;
+    } catch (e, st) {
+      debugPrint('[CourseProvider] loadAllCourses 오류: $e\n$st');
+      _error = e.toString();
+      // 실패 시 화면 rebuild 마다 재요청하지 않도록 표시 (refreshCourses / initForCouple 에서 다시 시도)
+      _allCoursesFailed = true;
+    }
+    _isLoadingAllCourses = false;
+    notifyListeners();
+  }
+
+  /// 캘린더 월 이동 시 해당 월 코스를 서버 기간 조회 1번으로 불러옴
+  ///
+  /// 이미 불러온 월은 다시 요청하지 않음 (변경분은 realtime 구독으로 반영)
+  Future<void> loadCoursesForMonth(DateTime month, {bool force = false}) async {
+    if (_currentCoupleId == null || _currentCoupleId!.isEmpty) return;
+
+    _focusedMonth = month;
+    final monthKey = _dateKey(month).substring(0, 7);
+    if (!force && _loadedMonths.contains(monthKey)) return;
+
+    final start = DateTime(month.year, month.month, 1);
+    final end = DateTime(month.year, month.month + 1, 0); // 해당 월 마지막 날
+
+    _isLoading = true;
+    _error = null;
+    notifyListeners();
+
+    try {
+      final courses = await CourseApiService.getCoursesInRange(start, end);
+
+      // 해당 월 코스를 서버 결과로 교체
+      _coursesById.removeWhere((_, c) => c.date.startsWith(monthKey));
+      for (final course in courses) {
+        if (course.id != null) {
+          _coursesById[course.id!] = course;
+        }
+      }
+      // 일기도 이 월 코스만
+      await _loadDiariesForIds(
+        courses.where((c) => c.id != null).map((c) => c.id!).toList(),
+      );
+      _loadedMonths.add(monthKey);
+    } catch (e, st) {
+      debugPrint('[CourseProvider] loadCoursesForMonth 오류: $e\n$st');
+      _error = e.toString();
+    }
+
+    _isLoading = false;
+    notifyListeners();
   }
 
   // =====================
@@ -215,48 +320,25 @@ class CourseProvider extends ChangeNotifier {
     }
   }
 
-  Future<void> _loadCoupleCoursesOnce() async {
-    _isLoading = true;
-    _error = null;
-    notifyListeners();
-
+  /// couples.schedules의 course_id 목록만 조회 (코스 생성 시 배열에 추가하는 용도, 코스 본문은 받지 않음)
+  Future<void> _loadCourseIds() async {
     try {
       final res = await supabase
           .from('couples')
           .select('schedules')
           .eq('couple_id', _currentCoupleId!)
           .maybeSingle();
-      debugPrint('[DEBUG] couples.schedules 응답: $res');
-      if (res == null) {
-        _courseIds = [];
-        _coursesById.clear();
-        _diariesByCourseId.clear();
-        _isLoading = false;
-        notifyListeners();
-        return;
-      }
-
-      final List<dynamic> raw = res['schedules'] ?? [];
+      final List<dynamic> raw = res?['schedules'] ?? [];
       _courseIds = raw.cast<String>();
-
-      await _loadCoursesForIds(_courseIds);
-      await _loadDiariesForIds(_courseIds);
-
-      _isLoading = false;
-      notifyListeners();
     } catch (e, st) {
-      debugPrint('[CourseProvider] _loadCoupleCoursesOnce 오류: $e\n$st');
+      debugPrint('[CourseProvider] _loadCourseIds 오류: $e\n$st');
       _error = e.toString();
-      _isLoading = false;
-      notifyListeners();
     }
   }
 
+  /// 지정한 코스들만 불러와 기존 목록에 합침 (realtime으로 새로 추가된 코스 등)
   Future<void> _loadCoursesForIds(List<String> ids) async {
-    if (ids.isEmpty) {
-      _coursesById.clear();
-      return;
-    }
+    if (ids.isEmpty) return;
 
     final rows = await supabase
         .from('courses')
@@ -265,7 +347,6 @@ class CourseProvider extends ChangeNotifier {
           'total_distance, total_duration, slots',
         )
         .filter('course_id', 'in', ids);
-    _coursesById.clear();
 
     for (final row in rows as List) {
       final base = row as Map<String, dynamic>;
@@ -300,12 +381,9 @@ class CourseProvider extends ChangeNotifier {
     }
   }
 
-  /// diary 테이블에서 여러 course_id의 일기 로딩
+  /// diary 테이블에서 여러 course_id의 일기 로딩 (해당 코스들의 일기만 교체)
   Future<void> _loadDiariesForIds(List<String> ids) async {
-    if (ids.isEmpty) {
-      _diariesByCourseId.clear();
-      return;
-    }
+    if (ids.isEmpty) return;
 
     final rows =
         await supabase.from('diary').select('course_id, json').filter(
@@ -314,7 +392,9 @@ class CourseProvider extends ChangeNotifier {
               ids,
             );
 
-    _diariesByCourseId.clear();
+    for (final id in ids) {
+      _diariesByCourseId.remove(id);
+    }
 
     for (final row in rows as List) {
       final base = row as Map<String, dynamic>;
@@ -366,10 +446,17 @@ class CourseProvider extends ChangeNotifier {
               debugPrint('[REALTIME] 새로 들어온 newIds → $newIds');
 
               if (!listEquals(_courseIds, newIds)) {
-                debugPrint('[REALTIME] 값 변경됨 → courses + diary 다시 로드');
+                // 전체를 다시 받지 않고 추가된 코스만 조회, 빠진 코스는 제거
+                final added = newIds.where((id) => !_courseIds.contains(id)).toList();
+                final removed = _courseIds.where((id) => !newIds.contains(id)).toList();
+                debugPrint('[REALTIME] 값 변경됨 → 추가 $added / 삭제 $removed');
                 _courseIds = newIds;
-                await _loadCoursesForIds(_courseIds);
-                await _loadDiariesForIds(_courseIds);
+                for (final id in removed) {
+                  _coursesById.remove(id);
+                  _diariesByCourseId.remove(id);
+                }
+                await _loadCoursesForIds(added);
+                await _loadDiariesForIds(added);
                 notifyListeners();
               } else {
                 debugPrint('[REALTIME] ⚠ 값 동일 → 업데이트 없이 종료');
@@ -165,6 +165,7 @@ class _CalendarScreenState extends State<CalendarScreen> {
                 },
                 onPageChanged: (focusedDay) {
                   _focusedDay = focusedDay;
+                  courseProvider.loadCoursesForMonth(focusedDay);
                 },
                 headerVisible: true,
                 calendarBuilders: CalendarBuilders<CourseSlot>(
@@ -64,6 +64,62 @@ class CourseApiService {
         .toList();
   }
 
+  /// 기간 내 커플 코스 조회 (캘린더 월 보기용, start/end 가 null 이면 그쪽 경계 없음)
+  ///
+  /// 서버에서 couple_id + 날짜로 필터링하고, next_cursor 가 없을 때까지 페이지를 이어서 가져온다.
+  static Future<List<DateCourse>> getCoursesInRange(
+    DateTime? start,
+    DateTime? end,
+  ) async {
+    final token = await _token();
+    if (token == null) {
+      throw Exception('로그인이 필요합니다. 토큰이 없습니다.');
+    }
+
+    final courses = <DateCourse>[];
+    String? cursor;
+
+    do {
+      final uri = Uri.parse('${ApiConfig.baseUrl}/courses/range').replace(
+        queryParameters: {
+          if (start != null) 'start': _dateParam(start),
+          if (end != null) 'end': _dateParam(end),
+          if (cursor != null) 'cursor': cursor,
+        },
+      );
+
+      final response = await http.get(
+        uri,
+        headers: {
+          'Authorization': 'Bearer $token',
+        },
+      );
+
+      if (response.statusCode != 200) {
+        final body = jsonDecode(response.body);
+        throw Exception(
+          '코스 조회 실패 (${response.statusCode}): ${body['detail'] ?? response.body}',
+        );
+      }
+
+      final Map<String, dynamic> page = jsonDecode(response.body);
+      final List<dynamic> list = page['courses'] ?? [];
+      courses.addAll(
+        list.map((e) => DateCourse.fromJson(e as Map<String, dynamic>)),
+      );
+      cursor = page['next_cursor'] as String?;
+    } while (cursor != null);
+
+    return courses;
+  }
+
+  static String _dateParam(DateTime d) {
+    final y = d.year.toString().padLeft(4, '0');
+    final m = d.month.toString().padLeft(2, '0');
+    final day = d.day.toString().padLeft(2, '0');
+    return '$y-$m-$day';
+  }
+
   /// 특정 코스 조회
   static Future<DateCourse> getCourse(String courseId) async {
     final token = await _token();
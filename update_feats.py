@@ -1,58 +1,264 @@
+"""
+test.db places의 scores(features)가 비어 있는 장소를 OpenAI로 채우는 backfill
+
+- 행 전체를 fetchall 하지 않고 id 순서로 batch씩 읽음 (id > 마지막 id, 메모리 일정)
+- 동시에 N개 요청 (asyncio + semaphore), 분당 요청 수 제한
+- 결과는 batch-size개씩 모아 한 트랜잭션으로 저장
+- 템플릿은 compact JSON으로 system 메시지에 한 번만 (모든 요청에서 같은 prefix → 프롬프트 캐시 적중)
+- 진행 상황(안전하게 끝난 마지막 id)을 progress 파일에 기록 → 같은 명령으로 재개
+- --dry-run: API 호출 없이 남은 장소 수, 예상 토큰 / 비용 / 소요 시간만 출력
+
+사용 예시:
+  python update_feats.py --dry-run
+  python update_feats.py --concurrency 16 --rpm 3000
+"""
 import sqlite3
 import json
+import os
+import time
+import asyncio
+import argparse
 from tqdm import tqdm
 
-from GPT import ask_GPT
+from openai import AsyncOpenAI
 
-def update_places_features():
-    # Load base features
-    with open("places_feature.json", "r", encoding="utf-8") as f:
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("o200k_base")
+except Exception:
+    # tiktoken이 없으면 문자 수 기반 근사치 사용
+    _encoding = None
+
+SELECT_COLUMNS = "id, name, category, rating, price_range, opening_hours, reviews"
+
+
+def count_tokens(text):
+    """토큰 수 (tiktoken 없으면 ASCII 4자당 1토큰, 비ASCII 1자당 1토큰으로 근사)"""
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def load_json_column(value):
+    return json.loads(value) if value else None
+
+
+def build_messages(system_prompt, row):
+    """장소 한 행 → chat 메시지 (템플릿은 system_prompt에 한 번만)"""
+    _, name, category, rating, price_range, opening_hours, reviews = row
+    user_prompt = f"""
+아래는 장소의 기본 정보입니다:
+---
+이름: {name}
+카테고리: {category}
+평점: {rating}
+가격대: {price_range}
+영업시간: {load_json_column(opening_hours)}
+리뷰: {load_json_column(reviews)}
+---
+"""
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def build_system_prompt(base_template):
+    return (
+        "장소 정보를 받아서, 아래 JSON 템플릿의 각 항목을 0~1 사이 값으로 합리적으로 채워주세요.\n"
+        "JSON 형식을 유지하고, 불필요한 설명 없이 JSON만 반환하세요.\n\n"
+        "템플릿:\n" + json.dumps(base_template, ensure_ascii=False, separators=(",", ":"))
+    )
+
+
+def stream_rows(conn, start_id, batch_size):
+    """scores가 비어 있는 장소를 id 순서로 batch씩 읽음"""
+    last_id = start_id
+    while True:
+        rows = conn.execute(
+            f"SELECT {SELECT_COLUMNS} FROM places WHERE scores IS NULL AND id > ? ORDER BY id LIMIT ?",
+            (last_id, batch_size)
+        ).fetchall()
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1][0]
+
+
+class Progress:
+    """재개 지점 파일 ({"last_id": 이 id까지는 처리 완료(성공 또는 실패 기록), "failed": [id, ...]})"""
+
+    def __init__(self, path):
+        self.path = path
+        self.last_id = 0
+        self.failed = []
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+            self.last_id, self.failed = state.get("last_id", 0), state.get("failed", [])
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"last_id": self.last_id, "failed": self.failed}, f)
+        os.replace(tmp, self.path)
+
+
+class RateLimiter:
+    """분당 요청 수 제한 (요청 간 최소 간격)"""
+
+    def __init__(self, rpm):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def estimate(db_path, template_path, start_id, input_price, output_price, rpm, concurrency):
+    """dry-run: 남은 장소의 프롬프트를 만들어 토큰 / 비용 / 소요 시간 추정 (API 호출 없음)"""
+    with open(template_path, "r", encoding="utf-8") as f:
         base_template = json.load(f)
-        
-    # Connect to db file
-    conn = sqlite3.connect("./test.db")
-    cur = conn.cursor()
-    
-    # Load places data
-    cur.execute("SELECT id, place_id, name, category, rating, price_range, opening_hours, reviews, latitude, longitude, scores FROM places")
-    rows = cur.fetchall()
-
-    # Update places_features
-    pbar = tqdm(rows)
-    for (db_id, place_id, name, category, rating, price_range, opening_hours, reviews, latitude, longitude, scores) in pbar:
-        pbar.set_postfix(name = name)
-        if scores is not None:
-            continue
-       
-        opening_hours = json.loads(opening_hours)
-        reviews = json.loads(reviews)
-        prompt = f"""
-        아래는 장소의 기본 정보입니다:
-        ---
-        이름: {name}
-        카테고리: {category}
-        평점: {rating}
-        가격대: {price_range}
-        영업시간: {opening_hours}
-        리뷰: {reviews}
-        ---
-        아래 JSON 템플릿을 참고해서, 각 항목을 0~1 사이 값으로 합리적으로 채워주세요.
-        JSON 형식을 유지하고, 불필요한 설명 없이 JSON만 반환하세요.
-
-        템플릿:
-        {json.dumps(base_template, ensure_ascii=False, indent=2)}
-        """
-        # print(f"used prompt: {prompt}")
-        result= ask_GPT(prompt)
-
-        obj = json.loads(result)
-        cur.execute("""
-            UPDATE places
-            SET scores = ?
-            WHERE id = ?
-        """, (json.dumps(obj, ensure_ascii=False), db_id))
-
-        conn.commit()
+    system_prompt = build_system_prompt(base_template)
+    system_tokens = count_tokens(system_prompt)
+    # 출력은 채워진 템플릿 JSON 하나
+    output_tokens = count_tokens(json.dumps(base_template, ensure_ascii=False))
+
+    conn = sqlite3.connect(db_path)
+    rows = input_tokens = 0
+    for row in stream_rows(conn, start_id, 500):
+        rows += 1
+        input_tokens += system_tokens + count_tokens(build_messages(system_prompt, row)[1]["content"])
     conn.close()
+
+    total_output = rows * output_tokens
+    cost = (input_tokens * input_price + total_output * output_price) / 1_000_000
+    # 요청당 약 5초 가정, rpm과 동시성 중 더 좁은 쪽이 병목
+    per_minute = min(rpm, concurrency * 60 / 5.0) if rpm > 0 else concurrency * 60 / 5.0
+    print(f"남은 장소: {rows}개 (id > {start_id})")
+    print(f"예상 토큰: 입력 {input_tokens:,} / 출력 {total_output:,}")
+    print(f"예상 비용: ${cost:.2f} (입력 ${input_price}/1M, 출력 ${output_price}/1M)")
+    print(f"예상 소요 시간: {rows / per_minute:.1f}분 (분당 약 {per_minute:.0f}건)")
+
+
+async def update_places_features(
+    db_path="./test.db",
+    template_path="places_feature.json",
+    model="gpt-4o-mini",
+    concurrency=8,
+    rpm=500,
+    batch_size=50,
+    progress_path="update_feats.progress.json"
+):
+    # Load base features
+    with open(template_path, "r", encoding="utf-8") as f:
+        base_template = json.load(f)
+    system_prompt = build_system_prompt(base_template)
+
+    client = AsyncOpenAI()
+    progress = Progress(progress_path)
+    limiter = RateLimiter(rpm)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    read_conn = sqlite3.connect(db_path)
+    write_conn = sqlite3.connect(db_path)
+    total = read_conn.execute(
+        "SELECT COUNT(*) FROM places WHERE scores IS NULL AND id > ?", (progress.last_id,)
+    ).fetchone()[0]
+
+    in_flight = set()
+    dispatched_max = progress.last_id
+    results = []
+    pbar = tqdm(total=total)
+
+    def flush():
+        """모인 결과 한 트랜잭션으로 저장 + 재개 지점 갱신"""
+        nonlocal results
+        if results:
+            with write_conn:
+                write_conn.executemany("UPDATE places SET scores = ? WHERE id = ?", results)
+            results = []
+        # 아직 처리 중인 것 중 가장 작은 id 앞까지는 안전하게 끝남
+        progress.last_id = min(in_flight) - 1 if in_flight else dispatched_max
+        progress.save()
+
+    async def featurize(row):
+        db_id, name = row[0], row[1]
+        try:
+            await limiter.wait()
+            response = await client.chat.completions.create(
+                model=model,
+                messages=build_messages(system_prompt, row),
+                temperature=0.1,
+                response_format={"type": "json_object"}
+            )
+            obj = json.loads(response.choices[0].message.content)
+            results.append((json.dumps(obj, ensure_ascii=False), db_id))
+        except Exception as e:
+            tqdm.write(f"❌ {name} (id={db_id}): {e}")
+            progress.failed.append(db_id)
+        finally:
+            in_flight.discard(db_id)
+            semaphore.release()
+            pbar.update(1)
+            pbar.set_postfix(name=name)
+            if len(results) >= batch_size:
+                flush()
+
+    tasks = set()
+    try:
+        for row in stream_rows(read_conn, progress.last_id, batch_size * 4):
+            # 동시 요청 수만큼만 앞서 읽음
+            await semaphore.acquire()
+            in_flight.add(row[0])
+            dispatched_max = row[0]
+            task = asyncio.create_task(featurize(row))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+    finally:
+        flush()
+        pbar.close()
+        read_conn.close()
+        write_conn.close()
+
+    print(f"완료 (실패 {len(progress.failed)}개, 실패한 장소는 scores가 비어 있으므로 progress 파일을 지우고 다시 실행하면 재시도)")
+
+
 if __name__ == '__main__':
-    update_places_features()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default="./test.db")
+    parser.add_argument("--template", default="places_feature.json")
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--rpm", type=int, default=500, help="분당 최대 요청 수")
+    parser.add_argument("--batch-size", type=int, default=50, help="한 트랜잭션에 저장할 행 수")
+    parser.add_argument("--progress", default="update_feats.progress.json", help="재개 지점 파일 (비우면 기록 안 함)")
+    parser.add_argument("--dry-run", action="store_true", help="API 호출 없이 토큰 / 비용 / 시간 추정")
+    parser.add_argument("--input-price", type=float, default=0.15, help="입력 1M 토큰당 USD")
+    parser.add_argument("--output-price", type=float, default=0.60, help="출력 1M 토큰당 USD")
+    args = parser.parse_args()
+
+    if args.dry_run:
+        estimate(args.db, args.template, Progress(args.progress or None).last_id,
+                 args.input_price, args.output_price, args.rpm, args.concurrency)
+    else:
+        asyncio.run(update_places_features(
+            db_path=args.db,
+            template_path=args.template,
+            model=args.model,
+            concurrency=args.concurrency,
+            rpm=args.rpm,
+            batch_size=args.batch_size,
+            progress_path=args.progress or None
+        ))